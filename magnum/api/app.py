@@ -15,6 +15,7 @@ import pecan
 
 from magnum.api import auth
 from magnum.api import config as api_config
+from magnum.api import hooks
 
 # Register options for the service
 API_SERVICE_OPTS = [
@@ -27,7 +28,12 @@ API_SERVICE_OPTS = [
     cfg.IntOpt('max_limit',
                default=1000,
                help='The maximum number of items returned in a single '
-                    'response from a collection resource.')
+                    'response from a collection resource.'),
+    cfg.BoolOpt('use_conductor',
+                default=False,
+                help='Run the remotable methods of the magnum objects on '
+                     'the conductor, instead of accessing the database '
+                     'from the API service.')
 ]
 
 CONF = cfg.CONF
@@ -48,6 +54,11 @@ def setup_app(config=None):
         config = get_pecan_config()
 
     app_conf = dict(config.app)
+    if CONF.api.use_conductor:
+        # DBRequestHook would set up the database engine of the service.
+        app_conf['hooks'] = [
+            hooks.LastWriteHook() if isinstance(hook, hooks.DBRequestHook)
+            else hook for hook in app_conf.get('hooks', [])]
 
     app = pecan.make_app(
         app_conf.pop('root'),
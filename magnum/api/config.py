@@ -24,6 +24,7 @@ app = {
     'hooks': [
         hooks.ContextHook(),
         hooks.RPCHook(),
+        hooks.DBRequestHook(),
     ],
     'acl_public_routes': [
         '/'
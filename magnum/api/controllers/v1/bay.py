@@ -30,6 +30,10 @@ from magnum.common import exception
 from magnum import objects
 
 
+# Fields of a bay which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'baymodel_id', 'node_count']
+
+
 class BayPatchType(types.JsonPatchType):
 
     @staticmethod
@@ -107,10 +111,9 @@ class Bay(base.APIBase):
         setattr(self, 'bay_uuid', kwargs.get('bay_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(bay, url, expand=True):
+    def _convert_with_links(bay, url, expand=True, fields=None):
         if not expand:
-            bay.unset_fields_except(['uuid', 'name', 'baymodel_id',
-                                    'node_count'])
+            bay.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the bay_id attribute
         bay.bay_id = wtypes.Unset
@@ -124,9 +127,10 @@ class Bay(base.APIBase):
         return bay
 
     @classmethod
-    def convert_with_links(cls, rpc_bay, expand=True):
+    def convert_with_links(cls, rpc_bay, expand=True, fields=None):
         bay = Bay(**rpc_bay.as_dict())
-        return cls._convert_with_links(bay, pecan.request.host_url, expand)
+        return cls._convert_with_links(bay, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -152,11 +156,16 @@ class BayCollection(collection.Collection):
         self._type = 'bays'
 
     @staticmethod
-    def convert_with_links(rpc_bays, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_bays, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = BayCollection()
-        collection.bays = [Bay.convert_with_links(p, expand)
+        collection.bays = [Bay.convert_with_links(p, expand, fields)
                             for p in rpc_bays]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_bays,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -181,44 +190,72 @@ class BaysController(rest.RestController):
 
     def _get_bays_collection(self, marker, limit,
                               sort_key, sort_dir, expand=False,
-                              resource_url=None):
+                              resource_url=None, fields=None, filters=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        filters = filters or {}
 
         marker_obj = None
         if marker:
-            marker_obj = objects.Bay.get_by_uuid(pecan.request.context,
-                                                  marker)
+            marker_obj = api_utils.get_marker(objects.Bay, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.Bay,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
+        db_filters = api_utils.get_db_filters(filters)
         bays = pecan.request.rpcapi.bay_list(pecan.request.context, limit,
                                          marker_obj, sort_key=sort_key,
-                                         sort_dir=sort_dir)
+                                         sort_dir=sort_dir,
+                                         columns=columns,
+                                         filters=db_filters)
 
         return BayCollection.convert_with_links(bays, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
-                                                sort_dir=sort_dir)
+                                                sort_dir=sort_dir,
+                                                **filters)
 
     @wsme_pecan.wsexpose(BayCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text, wtypes.text, wtypes.text)
     def get_all(self, bay_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None,
+                baymodel_id=None, name=None, name_prefix=None):
         """Retrieve a list of bays.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
+        :param baymodel_id: UUID of a baymodel, to get only the bays of that
+                            baymodel.
+        :param name: name of the bays to return.
+        :param name_prefix: leading characters of the names of the bays to
+                            return.
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
+        filters = api_utils.validate_filters(baymodel_id=baymodel_id,
+                                             name=name,
+                                             name_prefix=name_prefix)
         return self._get_bays_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir, fields=fields,
+                                         filters=filters)
 
     @wsme_pecan.wsexpose(BayCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text, wtypes.text)
     def detail(self, bay_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc',
+                baymodel_id=None, name=None, name_prefix=None):
         """Retrieve a list of bays with detail.
 
         :param bay_uuid: UUID of a bay, to get only bays for that bay.
@@ -226,6 +263,11 @@ class BaysController(rest.RestController):
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param baymodel_id: UUID of a baymodel, to get only the bays of that
+                            baymodel.
+        :param name: name of the bays to return.
+        :param name_prefix: leading characters of the names of the bays to
+                            return.
         """
         # NOTE(lucasagomes): /detail should only work agaist collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -234,9 +276,12 @@ class BaysController(rest.RestController):
 
         expand = True
         resource_url = '/'.join(['bays', 'detail'])
+        filters = api_utils.validate_filters(baymodel_id=baymodel_id,
+                                             name=name,
+                                             name_prefix=name_prefix)
         return self._get_bays_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, filters=filters)
 
     @wsme_pecan.wsexpose(Bay, types.uuid)
     def get_one(self, bay_uuid):
@@ -260,6 +305,7 @@ class BaysController(rest.RestController):
             raise exception.OperationNotPermitted
 
         new_bay = objects.Bay(pecan.request.context, **bay.as_dict())
+        new_bay.obj_set_owner()
         res_bay = pecan.request.rpcapi.bay_create(new_bay)
 
         # Set the HTTP Location Header
@@ -29,6 +29,10 @@ from magnum.common import exception
 from magnum import objects
 
 
+# Fields of a baymodel which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'type', 'image_id', 'ironic_baymodel_id']
+
+
 class BayModelPatchType(types.JsonPatchType):
 
     @staticmethod
@@ -108,10 +112,9 @@ class BayModel(base.APIBase):
         setattr(self, 'baymodel_uuid', kwargs.get('baymodel_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(baymodel, url, expand=True):
+    def _convert_with_links(baymodel, url, expand=True, fields=None):
         if not expand:
-            baymodel.unset_fields_except(['uuid', 'name', 'type', 'image_id',
-                                     'ironic_baymodel_id'])
+            baymodel.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the baymodel_id attribute
         baymodel.baymodel_id = wtypes.Unset
@@ -125,10 +128,10 @@ class BayModel(base.APIBase):
         return baymodel
 
     @classmethod
-    def convert_with_links(cls, rpc_baymodel, expand=True):
+    def convert_with_links(cls, rpc_baymodel, expand=True, fields=None):
         baymodel = BayModel(**rpc_baymodel.as_dict())
         return cls._convert_with_links(baymodel, pecan.request.host_url,
-                                       expand)
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -156,11 +159,15 @@ class BayModelCollection(collection.Collection):
 
     @staticmethod
     def convert_with_links(rpc_baymodels, limit, url=None, expand=False,
-                           **kwargs):
+                           fields=None, **kwargs):
         collection = BayModelCollection()
-        collection.baymodels = [BayModel.convert_with_links(p, expand)
+        collection.baymodels = [BayModel.convert_with_links(p, expand, fields)
                             for p in rpc_baymodels]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_baymodels,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -183,42 +190,54 @@ class BayModelsController(rest.RestController):
 
     def _get_baymodels_collection(self, marker, limit,
                               sort_key, sort_dir, expand=False,
-                              resource_url=None):
+                              resource_url=None, fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
 
         marker_obj = None
         if marker:
-            marker_obj = objects.BayModel.get_by_uuid(pecan.request.context,
-                                                  marker)
+            marker_obj = api_utils.get_marker(objects.BayModel, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.BayModel,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
         baymodels = objects.BayModel.list(pecan.request.context, limit,
                                 marker_obj, sort_key=sort_key,
-                                sort_dir=sort_dir)
+                                sort_dir=sort_dir,
+                                columns=columns)
 
         return BayModelCollection.convert_with_links(baymodels, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
                                                 sort_dir=sort_dir)
 
     @wsme_pecan.wsexpose(BayModelCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text)
     def get_all(self, baymodel_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None):
         """Retrieve a list of baymodels.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
         return self._get_baymodels_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir, fields=fields)
 
     @wsme_pecan.wsexpose(BayModelCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text)
     def detail(self, baymodel_uuid=None, marker=None, limit=None,
                 sort_key='id', sort_dir='asc'):
         """Retrieve a list of baymodels with detail.
@@ -265,6 +284,7 @@ class BayModelsController(rest.RestController):
 
         new_baymodel = objects.BayModel(pecan.request.context,
                                 **baymodel.as_dict())
+        new_baymodel.obj_set_owner()
         new_baymodel.create()
         # Set the HTTP Location Header
         pecan.response.location = link.build_url('baymodels',
@@ -14,10 +14,13 @@
 #    under the License.
 
 import pecan
+import six
+from six.moves.urllib import parse as urlparse
 from wsme import types as wtypes
 
 from magnum.api.controllers import base
 from magnum.api.controllers import link
+from magnum.api.controllers.v1 import utils as api_utils
 
 
 class Collection(base.APIBase):
@@ -33,16 +36,29 @@ class Collection(base.APIBase):
         """Return whether collection has more items."""
         return len(self.collection) and len(self.collection) == limit
 
-    def get_next(self, limit, url=None, **kwargs):
-        """Return a link to the next subset of the collection."""
+    def get_next(self, limit, url=None, rpc_objects=None, **kwargs):
+        """Return a link to the next subset of the collection.
+
+        :param rpc_objects: the objects the collection was built from. When
+                            given, the link carries a keyset marker instead
+                            of the UUID of the last item.
+        """
         if not self.has_next(limit):
             return wtypes.Unset
 
         resource_url = url or self._type
-        q_args = ''.join(['%s=%s&' % (key, kwargs[key]) for key in kwargs])
-        next_args = '?%(args)slimit=%(limit)d&marker=%(marker)s' % {
-                                            'args': q_args, 'limit': limit,
-                                            'marker': self.collection[-1].uuid}
+        if rpc_objects:
+            marker = api_utils.encode_marker(rpc_objects[-1],
+                                             kwargs.get('sort_key') or 'id')
+        else:
+            marker = self.collection[-1].uuid
+        # The filter values, such as label selectors, may contain any of
+        # the characters delimiting the query.
+        q_args = [(key, six.text_type(value).encode('utf-8'))
+                  for key, value in sorted(kwargs.items())
+                  if value is not None]
+        q_args += [('limit', limit), ('marker', marker)]
+        next_args = '?' + urlparse.urlencode(q_args)
 
         return link.Link.make_link('next', pecan.request.host_url,
                                    resource_url, next_args).href
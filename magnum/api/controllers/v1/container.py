@@ -35,6 +35,10 @@ from magnum.openstack.common import log as logging
 LOG = logging.getLogger(__name__)
 
 
+# Fields of a container which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'image_id', 'status']
+
+
 class ContainerPatchType(types.JsonPatchType):
 
     @staticmethod
@@ -83,6 +87,9 @@ class Container(base.APIBase):
     image_id = wtypes.text
     """The image name or UUID to use as a base image for this baymodel"""
 
+    status = wtypes.text
+    """The last known state of this container, as reported by Docker"""
+
     links = wsme.wsattr([link.Link], readonly=True)
     """A list containing a self link and associated container links"""
 
@@ -108,9 +115,9 @@ class Container(base.APIBase):
                 kwargs.get('container_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(container, url, expand=True):
+    def _convert_with_links(container, url, expand=True, fields=None):
         if not expand:
-            container.unset_fields_except(['uuid', 'name', 'image_id'])
+            container.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the container_id attribute
         container.container_id = wtypes.Unset
@@ -124,16 +131,17 @@ class Container(base.APIBase):
         return container
 
     @classmethod
-    def convert_with_links(cls, rpc_container, expand=True):
+    def convert_with_links(cls, rpc_container, expand=True, fields=None):
         container = Container(**rpc_container.as_dict())
         return cls._convert_with_links(container, pecan.request.host_url,
-                                       expand)
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
         sample = cls(uuid='27e3153e-d5bf-4b7e-b517-fb518e17f34c',
                      name='example',
                      image_id='ubuntu',
+                     status='Running',
                      created_at=datetime.datetime.utcnow(),
                      updated_at=datetime.datetime.utcnow())
         # NOTE(lucasagomes): container_uuid getter() method look at the
@@ -153,11 +161,16 @@ class ContainerCollection(collection.Collection):
 
     @staticmethod
     def convert_with_links(rpc_containers, limit, url=None,
-                           expand=False, **kwargs):
+                           expand=False, fields=None, **kwargs):
         collection = ContainerCollection()
-        collection.containers = [Container.convert_with_links(p, expand)
+        collection.containers = [Container.convert_with_links(p, expand,
+                                                              fields)
                             for p in rpc_containers]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_containers,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -249,44 +262,71 @@ class ContainersController(rest.RestController):
 
     def _get_containers_collection(self, marker, limit,
                               sort_key, sort_dir, expand=False,
-                              resource_url=None):
+                              resource_url=None, fields=None, filters=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        filters = filters or {}
 
         marker_obj = None
         if marker:
-            marker_obj = objects.Container.get_by_uuid(pecan.request.context,
-                                                  marker)
+            marker_obj = api_utils.get_marker(objects.Container, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.Container,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
+        db_filters = api_utils.get_db_filters(filters)
         containers = objects.Container.list(pecan.request.context, limit,
                                             marker_obj, sort_key=sort_key,
-                                            sort_dir=sort_dir)
+                                            sort_dir=sort_dir,
+                                            columns=columns,
+                                            filters=db_filters)
 
         return ContainerCollection.convert_with_links(containers, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
-                                                sort_dir=sort_dir)
+                                                sort_dir=sort_dir,
+                                                **filters)
 
     @wsme_pecan.wsexpose(ContainerCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text, wtypes.text, wtypes.text)
     def get_all(self, container_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None,
+                name=None, name_prefix=None, status=None):
         """Retrieve a list of containers.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
+        :param name: name of the containers to return.
+        :param name_prefix: leading characters of the names of the containers
+                            to return.
+        :param status: status of the containers to return.
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
+        filters = api_utils.validate_filters(name=name,
+                                             name_prefix=name_prefix,
+                                             status=status)
         return self._get_containers_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir, fields=fields,
+                                         filters=filters)
 
     @wsme_pecan.wsexpose(ContainerCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text, wtypes.text)
     def detail(self, container_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc',
+                name=None, name_prefix=None, status=None):
         """Retrieve a list of containers with detail.
 
         :param container_uuid: UUID of a container, to get only containers
@@ -295,6 +335,10 @@ class ContainersController(rest.RestController):
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param name: name of the containers to return.
+        :param name_prefix: leading characters of the names of the containers
+                            to return.
+        :param status: status of the containers to return.
         """
         # NOTE(lucasagomes): /detail should only work agaist collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -303,9 +347,12 @@ class ContainersController(rest.RestController):
 
         expand = True
         resource_url = '/'.join(['containers', 'detail'])
+        filters = api_utils.validate_filters(name=name,
+                                             name_prefix=name_prefix,
+                                             status=status)
         return self._get_containers_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, filters=filters)
 
     @wsme_pecan.wsexpose(Container, types.uuid)
     def get_one(self, container_uuid):
@@ -331,6 +378,7 @@ class ContainersController(rest.RestController):
 
         new_container = objects.Container(pecan.request.context,
                                 **container.as_dict())
+        new_container.obj_set_owner()
         new_container.create()
         res_container = backend_api.container_create(new_container.name,
                                                      new_container.uuid,
@@ -30,6 +30,10 @@ from magnum.common import exception
 from magnum import objects
 
 
+# Fields of a node which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'type', 'image_id', 'ironic_node_id']
+
+
 class NodePatchType(types.JsonPatchType):
 
     @staticmethod
@@ -105,10 +109,9 @@ class Node(base.APIBase):
         setattr(self, 'node_uuid', kwargs.get('node_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(node, url, expand=True):
+    def _convert_with_links(node, url, expand=True, fields=None):
         if not expand:
-            node.unset_fields_except(['uuid', 'name', 'type', 'image_id',
-                                     'ironic_node_id'])
+            node.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the node_id attribute
         node.node_id = wtypes.Unset
@@ -122,9 +125,10 @@ class Node(base.APIBase):
         return node
 
     @classmethod
-    def convert_with_links(cls, rpc_node, expand=True):
+    def convert_with_links(cls, rpc_node, expand=True, fields=None):
         node = Node(**rpc_node.as_dict())
-        return cls._convert_with_links(node, pecan.request.host_url, expand)
+        return cls._convert_with_links(node, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -151,11 +155,16 @@ class NodeCollection(collection.Collection):
         self._type = 'nodes'
 
     @staticmethod
-    def convert_with_links(rpc_nodes, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_nodes, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = NodeCollection()
-        collection.nodes = [Node.convert_with_links(p, expand)
+        collection.nodes = [Node.convert_with_links(p, expand, fields)
                             for p in rpc_nodes]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_nodes,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -178,42 +187,54 @@ class NodesController(rest.RestController):
 
     def _get_nodes_collection(self, marker, limit,
                               sort_key, sort_dir, expand=False,
-                              resource_url=None):
+                              resource_url=None, fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
 
         marker_obj = None
         if marker:
-            marker_obj = objects.Node.get_by_uuid(pecan.request.context,
-                                                  marker)
+            marker_obj = api_utils.get_marker(objects.Node, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.Node,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
         nodes = objects.Node.list(pecan.request.context, limit,
                                 marker_obj, sort_key=sort_key,
-                                sort_dir=sort_dir)
+                                sort_dir=sort_dir,
+                                columns=columns)
 
         return NodeCollection.convert_with_links(nodes, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
                                                 sort_dir=sort_dir)
 
     @wsme_pecan.wsexpose(NodeCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text)
     def get_all(self, node_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None):
         """Retrieve a list of nodes.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
         return self._get_nodes_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir, fields=fields)
 
     @wsme_pecan.wsexpose(NodeCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text)
     def detail(self, node_uuid=None, marker=None, limit=None,
                 sort_key='id', sort_dir='asc'):
         """Retrieve a list of nodes with detail.
@@ -258,6 +279,7 @@ class NodesController(rest.RestController):
 
         new_node = objects.Node(pecan.request.context,
                                 **node.as_dict())
+        new_node.obj_set_owner()
         new_node.create()
         # Set the HTTP Location Header
         pecan.response.location = link.build_url('nodes', new_node.uuid)
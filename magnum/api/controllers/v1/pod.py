@@ -28,6 +28,11 @@ from magnum.common import exception
 from magnum import objects
 
 
+# Fields of a pod which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'desc', 'bay_uuid', 'images', 'labels',
+                  'status']
+
+
 class PodPatchType(types.JsonPatchType):
 
     @staticmethod
@@ -117,10 +122,9 @@ class Pod(base.APIBase):
         setattr(self, 'pod_uuid', kwargs.get('pod_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(pod, url, expand=True):
+    def _convert_with_links(pod, url, expand=True, fields=None):
         if not expand:
-            pod.unset_fields_except(['uuid', 'name', 'desc', 'bay_uuid',
-                                     'images', 'labels', 'status'])
+            pod.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the pod_id attribute
         pod.pod_id = wtypes.Unset
@@ -134,9 +138,10 @@ class Pod(base.APIBase):
         return pod
 
     @classmethod
-    def convert_with_links(cls, rpc_pod, expand=True):
+    def convert_with_links(cls, rpc_pod, expand=True, fields=None):
         pod = Pod(**rpc_pod.as_dict())
-        return cls._convert_with_links(pod, pecan.request.host_url, expand)
+        return cls._convert_with_links(pod, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -165,11 +170,16 @@ class PodCollection(collection.Collection):
         self._type = 'pods'
 
     @staticmethod
-    def convert_with_links(rpc_pods, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_pods, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = PodCollection()
-        collection.pods = [Pod.convert_with_links(p, expand)
+        collection.pods = [Pod.convert_with_links(p, expand, fields)
                            for p in rpc_pods]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_pods,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -195,44 +205,75 @@ class PodsController(rest.RestController):
 
     def _get_pods_collection(self, marker, limit,
                              sort_key, sort_dir, expand=False,
-                             resource_url=None):
+                             resource_url=None, fields=None, filters=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        filters = filters or {}
 
         marker_obj = None
         if marker:
-            marker_obj = objects.Pod.get_by_uuid(pecan.request.context,
-                                                 marker)
+            marker_obj = api_utils.get_marker(objects.Pod, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.Pod,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
+        db_filters = api_utils.get_db_filters(filters)
         pods = pecan.request.rpcapi.pod_list(pecan.request.context, limit,
                                          marker_obj, sort_key=sort_key,
-                                         sort_dir=sort_dir)
+                                         sort_dir=sort_dir,
+                                         columns=columns,
+                                         filters=db_filters)
 
         return PodCollection.convert_with_links(pods, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
-                                                sort_dir=sort_dir)
+                                                sort_dir=sort_dir,
+                                                **filters)
 
     @wsme_pecan.wsexpose(PodCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, types.uuid, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text)
     def get_all(self, pod_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None, bay_uuid=None,
+                name=None, name_prefix=None, status=None, labels=None):
         """Retrieve a list of pods.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
+        :param bay_uuid: UUID of a bay, to get only the pods of that bay.
+        :param name: name of the pods to return.
+        :param name_prefix: leading characters of the names of the pods
+                            to return.
+        :param status: status of the pods to return.
+        :param labels: label selector, key=value[,key=value...].
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix,
+                                             status=status, labels=labels)
         return self._get_pods_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir, fields=fields,
+                                         filters=filters)
 
     @wsme_pecan.wsexpose(PodCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         types.uuid, wtypes.text, wtypes.text, wtypes.text,
+                         wtypes.text)
     def detail(self, pod_uuid=None, marker=None, limit=None,
-               sort_key='id', sort_dir='asc'):
+               sort_key='id', sort_dir='asc', bay_uuid=None, name=None,
+               name_prefix=None, status=None, labels=None):
         """Retrieve a list of pods with detail.
 
         :param pod_uuid: UUID of a pod, to get only pods for that pod.
@@ -240,6 +281,12 @@ class PodsController(rest.RestController):
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param bay_uuid: UUID of a bay, to get only the pods of that bay.
+        :param name: name of the pods to return.
+        :param name_prefix: leading characters of the names of the pods
+                            to return.
+        :param status: status of the pods to return.
+        :param labels: label selector, key=value[,key=value...].
         """
         # NOTE(lucasagomes): /detail should only work agaist collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -248,9 +295,12 @@ class PodsController(rest.RestController):
 
         expand = True
         resource_url = '/'.join(['pods', 'detail'])
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix,
+                                             status=status, labels=labels)
         return self._get_pods_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, filters=filters)
 
     @wsme_pecan.wsexpose(Pod, types.uuid)
     def get_one(self, pod_uuid):
@@ -275,6 +325,7 @@ class PodsController(rest.RestController):
 
         pod_obj = objects.Pod(pecan.request.context,
                               **pod.as_dict())
+        pod_obj.obj_set_owner()
         new_pod = pecan.request.rpcapi.pod_create(pod_obj)
         # Set the HTTP Location Header
         pecan.response.location = link.build_url('pods', new_pod.uuid)
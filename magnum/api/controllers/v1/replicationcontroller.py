@@ -29,6 +29,11 @@ from magnum.common import exception
 from magnum import objects
 
 
+# Fields of a replication controller which are returned by the list
+# (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'images', 'bay_uuid', 'selector', 'replicas']
+
+
 class ReplicationControllerPatchType(types.JsonPatchType):
 
     @staticmethod
@@ -115,10 +120,9 @@ class ReplicationController(base.APIBase):
         setattr(self, 'rc_uuid', kwargs.get('rc_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(rc, url, expand=True):
+    def _convert_with_links(rc, url, expand=True, fields=None):
         if not expand:
-            rc.unset_fields_except(['uuid', 'name', 'images', 'bay_uuid',
-                                    'selector', 'replicas'])
+            rc.unset_fields_except(fields or SUMMARY_FIELDS)
 
         # never expose the rc_id attribute
         rc.rc_id = wtypes.Unset
@@ -132,9 +136,10 @@ class ReplicationController(base.APIBase):
         return rc
 
     @classmethod
-    def convert_with_links(cls, rpc_rc, expand=True):
+    def convert_with_links(cls, rpc_rc, expand=True, fields=None):
         rc = ReplicationController(**rpc_rc.as_dict())
-        return cls._convert_with_links(rc, pecan.request.host_url, expand)
+        return cls._convert_with_links(rc, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -162,11 +167,17 @@ class ReplicationControllerCollection(collection.Collection):
         self._type = 'rcs'
 
     @staticmethod
-    def convert_with_links(rpc_rcs, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_rcs, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = ReplicationControllerCollection()
-        collection.rcs = [ReplicationController.convert_with_links(p, expand)
+        collection.rcs = [ReplicationController.convert_with_links(p, expand,
+                                                                   fields)
                            for p in rpc_rcs]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_rcs,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -192,45 +203,71 @@ class ReplicationControllersController(rest.RestController):
 
     def _get_rcs_collection(self, marker, limit,
                              sort_key, sort_dir, expand=False,
-                             resource_url=None):
+                             resource_url=None, fields=None, filters=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        filters = filters or {}
 
         marker_obj = None
         if marker:
-            marker_obj = objects.ReplicationController.get_by_uuid(
-                                                 pecan.request.context,
-                                                 marker)
+            marker_obj = api_utils.get_marker(
+                objects.ReplicationController, marker, sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.ReplicationController,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
+        db_filters = api_utils.get_db_filters(filters)
         rcs = pecan.request.rpcapi.rc_list(pecan.request.context, limit,
                                          marker_obj, sort_key=sort_key,
-                                         sort_dir=sort_dir)
+                                         sort_dir=sort_dir,
+                                         columns=columns,
+                                         filters=db_filters)
 
         return ReplicationControllerCollection.convert_with_links(rcs, limit,
                                                 url=resource_url,
                                                 expand=expand,
+                                                fields=fields,
                                                 sort_key=sort_key,
-                                                sort_dir=sort_dir)
+                                                sort_dir=sort_dir,
+                                                **filters)
 
     @wsme_pecan.wsexpose(ReplicationControllerCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text, types.uuid, wtypes.text, wtypes.text)
     def get_all(self, rc_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None,
+                bay_uuid=None, name=None, name_prefix=None):
         """Retrieve a list of ReplicationControllers.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
+        :param bay_uuid: UUID of a bay, to get only the ReplicationControllers
+                         of that bay.
+        :param name: name of the ReplicationControllers to return.
+        :param name_prefix: leading characters of the names of the
+                            ReplicationControllers to return.
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix)
         return self._get_rcs_collection(marker, limit, sort_key,
-                                        sort_dir)
+                                        sort_dir, fields=fields,
+                                        filters=filters)
 
     @wsme_pecan.wsexpose(ReplicationControllerCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         types.uuid, wtypes.text, wtypes.text)
     def detail(self, rc_uuid=None, marker=None, limit=None,
-               sort_key='id', sort_dir='asc'):
+               sort_key='id', sort_dir='asc',
+               bay_uuid=None, name=None, name_prefix=None):
         """Retrieve a list of ReplicationControllers with detail.
 
         :param rc_uuid: UUID of a ReplicationController, to get only
@@ -239,6 +276,11 @@ class ReplicationControllersController(rest.RestController):
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param bay_uuid: UUID of a bay, to get only the ReplicationControllers
+                         of that bay.
+        :param name: name of the ReplicationControllers to return.
+        :param name_prefix: leading characters of the names of the
+                            ReplicationControllers to return.
         """
         # NOTE(jay-lau-513): /detail should only work agaist collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -247,9 +289,11 @@ class ReplicationControllersController(rest.RestController):
 
         expand = True
         resource_url = '/'.join(['rcs', 'detail'])
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix)
         return self._get_rcs_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, filters=filters)
 
     @wsme_pecan.wsexpose(ReplicationController, types.uuid)
     def get_one(self, rc_uuid):
@@ -276,6 +320,7 @@ class ReplicationControllersController(rest.RestController):
 
         rc_obj = objects.ReplicationController(pecan.request.context,
                               **rc.as_dict())
+        rc_obj.obj_set_owner()
         new_rc = pecan.request.rpcapi.rc_create(rc_obj)
         # Set the HTTP Location Header
         pecan.response.location = link.build_url('rcs', new_rc.uuid)
@@ -31,6 +31,11 @@ from magnum import objects
 _ = _LI = _LW = _LE = _LC = lambda x: x
 
 
+# Fields of a service which are returned by the list (non-detail) view
+SUMMARY_FIELDS = ['uuid', 'name', 'bay_uuid', 'labels', 'selector', 'ip',
+                  'port']
+
+
 class ServicePatchType(types.JsonPatchType):
 
     @staticmethod
@@ -102,10 +107,9 @@ class Service(base.APIBase):
         setattr(self, 'service_uuid', kwargs.get('service_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(service, url, expand=True):
+    def _convert_with_links(service, url, expand=True, fields=None):
         if not expand:
-            service.unset_fields_except(['uuid', 'name', 'bay_uuid', 'labels',
-                                         'selector', 'ip', 'port'])
+            service.unset_fields_except(fields or SUMMARY_FIELDS)
         # never expose the service_id attribute
         service.service_id = wtypes.Unset
 
@@ -118,9 +122,10 @@ class Service(base.APIBase):
         return service
 
     @classmethod
-    def convert_with_links(cls, rpc_service, expand=True):
+    def convert_with_links(cls, rpc_service, expand=True, fields=None):
         service = Service(**rpc_service.as_dict())
-        return cls._convert_with_links(service, pecan.request.host_url, expand)
+        return cls._convert_with_links(service, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -148,11 +153,15 @@ class ServiceCollection(collection.Collection):
 
     @staticmethod
     def convert_with_links(rpc_services, limit, url=None,
-                           expand=False, **kwargs):
+                           expand=False, fields=None, **kwargs):
         collection = ServiceCollection()
-        collection.services = [Service.convert_with_links(p, expand)
+        collection.services = [Service.convert_with_links(p, expand, fields)
                                for p in rpc_services]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        collection.next = collection.get_next(limit, url=url,
+                                              rpc_objects=rpc_services,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -178,46 +187,75 @@ class ServicesController(rest.RestController):
 
     def _get_services_collection(self, marker, limit,
                                  sort_key, sort_dir, expand=False,
-                                 resource_url=None):
+                                 resource_url=None, fields=None, filters=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        filters = filters or {}
 
         marker_obj = None
         if marker:
-            marker_obj = objects.Service.get_by_uuid(pecan.request.context,
-                                                     marker)
+            marker_obj = api_utils.get_marker(objects.Service, marker,
+                                              sort_key)
+
+        columns = None
+        if not expand:
+            columns = api_utils.get_list_columns(objects.Service,
+                                                 fields or SUMMARY_FIELDS,
+                                                 sort_key)
 
+        db_filters = api_utils.get_db_filters(filters)
         services = pecan.request.rpcapi.service_list(pecan.request.context,
                                                  limit,
                                                  marker_obj,
                                                  sort_key=sort_key,
-                                                 sort_dir=sort_dir)
+                                                 sort_dir=sort_dir,
+                                                 columns=columns,
+                                                 filters=db_filters)
 
         return ServiceCollection.convert_with_links(services, limit,
                                                     url=resource_url,
                                                     expand=expand,
+                                                    fields=fields,
                                                     sort_key=sort_key,
-                                                    sort_dir=sort_dir)
+                                                    sort_dir=sort_dir,
+                                                    **filters)
 
     @wsme_pecan.wsexpose(ServiceCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         wtypes.text,
+                         types.uuid, wtypes.text, wtypes.text, wtypes.text)
     def get_all(self, service_uuid=None, marker=None, limit=None,
-                sort_key='id', sort_dir='asc'):
+                sort_key='id', sort_dir='asc', fields=None,
+                bay_uuid=None, name=None, name_prefix=None, labels=None):
         """Retrieve a list of services.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: comma separated list of the fields to return.
+                       Default: all the fields of the list view.
+        :param bay_uuid: UUID of a bay, to get only the services of that bay.
+        :param name: name of the services to return.
+        :param name_prefix: leading characters of the names of the services
+                            to return.
+        :param labels: label selector, key=value[,key=value...].
         """
+        fields = api_utils.validate_fields(fields, SUMMARY_FIELDS)
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix,
+                                             labels=labels)
         return self._get_services_collection(marker, limit, sort_key,
-                                             sort_dir)
+                                             sort_dir, fields=fields,
+                                             filters=filters)
 
     @wsme_pecan.wsexpose(ServiceCollection, types.uuid,
-                         types.uuid, int, wtypes.text, wtypes.text)
+                         wtypes.text, int, wtypes.text, wtypes.text,
+                         types.uuid, wtypes.text, wtypes.text, wtypes.text)
     def detail(self, service_uuid=None, marker=None, limit=None,
-               sort_key='id', sort_dir='asc'):
+               sort_key='id', sort_dir='asc',
+               bay_uuid=None, name=None, name_prefix=None, labels=None):
         """Retrieve a list of services with detail.
 
         :param service_uuid: UUID of a service, to get only
@@ -226,6 +264,11 @@ class ServicesController(rest.RestController):
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param bay_uuid: UUID of a bay, to get only the services of that bay.
+        :param name: name of the services to return.
+        :param name_prefix: leading characters of the names of the services
+                            to return.
+        :param labels: label selector, key=value[,key=value...].
         """
         # NOTE(lucasagomes): /detail should only work agaist collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -234,9 +277,12 @@ class ServicesController(rest.RestController):
 
         expand = True
         resource_url = '/'.join(['services', 'detail'])
+        filters = api_utils.validate_filters(bay_uuid=bay_uuid, name=name,
+                                             name_prefix=name_prefix,
+                                             labels=labels)
         return self._get_services_collection(marker, limit,
                                              sort_key, sort_dir, expand,
-                                             resource_url)
+                                             resource_url, filters=filters)
 
     @wsme_pecan.wsexpose(Service, types.uuid)
     def get_one(self, service_uuid):
@@ -262,6 +308,7 @@ class ServicesController(rest.RestController):
 
         service_obj = objects.Service(pecan.request.context,
                                       **service.as_dict())
+        service_obj.obj_set_owner()
         new_service = pecan.request.rpcapi.service_create(service_obj)
         # Set the HTTP Location Header
         pecan.response.location = link.build_url('services', new_service.uuid)
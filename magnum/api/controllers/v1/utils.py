@@ -13,10 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
+import datetime
+
 import jsonpatch
 from oslo.config import cfg
+from oslo.serialization import jsonutils
+from oslo.utils import timeutils
+import pecan
 import wsme
 
+from magnum.common import utils
 from magnum.openstack.common._i18n import _
 
 CONF = cfg.CONF
@@ -42,6 +49,128 @@ def validate_sort_dir(sort_dir):
     return sort_dir
 
 
+def validate_fields(fields, allowed_fields):
+    """Parse the comma separated fields parameter of a collection.
+
+    The uuid is always returned, since the links of every item need it.
+    """
+    if fields is None:
+        return None
+    fields = [f.strip() for f in fields.split(',') if f.strip()]
+    allowed_fields = list(allowed_fields) + ['created_at', 'updated_at']
+    invalid = [f for f in fields if f not in allowed_fields]
+    if invalid:
+        raise wsme.exc.ClientSideError(_("Invalid fields: %s. Acceptable "
+                                         "values are %s") %
+                                       (', '.join(invalid),
+                                        ', '.join(allowed_fields)))
+    if 'uuid' not in fields:
+        fields.insert(0, 'uuid')
+    return fields
+
+
+def get_list_columns(obj_cls, fields, sort_key):
+    """Return the DB columns to load to render the given fields of a list.
+
+    The id and the sort key are always included so that the pagination
+    marker can be built from the last object of the list.
+    """
+    columns = ['id', 'uuid']
+    for name in list(fields) + [sort_key]:
+        if name in obj_cls.fields and name not in columns:
+            columns.append(name)
+    return columns
+
+
+def parse_label_selector(selector):
+    """Parse a ``key=value[,key=value...]`` label selector into a dict."""
+    labels = {}
+    for requirement in selector.split(','):
+        key, sep, value = requirement.partition('=')
+        key, value = key.strip(), value.strip()
+        if not sep or not key:
+            raise wsme.exc.ClientSideError(_("Invalid label selector: %s. "
+                                             "Expected key=value[,key=value"
+                                             "...]") % selector)
+        labels[key] = value
+    return labels
+
+
+def validate_filters(**filters):
+    """Return the filter query parameters of a collection which were given.
+
+    The filters are passed on as is to the link to the next page of the
+    collection, get_db_filters() turns them into DB API filters.
+    """
+    filters = dict((k, v) for k, v in filters.items() if v is not None)
+    if 'labels' in filters:
+        parse_label_selector(filters['labels'])
+    return filters
+
+
+def get_db_filters(filters):
+    """Turn the filters returned by validate_filters() into DB API filters.
+
+    The filtering is done by the database, so that only the matching rows
+    of a page are loaded.
+    """
+    if not filters:
+        return None
+    db_filters = dict(filters)
+    if 'labels' in db_filters:
+        db_filters['labels'] = parse_label_selector(db_filters['labels'])
+    return db_filters
+
+
+def encode_marker(obj, sort_key):
+    """Build an opaque pagination marker pointing after the given object.
+
+    The marker carries the values of the sort key and of the id of the
+    object, so that the next page can be fetched with a single range query
+    without loading the marker object first.
+    """
+    value = obj[sort_key]
+    marker = {'k': sort_key, 'v': value, 'id': obj['id']}
+    if isinstance(value, datetime.datetime):
+        marker['v'] = timeutils.strtime(value)
+        marker['t'] = 'datetime'
+    encoded = base64.urlsafe_b64encode(jsonutils.dumps(marker).encode('utf-8'))
+    return encoded.rstrip(b'=').decode('ascii')
+
+
+def decode_marker(marker, sort_key):
+    """Decode a marker built by encode_marker().
+
+    :returns: a dict of the sort key and id values of the last item of the
+              previous page.
+    """
+    try:
+        padding = b'=' * (-len(marker) % 4)
+        decoded = jsonutils.loads(base64.urlsafe_b64decode(
+            marker.encode('ascii') + padding).decode('utf-8'))
+        key, value, obj_id = decoded['k'], decoded['v'], decoded['id']
+        if decoded.get('t') == 'datetime':
+            value = timeutils.parse_strtime(value)
+    except (TypeError, ValueError, KeyError):
+        raise wsme.exc.ClientSideError(_("Invalid marker: %s") % marker)
+    if key != sort_key:
+        raise wsme.exc.ClientSideError(_("The marker %(marker)s was not "
+                                         "built for sort key %(key)s") %
+                                       {'marker': marker, 'key': sort_key})
+    return {key: value, 'id': obj_id}
+
+
+def get_marker(obj_cls, marker, sort_key):
+    """Return the pagination marker to pass to obj_cls.list().
+
+    Markers built by encode_marker() are decoded in place, while the UUID
+    markers of earlier API versions still require to load the object.
+    """
+    if utils.is_uuid_like(marker):
+        return obj_cls.get_by_uuid(pecan.request.context, marker)
+    return decode_marker(marker, sort_key)
+
+
 def apply_jsonpatch(doc, patch):
     for p in patch:
         if p['op'] == 'add' and p['path'].count('/') == 1:
@@ -23,6 +23,8 @@ from pecan import hooks
 
 from magnum.common import context
 from magnum.conductor import api as conductor_api
+from magnum.db import api as dbapi
+from magnum.objects import base as objects_base
 
 
 class ContextHook(hooks.PecanHook):
@@ -39,6 +41,13 @@ class ContextHook(hooks.PecanHook):
     X-Auth-Token:
         Used for context.auth_token.
 
+    X-Roles:
+        Used for context.is_admin, set when the roles include admin. Admin
+        contexts list the resources of every project.
+
+    X-Magnum-Last-Write:
+        Used for context.last_write, see DBRequestHook.
+
     """
 
     def before(self, state):
@@ -52,6 +61,13 @@ class ContextHook(hooks.PecanHook):
         auth_token = state.request.headers.get('X-Storage-Token')
         auth_token = state.request.headers.get('X-Auth-Token', auth_token)
         auth_token_info = state.request.environ.get('keystone.token_info')
+        roles = [role.strip()
+                 for role in headers.get('X-Roles', '').split(',')]
+
+        try:
+            last_write = float(headers['X-Magnum-Last-Write'])
+        except (KeyError, TypeError, ValueError):
+            last_write = None
 
         auth_url = headers.get('X-Auth-Url')
         if auth_url is None:
@@ -65,11 +81,67 @@ class ContextHook(hooks.PecanHook):
             user=user_id,
             tenant=tenant,
             domain_id=domain_id,
-            domain_name=domain_name)
+            domain_name=domain_name,
+            is_admin='admin' in roles,
+            last_write=last_write)
+        # The objects loaded during the request are cached in its context.
+        objects_base.obj_cache_enable(state.request.context)
 
 
 class RPCHook(hooks.PecanHook):
     """Attach the rpcapi object to the request so controllers can get to it."""
 
     def before(self, state):
-        state.request.rpcapi = conductor_api.API(context=state.request.context)
\ No newline at end of file
+        state.request.rpcapi = conductor_api.API(context=state.request.context)
+
+
+class DBRequestHook(hooks.PecanHook):
+    """Shares one DB session between the queries of a request.
+
+    GET and HEAD requests are read-only and run in a single transaction,
+    so that e.g. a marker lookup and the following list read the same
+    snapshot over the same connection. Their writes to the database fail
+    with ReadOnlyRequestWrite rather than being rolled back. Other requests
+    mostly hand their writes over to the conductor, so no transaction is
+    held open across those RPC calls.
+
+    The time of the last write made for the client is returned in the
+    X-Magnum-Last-Write header. Clients sending it back with their next
+    requests read their own writes, even when the read-only requests are
+    sent to a slave database.
+    """
+
+    def before(self, state):
+        read_only = state.request.method in ('GET', 'HEAD')
+        dbapi.get_instance().begin_request(
+            read_only=read_only, transaction=read_only,
+            last_write=getattr(state.request.context, 'last_write', None))
+
+    def after(self, state):
+        # The conductor may also have written, see rpc_service.API.
+        writes = [dbapi.get_instance().end_request(
+            commit=state.response.status_int < 400),
+            getattr(state.request.context, 'last_write', None)]
+        writes = [w for w in writes if w is not None]
+        if writes:
+            state.response.headers['X-Magnum-Last-Write'] = (
+                '%.6f' % max(writes))
+
+    def on_error(self, state, e):
+        dbapi.get_instance().end_request(commit=False)
+
+
+class LastWriteHook(hooks.PecanHook):
+    """Returns the time of the last write made for the client.
+
+    This replaces DBRequestHook when the API service runs the remotable
+    methods of the objects on the conductor, see the use_conductor option.
+    The service then does not access the database, and the time of the
+    writes of the conductor is returned in the X-Magnum-Last-Write header.
+    """
+
+    def after(self, state):
+        last_write = getattr(state.request.context, 'last_write', None)
+        if last_write is not None:
+            state.response.headers['X-Magnum-Last-Write'] = (
+                '%.6f' % last_write)
@@ -23,6 +23,8 @@ from oslo.config import cfg
 
 from magnum.api import app as api_app
 from magnum.common import service
+from magnum.conductor import api as conductor_api
+from magnum.objects import base as objects_base
 from magnum.openstack.common._i18n import _
 from magnum.openstack.common import log as logging
 
@@ -33,6 +35,10 @@ LOG = logging.getLogger(__name__)
 def main():
     service.prepare_service(sys.argv)
 
+    if cfg.CONF.api.use_conductor:
+        objects_base.MagnumObject.indirection_api = (
+            conductor_api.IndirectionAPI())
+
     app = api_app.setup_app()
 
     # Create the WSGI server and start it
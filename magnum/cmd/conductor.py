@@ -22,7 +22,9 @@ from oslo.config import cfg
 
 from magnum.common import rpc_service as service
 from magnum.conductor.handlers import bay_k8s_heat
+from magnum.conductor.handlers.common import docker_events
 from magnum.conductor.handlers import docker_conductor
+from magnum.conductor.handlers import indirection
 from magnum.conductor.handlers import kube as k8s_conductor
 from magnum.openstack.common._i18n import _
 from magnum.openstack.common import log as logging
@@ -40,11 +42,17 @@ def main():
 
     cfg.CONF.import_opt('topic', 'magnum.conductor.config', group='conductor')
     cfg.CONF.import_opt('host', 'magnum.conductor.config', group='conductor')
+    docker_handler = docker_conductor.Handler()
     endpoints = [
-        docker_conductor.Handler(),
+        docker_handler,
         k8s_conductor.Handler(),
-        bay_k8s_heat.Handler()
+        bay_k8s_heat.Handler(),
+        indirection.Handler()
     ]
+    if cfg.CONF.docker.consume_events:
+        docker_events.DockerEventsConsumer(
+            cfg.CONF.docker.host_url,
+            docker_ids=docker_handler.docker_ids).start()
     server = service.Service(cfg.CONF.conductor.topic,
                              cfg.CONF.conductor.host, endpoints)
     server.serve()
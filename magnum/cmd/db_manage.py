@@ -13,12 +13,15 @@
 
 """Starter script for magnum-db-manage."""
 
+import datetime
 import os
 
 from oslo.config import cfg
 from oslo.db import options
 from oslo.db.sqlalchemy.migration_cli import manager
+from oslo.utils import timeutils
 
+from magnum.db import api as dbapi
 from magnum.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
@@ -46,6 +49,33 @@ def do_revision(mgr):
                  autogenerate=CONF.command.autogenerate)
 
 
+def do_purge(mgr):
+    before = timeutils.utcnow() - datetime.timedelta(
+        days=CONF.command.older_than)
+    counts = dbapi.get_instance().purge_deleted(
+        before, batch_size=CONF.command.batch_size)
+    for table, count in sorted(counts.items()):
+        print('Purged %d deleted rows from %s' % (count, table))
+
+
+def do_archive(mgr):
+    before = None
+    if CONF.command.older_than is not None:
+        before = timeutils.utcnow() - datetime.timedelta(
+            days=CONF.command.older_than)
+    counts = dbapi.get_instance().archive_deleted(
+        before, batch_size=CONF.command.batch_size)
+    for table, count in sorted(counts.items()):
+        print('Archived %d deleted rows of %s' % (count, table))
+
+
+def do_stats(mgr):
+    print('%-30s %12s %12s' % ('Table', 'Rows', 'Size (KiB)'))
+    for stats in dbapi.get_instance().get_table_stats():
+        size = '-' if stats['size'] is None else stats['size'] // 1024
+        print('%-30s %12d %12s' % (stats['table'], stats['rows'], size))
+
+
 def add_command_parsers(subparsers):
     parser = subparsers.add_parser('version')
     parser.set_defaults(func=do_version)
@@ -67,6 +97,27 @@ def add_command_parsers(subparsers):
     parser.add_argument('--autogenerate', action='store_true')
     parser.set_defaults(func=do_revision)
 
+    parser = subparsers.add_parser('purge')
+    parser.add_argument('--older-than', type=int, default=30,
+                        help='Number of days since the rows were deleted.')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Maximum number of rows deleted per '
+                             'transaction.')
+    parser.set_defaults(func=do_purge)
+
+    parser = subparsers.add_parser('archive')
+    parser.add_argument('--older-than', type=int,
+                        help='Number of days since the rows were deleted. '
+                             'All the deleted rows are archived by '
+                             'default.')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Maximum number of rows moved per '
+                             'transaction.')
+    parser.set_defaults(func=do_archive)
+
+    parser = subparsers.add_parser('stats')
+    parser.set_defaults(func=do_stats)
+
 
 def get_manager():
     if cfg.CONF.database.connection is None:
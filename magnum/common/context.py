@@ -21,16 +21,20 @@ class RequestContext(context.RequestContext):
     def __init__(self, auth_token=None, auth_url=None, domain_id=None,
                  domain_name=None, user=None, tenant=None, is_admin=False,
                  is_public_api=False, read_only=False, show_deleted=False,
-                 request_id=None, trust_id=None, auth_token_info=None):
+                 request_id=None, trust_id=None, auth_token_info=None,
+                 last_write=None):
         """Stores several additional request parameters:
 
         :param domain_id: The ID of the domain.
         :param domain_name: The name of the domain.
         :param is_public_api: Specifies whether the request should be processed
                               without authentication.
+        :param last_write: The time of the last write to the database made
+                           for the client of the request, if known.
 
         """
         self.is_public_api = is_public_api
+        self.last_write = last_write
         self.domain_id = domain_id
         self.domain_name = domain_name
         self.auth_url = auth_url
@@ -54,10 +58,9 @@ class RequestContext(context.RequestContext):
                 'request_id': self.request_id,
                 'domain_id': self.domain_id,
                 'domain_name': self.domain_name,
-                'is_public_api': self.is_public_api}
+                'is_public_api': self.is_public_api,
+                'last_write': self.last_write}
 
     @classmethod
     def from_dict(cls, values):
-        values.pop('user', None)
-        values.pop('tenant', None)
         return cls(**values)
@@ -264,6 +264,11 @@ class OrphanedObjectError(MagnumException):
     message = _('Cannot call %(method)s on orphaned %(objtype)s object')
 
 
+class ObjectDeltaMismatch(MagnumException):
+    message = _('The changes sent for %(objtype)s %(uuid)s do not apply to '
+                'its current version')
+
+
 class Invalid(MagnumException):
     message = _("Unacceptable parameters.")
     code = 400
@@ -290,6 +295,15 @@ class InvalidState(Conflict):
     message = _("Invalid resource state.")
 
 
+class ConcurrentUpdate(Conflict):
+    message = _("The %(resource)s %(id)s was updated concurrently, reload "
+                "it and retry.")
+
+
+class ReadOnlyRequestWrite(MagnumException):
+    message = _("Cannot write to the database within a read-only request.")
+
+
 # Cannot be templated as the error syntax varies.
 # msg needs to be constructed when raised.
 class InvalidParameterValue(Invalid):
@@ -14,11 +14,16 @@
 
 """Common RPC service and API tools for Magnum."""
 
+import functools
+import time
+
 import eventlet
 from oslo.config import cfg
 from oslo import messaging
 
 import magnum.common.context
+from magnum.common import exception
+from magnum.db import api as dbapi
 from magnum.objects import base as objects_base
 
 
@@ -61,14 +66,41 @@ class RequestContextSerializer(messaging.Serializer):
         return magnum.common.context.RequestContext.from_dict(context)
 
 
+class RequestScopedEndpoint(object):
+    """Runs each RPC method of an endpoint within a DB request scope.
+
+    The DB queries of one call share a session instead of opening one
+    each. No transaction spans the call, since the handlers interleave
+    their writes with calls to Heat, Kubernetes or Docker. The objects
+    loaded during the call are cached in its context.
+    """
+
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def __getattr__(self, name):
+        attr = getattr(self._endpoint, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def wrapper(ctxt, *args, **kwargs):
+            objects_base.obj_cache_enable(ctxt)
+            with dbapi.request_scope(transaction=False, context=ctxt):
+                return attr(ctxt, *args, **kwargs)
+        return wrapper
+
+
 class Service(object):
     _server = None
 
     def __init__(self, topic, server, handlers):
+        handlers = [RequestScopedEndpoint(h) for h in handlers]
         serializer = RequestContextSerializer(
             objects_base.MagnumObjectSerializer())
-        transport = messaging.get_transport(cfg.CONF,
-                                            aliases=TRANSPORT_ALIASES)
+        transport = messaging.get_transport(
+            cfg.CONF, allowed_remote_exmods=[exception.__name__],
+            aliases=TRANSPORT_ALIASES)
         # TODO(asalkeld) add support for version='x.y'
         target = messaging.Target(topic=topic, server=server)
         self._server = messaging.get_rpc_server(transport, target, handlers,
@@ -84,8 +116,11 @@ class API(object):
         serializer = RequestContextSerializer(
             objects_base.MagnumObjectSerializer())
         if transport is None:
-            transport = messaging.get_transport(cfg.CONF,
-                                                aliases=TRANSPORT_ALIASES)
+            # The magnum exceptions raised by the server, e.g. the
+            # ObjectDeltaMismatch of remotable(), are raised as such.
+            transport = messaging.get_transport(
+                cfg.CONF, allowed_remote_exmods=[exception.__name__],
+                aliases=TRANSPORT_ALIASES)
         self._context = context
         if topic is None:
             topic = ''
@@ -96,6 +131,17 @@ class API(object):
     def _call(self, method, *args, **kwargs):
         return self._client.call(self._context, method, *args, **kwargs)
 
+    def _call_write(self, method, *args, **kwargs):
+        """Call a method which writes to the database for the client.
+
+        The time of the write is recorded in the context, so that the reads
+        which follow are not sent to a lagging slave database.
+        """
+        result = self._call(method, *args, **kwargs)
+        if self._context is not None:
+            self._context.last_write = time.time()
+        return result
+
     def _cast(self, method, *args, **kwargs):
         self._client.cast(self._context, method, *args, **kwargs)
 
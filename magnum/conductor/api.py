@@ -11,6 +11,8 @@
 #    limitations under the License.
 
 """API for interfacing with Magnum Backend."""
+import time
+
 from oslo.config import cfg
 
 from magnum.common import rpc_service
@@ -47,13 +49,15 @@ class API(rpc_service.API):
     # Bay Operations
 
     def bay_create(self, bay):
-        return self._call('bay_create', bay=bay)
+        return self._call_write('bay_create', bay=bay)
 
-    def bay_list(self, context, limit, marker, sort_key, sort_dir):
-        return objects.Bay.list(context, limit, marker, sort_key, sort_dir)
+    def bay_list(self, context, limit, marker, sort_key, sort_dir,
+                 columns=None, filters=None):
+        return objects.Bay.list(context, limit, marker, sort_key, sort_dir,
+                                columns=columns, filters=filters)
 
     def bay_delete(self, uuid):
-        return self._call('bay_delete', uuid=uuid)
+        return self._call_write('bay_delete', uuid=uuid)
 
     def bay_show(self, ctxt, uuid):
         return objects.Bay.get_by_uuid(ctxt, uuid)
@@ -61,15 +65,17 @@ class API(rpc_service.API):
     # Service Operations
 
     def service_create(self, service):
-        return self._call('service_create', service=service)
+        return self._call_write('service_create', service=service)
 
-    def service_list(self, context, limit, marker, sort_key, sort_dir):
+    def service_list(self, context, limit, marker, sort_key, sort_dir,
+                     columns=None, filters=None):
         # TODO(pkilambi): return kubectl results once we parse appropriately
         # or figure out a clean way to interact with k8s.
-        return objects.Service.list(context, limit, marker, sort_key, sort_dir)
+        return objects.Service.list(context, limit, marker, sort_key, sort_dir,
+                                    columns=columns, filters=filters)
 
     def service_delete(self, service):
-        return self._call('service_delete', service=service)
+        return self._call_write('service_delete', service=service)
 
     def service_show(self, ctxt, uuid):
         return objects.Service.get_by_uuid(ctxt, uuid)
@@ -77,13 +83,15 @@ class API(rpc_service.API):
     # Pod Operations
 
     def pod_create(self, pod):
-        return self._call('pod_create', pod=pod)
+        return self._call_write('pod_create', pod=pod)
 
-    def pod_list(self, context, limit, marker, sort_key, sort_dir):
-        return objects.Pod.list(context, limit, marker, sort_key, sort_dir)
+    def pod_list(self, context, limit, marker, sort_key, sort_dir,
+                 columns=None, filters=None):
+        return objects.Pod.list(context, limit, marker, sort_key, sort_dir,
+                                columns=columns, filters=filters)
 
     def pod_delete(self, pod):
-        return self._call('pod_delete', pod=pod)
+        return self._call_write('pod_delete', pod=pod)
 
     def pod_show(self, ctxt, uuid):
         return objects.Pod.get_by_uuid(ctxt, uuid)
@@ -91,14 +99,17 @@ class API(rpc_service.API):
     # ReplicationController Operations
 
     def rc_create(self, rc):
-        return self._call('rc_create', rc=rc)
+        return self._call_write('rc_create', rc=rc)
 
-    def rc_list(self, context, limit, marker, sort_key, sort_dir):
+    def rc_list(self, context, limit, marker, sort_key, sort_dir,
+                columns=None, filters=None):
         return objects.ReplicationController.list(context, limit, marker,
-                                                  sort_key, sort_dir)
+                                                  sort_key, sort_dir,
+                                                  columns=columns,
+                                                  filters=filters)
 
     def rc_delete(self, rc):
-        return self._call('rc_delete', rc=rc)
+        return self._call_write('rc_delete', rc=rc)
 
     def rc_show(self, ctxt, uuid):
         return objects.ReplicationController.get_by_uuid(ctxt, uuid)
@@ -141,3 +152,43 @@ class API(rpc_service.API):
     def container_execute(self, container_uuid, command):
         return self._call('container_execute', container_uuid=container_uuid,
                           command=command)
+
+
+class IndirectionAPI(rpc_service.API):
+    """Runs the remotable methods of the magnum objects on the conductor.
+
+    Set as MagnumObject.indirection_api, it lets a service use the objects
+    without accessing the database itself.
+    """
+
+    def __init__(self, transport=None, topic=None):
+        if topic is None:
+            cfg.CONF.import_opt('topic', 'magnum.conductor.config',
+                                group='conductor')
+            topic = cfg.CONF.conductor.topic
+        super(IndirectionAPI, self).__init__(transport, topic=topic)
+
+    def object_class_action(self, context, objname, objmethod, objver,
+                            args, kwargs):
+        return self._client.call(context, 'object_class_action',
+                                 objname=objname, objmethod=objmethod,
+                                 objver=objver, args=args, kwargs=kwargs)
+
+    def object_class_actions(self, context, calls):
+        """Run several remotable classmethods in a single RPC call.
+
+        :param calls: a list of (objname, objmethod, objver, args, kwargs).
+        :returns: the list of the results of the calls.
+        """
+        return self._client.call(context, 'object_class_actions',
+                                 calls=calls)
+
+    def object_action(self, context, objinst, objmethod, args, kwargs):
+        result = self._client.call(context, 'object_action',
+                                   objinst=objinst, objmethod=objmethod,
+                                   args=args, kwargs=kwargs)
+        # refresh() is the only remotable method of the objects, other than
+        # their classmethods, which does not write.
+        if objmethod != 'refresh':
+            context.last_write = time.time()
+        return result
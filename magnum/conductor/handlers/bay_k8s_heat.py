@@ -16,6 +16,7 @@ from heatclient.common import template_utils
 from oslo.config import cfg
 
 from magnum.common import clients
+from magnum.common import exception
 from magnum import objects
 from magnum.openstack.common._i18n import _
 from magnum.openstack.common import log as logging
@@ -105,7 +106,16 @@ class Handler(object):
                 minion_addresses = stack.outputs[0]['output_value']
                 bay.master_address = master_address
                 bay.minions_address = minion_addresses
-                bay.save()
+                try:
+                    bay.save()
+                except exception.ConcurrentUpdate:
+                    # The bay was updated meanwhile, e.g. through the API.
+                    # The addresses are saved again by the next poll, on
+                    # top of its current version.
+                    LOG.debug('Bay %s was updated concurrently, retrying'
+                              % bay.uuid)
+                    bay.refresh()
+                    return
                 raise loopingcall.LoopingCallDone()
             # poll_and_check is detached and polling long time to check status,
             # so another user/client can call delete bay/stack.
@@ -23,7 +23,7 @@ CONF = cfg.CONF
 
 
 class DockerHTTPClient(client.Client):
-    def __init__(self, url='unix://var/run/docker.sock'):
+    def __init__(self, url='unix://var/run/docker.sock', timeout=10):
         if (CONF.docker.cert_file or
                 CONF.docker.key_file):
             client_cert = (CONF.docker.cert_file, CONF.docker.key_file)
@@ -41,7 +41,7 @@ class DockerHTTPClient(client.Client):
         super(DockerHTTPClient, self).__init__(
             base_url=url,
             version='1.15',
-            timeout=10,
+            timeout=timeout,
             tls=ssl_config
         )
 
@@ -0,0 +1,167 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Magnum Docker events consumer."""
+
+import json
+
+from docker import errors
+import eventlet
+from oslo.config import cfg
+import six
+
+from magnum.common import context
+from magnum.common import exception
+from magnum.common import utils
+from magnum.conductor.handlers.common import docker_client
+from magnum import objects
+from magnum.openstack.common._i18n import _LE
+from magnum.openstack.common._i18n import _LW
+from magnum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# Container status recorded in the DB for each Docker event. Events which
+# are not listed here do not change the state of a container.
+EVENT_STATUS = {
+    'create': 'Stopped',
+    'start': 'Running',
+    'restart': 'Running',
+    'unpause': 'Running',
+    'pause': 'Paused',
+    'die': 'Stopped',
+    'stop': 'Stopped',
+    'kill': 'Stopped',
+}
+
+
+class DockerEventsConsumer(object):
+    """Follows the events stream of a Docker host.
+
+    Keeps the status column of the containers managed by magnum and the
+    container uuid to Docker id mapping current, so that neither has to be
+    looked up on the Docker daemon for every request.
+    """
+
+    def __init__(self, url, docker_ids=None):
+        self.url = url
+        self.docker_ids = docker_ids if docker_ids is not None else {}
+        self.context = context.RequestContext(is_admin=True)
+        self._uuids = dict((v, k) for k, v in self.docker_ids.items())
+        self._docker = None
+        self._thread = None
+
+    @property
+    def docker(self):
+        if self._docker is None:
+            # The events stream stays idle for as long as no container
+            # changes state, so it must not time out.
+            self._docker = docker_client.DockerHTTPClient(self.url,
+                                                          timeout=None)
+        return self._docker
+
+    def start(self):
+        self._thread = eventlet.spawn(self.run)
+        return self._thread
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.kill()
+            self._thread = None
+
+    def run(self):
+        while True:
+            try:
+                self.sync()
+                for event in self.docker.events():
+                    self.process_event(event)
+            except Exception:
+                LOG.exception(_LE('Lost the events stream of Docker host '
+                                  '%s'), self.url)
+            self._docker = None
+            eventlet.sleep(CONF.docker.events_retry_interval)
+
+    def sync(self):
+        """Record the current state of every container on the host.
+
+        Events which were emitted while the stream was not consumed are
+        lost, so this is done every time the stream is (re)connected.
+        """
+        for info in self.docker.list_instances(inspect=True):
+            self._record(info)
+
+    def process_event(self, event):
+        if isinstance(event, six.string_types):
+            event = json.loads(event)
+        docker_id = event.get('id')
+        action = event.get('status')
+        if not docker_id or not action:
+            return
+
+        if action == 'destroy':
+            container_uuid = self._uuids.pop(docker_id, None)
+            if container_uuid is not None:
+                self.docker_ids.pop(container_uuid, None)
+            return
+
+        status = EVENT_STATUS.get(action)
+        if status is None:
+            return
+
+        container_uuid = self._uuids.get(docker_id)
+        if container_uuid is None:
+            try:
+                info = self.docker.inspect_container(docker_id)
+            except errors.APIError as e:
+                LOG.warn(_LW('Unable to inspect Docker container %(id)s: '
+                             '%(err)s'), {'id': docker_id, 'err': e})
+                return
+            self._record(info)
+        else:
+            self._update_status(container_uuid, status)
+
+    def _record(self, info):
+        container_uuid = info['Config'].get('Hostname')
+        if not utils.is_uuid_like(container_uuid):
+            # Containers created through magnum use their uuid as hostname.
+            return
+        self.docker_ids[container_uuid] = info['Id']
+        self._uuids[info['Id']] = container_uuid
+        self._update_status(container_uuid, self._status_from_state(
+            info.get('State', {})))
+
+    @staticmethod
+    def _status_from_state(state):
+        if state.get('Paused'):
+            return 'Paused'
+        if state.get('Running'):
+            return 'Running'
+        return 'Stopped'
+
+    def _update_status(self, container_uuid, status):
+        try:
+            container = objects.Container.get_by_uuid(self.context,
+                                                      container_uuid)
+        except exception.ContainerNotFound:
+            # The container was not created through magnum.
+            return
+        if container.status != status:
+            container.status = status
+            try:
+                container.save()
+            except exception.ConcurrentUpdate:
+                # The container was updated since it was loaded, the status
+                # reported by Docker is applied to its current version.
+                container.refresh()
+                container.status = status
+                container.save()
@@ -42,6 +42,14 @@ docker_opts = [
     cfg.StrOpt('key_file',
                help='Location of TLS private key file for '
                     'securing docker api requests (tlskey).'),
+    cfg.BoolOpt('consume_events',
+                default=True,
+                help='If set, the conductor keeps container state current '
+                     'by following the Docker events stream.'),
+    cfg.IntOpt('events_retry_interval',
+               default=5,
+               help='Seconds to wait before reconnecting to the Docker '
+                    'events stream after it was interrupted.'),
 ]
 
 CONF.register_opts(docker_opts, 'docker')
@@ -52,6 +60,9 @@ class Handler(object):
     def __init__(self):
         super(Handler, self).__init__()
         self._docker = None
+        # Mapping of container uuid (the Docker hostname) to Docker id. It
+        # is shared with the events consumer, which keeps it current.
+        self.docker_ids = {}
 
     @property
     def docker(self):
@@ -60,9 +71,13 @@ class Handler(object):
         return self._docker
 
     def _find_container_by_name(self, name):
+        docker_id = self.docker_ids.get(name)
+        if docker_id is not None:
+            return {'Id': docker_id}
         try:
             for info in self.docker.list_instances(inspect=True):
                 if info['Config'].get('Hostname') == name:
+                    self.docker_ids[name] = info['Id']
                     return info
         except errors.APIError as e:
             if e.response.status_code != 404:
@@ -100,6 +115,7 @@ class Handler(object):
         LOG.debug("container_delete %s" % container_uuid)
         try:
             docker_id = self._find_container_by_name(container_uuid)
+            self.docker_ids.pop(container_uuid, None)
             return self.docker.remove_container(docker_id)
         except errors.APIError as api_error:
             raise Exception("Docker API Error : %s" % str(api_error))
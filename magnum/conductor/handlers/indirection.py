@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Magnum object indirection RPC handler."""
+
+from magnum.objects import base as objects_base
+from magnum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class Handler(object):
+    """Runs the remotable methods of the magnum objects.
+
+    This is the remote end of magnum.conductor.api.IndirectionAPI, which
+    the services without access to the database set as the
+    indirection_api of the objects.
+    """
+
+    def object_class_action(self, context, objname, objmethod, objver,
+                            args, kwargs):
+        """Run a remotable classmethod of an object class."""
+        LOG.debug("object_class_action %s.%s", objname, objmethod)
+        objclass = objects_base.MagnumObject.obj_class_from_name(objname,
+                                                                 objver)
+        return getattr(objclass, objmethod)(context, *args, **kwargs)
+
+    def object_class_actions(self, context, calls):
+        """Run several remotable classmethods within a single call.
+
+        The calls share the DB session and the object cache of the call.
+
+        :param calls: a list of (objname, objmethod, objver, args, kwargs).
+        :returns: the list of the results of the calls.
+        """
+        return [self.object_class_action(context, *call) for call in calls]
+
+    def object_action(self, context, objinst, objmethod, args, kwargs):
+        """Run a remotable method of an object.
+
+        :returns: the fields of the object which the method changed, along
+                  with the fields left to save under 'obj_what_changed',
+                  and the result of the method.
+        """
+        LOG.debug("object_action %s.%s", objinst.obj_name(), objmethod)
+        oldobj = objinst.obj_clone()
+        result = getattr(objinst, objmethod)(context, *args, **kwargs)
+        updates = dict((name, objinst._attr_to_primitive(name))
+                       for name in objinst.obj_diff(oldobj))
+        updates['obj_what_changed'] = list(objinst.obj_what_changed())
+        return updates, result
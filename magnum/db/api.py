@@ -18,6 +18,7 @@ Base classes for storage engines
 """
 
 import abc
+import contextlib
 
 from oslo.config import cfg
 from oslo.db import api as db_api
@@ -34,6 +35,28 @@ def get_instance():
     return IMPL
 
 
+@contextlib.contextmanager
+def request_scope(read_only=False, transaction=True, context=None):
+    """Share one DB session between the queries done within the block.
+
+    See Connection.begin_request(). The transaction, if any, is committed
+    when the block exits normally and rolled back when it raises.
+
+    :param context: the context of the request. The time of the last
+                    write of its client is read from and recorded in it.
+    """
+    IMPL.begin_request(read_only=read_only, transaction=transaction,
+                       last_write=getattr(context, 'last_write', None))
+    commit = False
+    try:
+        yield
+        commit = True
+    finally:
+        last_write = IMPL.end_request(commit=commit)
+        if context is not None and last_write is not None:
+            context.last_write = last_write
+
+
 @six.add_metaclass(abc.ABCMeta)
 class Connection(object):
     """Base class for storage system connections."""
@@ -42,6 +65,74 @@ class Connection(object):
     def __init__(self):
         """Constructor."""
 
+    @abc.abstractmethod
+    def begin_request(self, read_only=False, transaction=True,
+                      last_write=None):
+        """Start sharing one session between the calls of this thread.
+
+        Until end_request() is called, all the queries of the calling
+        thread use the same session, and so the same connection, instead
+        of opening one each. Nested calls join the outer request.
+
+        :param read_only: the request only reads, its transaction is
+                          rolled back rather than committed. Writes
+                          raise ReadOnlyRequestWrite.
+        :param transaction: run the whole request in one transaction.
+                            When False, each write still commits on its
+                            own.
+        :param last_write: the time of the last write of the client of the
+                           request, as returned by end_request(). A
+                           read-only request is only sent to the slave
+                           database once slave_max_lag seconds passed
+                           since, so that clients read their own writes.
+        """
+
+    @abc.abstractmethod
+    def end_request(self, commit=True):
+        """End the request started by begin_request().
+
+        :param commit: whether to commit the transaction of the request.
+                       When False, it is rolled back, even if the request
+                       is nested.
+        :returns: the time of the last write of the request, or the
+                  last_write passed to begin_request() if it did not
+                  write.
+        """
+
+    @abc.abstractmethod
+    def purge_deleted(self, before, batch_size=1000):
+        """Remove the pods and containers deleted before a given time.
+
+        The rows are removed in batches, each in its own transaction, so
+        that no long running transaction holds locks on the tables.
+
+        :param before: a datetime, rows deleted earlier are removed.
+        :param batch_size: maximum number of rows removed per transaction.
+        :returns: a dict of the number of rows removed from each table.
+        """
+
+    @abc.abstractmethod
+    def archive_deleted(self, before=None, batch_size=1000):
+        """Move the deleted pods and containers to the shadow tables.
+
+        The rows are moved in batches, each in its own transaction, so
+        that the live tables stay small without locking them for long.
+
+        :param before: a datetime, only the rows deleted earlier are
+                       moved. All the deleted rows are by default.
+        :param batch_size: maximum number of rows moved per transaction.
+        :returns: a dict of the number of rows moved from each table.
+        """
+
+    @abc.abstractmethod
+    def get_table_stats(self):
+        """Return the number of rows and the size of every table.
+
+        :returns: a list of dicts with the 'table' name, its number of
+                  'rows' and its 'size' in bytes, indexes included, or
+                  None when the database does not report it.
+        """
+
     @abc.abstractmethod
     def get_bay_list(self, columns=None, filters=None, limit=None,
                      marker=None, sort_key=None, sort_dir=None):
@@ -55,7 +146,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of bays to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -105,13 +197,55 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_bay(self, bay_id, values):
+    def update_bay(self, bay_id, values, expected=None):
         """Update properties of a bay.
 
         :param bay_id: The id or uuid of a bay.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A bay.
         :raises: BayAssociated
         :raises: BayNotFound
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_bays(self, values_list):
+        """Create many new bays in one transaction.
+
+        :param values_list: A list of dicts of the values of each bay,
+                            as given to create_bay().
+        :returns: The uuids of the new bays.
+        """
+
+    @abc.abstractmethod
+    def update_bays(self, values_list):
+        """Update properties of many bays in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the bay to update.
+        :returns: The number of bays updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_bays(self, bay_uuids):
+        """Destroy many bays in one transaction.
+
+        :param bay_uuids: The uuids of the bays.
+        :returns: The number of bays destroyed.
+        :raises: BayNotEmpty
+        """
+
+    @abc.abstractmethod
+    def get_bays_versions(self, bay_uuids):
+        """Return the versions of many bays.
+
+        Only the uuid and version columns are read.
+
+        :param bay_uuids: The uuids of the bays.
+        :returns: A dict of the versions by uuid, missing
+                  bays are left out.
         """
 
     @abc.abstractmethod
@@ -127,7 +261,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of baymodels to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -178,12 +313,54 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_baymodel(self, baymodel_id, values):
+    def update_baymodel(self, baymodel_id, values, expected=None):
         """Update properties of a baymodel.
 
         :param baymodel_id: The id or uuid of a baymodel.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A baymodel.
         :raises: BayModelNotFound
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_baymodels(self, values_list):
+        """Create many new baymodels in one transaction.
+
+        :param values_list: A list of dicts of the values of each baymodel,
+                            as given to create_baymodel().
+        :returns: The uuids of the new baymodels.
+        """
+
+    @abc.abstractmethod
+    def update_baymodels(self, values_list):
+        """Update properties of many baymodels in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the baymodel to update.
+        :returns: The number of baymodels updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_baymodels(self, baymodel_uuids):
+        """Destroy many baymodels in one transaction.
+
+        :param baymodel_uuids: The uuids of the baymodels.
+        :returns: The number of baymodels destroyed.
+        :raises: BayModelReferenced
+        """
+
+    @abc.abstractmethod
+    def get_baymodels_versions(self, baymodel_uuids):
+        """Return the versions of many baymodels.
+
+        Only the uuid and version columns are read.
+
+        :param baymodel_uuids: The uuids of the baymodels.
+        :returns: A dict of the versions by uuid, missing
+                  baymodels are left out.
         """
 
     @abc.abstractmethod
@@ -199,7 +376,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of containers to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -251,13 +429,54 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_container(self, container_id, values):
+    def update_container(self, container_id, values, expected=None):
         """Update properties of a container.
 
         :param container_id: The id or uuid of a container.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A container.
         :raises: BayAssociated
         :raises: BayNotFound
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_containers(self, values_list):
+        """Create many new containers in one transaction.
+
+        :param values_list: A list of dicts of the values of each container,
+                            as given to create_container().
+        :returns: The uuids of the new containers.
+        """
+
+    @abc.abstractmethod
+    def update_containers(self, values_list):
+        """Update properties of many containers in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the container to update.
+        :returns: The number of containers updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_containers(self, container_uuids):
+        """Destroy many containers in one transaction.
+
+        :param container_uuids: The uuids of the containers.
+        :returns: The number of containers destroyed.
+        """
+
+    @abc.abstractmethod
+    def get_containers_versions(self, container_uuids):
+        """Return the versions of many containers.
+
+        Only the uuid and version columns are read.
+
+        :param container_uuids: The uuids of the containers.
+        :returns: A dict of the versions by uuid, missing
+                  containers are left out.
         """
 
     @abc.abstractmethod
@@ -273,7 +492,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of nodes to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -323,14 +543,55 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_node(self, node_id, values):
+    def update_node(self, node_id, values, expected=None):
         """Update properties of a node.
 
         :param node_id: The id or uuid of a node.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A node.
         :raises: NodeAssociated
         :raises: NodeNotFound
+        :raises: ConcurrentUpdate
+        """
+    @abc.abstractmethod
+    def create_nodes(self, values_list):
+        """Create many new nodes in one transaction.
+
+        :param values_list: A list of dicts of the values of each node,
+                            as given to create_node().
+        :returns: The uuids of the new nodes.
         """
+
+    @abc.abstractmethod
+    def update_nodes(self, values_list):
+        """Update properties of many nodes in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the node to update.
+        :returns: The number of nodes updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_nodes(self, node_uuids):
+        """Destroy many nodes in one transaction.
+
+        :param node_uuids: The uuids of the nodes.
+        :returns: The number of nodes destroyed.
+        """
+
+    @abc.abstractmethod
+    def get_nodes_versions(self, node_uuids):
+        """Return the versions of many nodes.
+
+        Only the uuid and version columns are read.
+
+        :param node_uuids: The uuids of the nodes.
+        :returns: A dict of the versions by uuid, missing
+                  nodes are left out.
+        """
+
     @abc.abstractmethod
     def get_pod_list(self, columns=None, filters=None, limit=None,
                      marker=None, sort_key=None, sort_dir=None):
@@ -344,7 +605,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of pods to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -410,13 +672,62 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_pod(self, pod_id, values):
+    def update_pod(self, pod_id, values, expected=None):
         """Update properties of a pod.
 
         :param pod_id: The id or uuid of a pod.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A pod.
         :raises: BayAssociated
         :raises: BayNotFound
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_pods(self, values_list):
+        """Create many new pods in one transaction.
+
+        :param values_list: A list of dicts of the values of each pod,
+                            as given to create_pod().
+        :returns: The uuids of the new pods.
+        """
+
+    @abc.abstractmethod
+    def update_pods(self, values_list):
+        """Update properties of many pods in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the pod to update.
+        :returns: The number of pods updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_pods(self, pod_uuids):
+        """Destroy many pods in one transaction.
+
+        :param pod_uuids: The uuids of the pods.
+        :returns: The number of pods destroyed.
+        """
+
+    @abc.abstractmethod
+    def destroy_pods_by_bay(self, bay_uuid):
+        """Destroy all the pods of a bay in one transaction.
+
+        :param bay_uuid: The uuid of a bay.
+        :returns: The number of pods destroyed.
+        """
+
+    @abc.abstractmethod
+    def get_pods_versions(self, pod_uuids):
+        """Return the versions of many pods.
+
+        Only the uuid and version columns are read.
+
+        :param pod_uuids: The uuids of the pods.
+        :returns: A dict of the versions by uuid, missing
+                  pods are left out.
         """
 
     @abc.abstractmethod
@@ -432,7 +743,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of services to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -483,6 +795,17 @@ class Connection(object):
         :returns: A list of services.
         """
 
+    @abc.abstractmethod
+    def get_service_pod_uuids(self, bay_uuid):
+        """Match the selectors of the services of a bay with its pods.
+
+        A pod belongs to a service when its labels include every key=value
+        pair of the selector of the service.
+
+        :param bay_uuid: The uuid of a bay.
+        :returns: A list of (service uuid, pod uuid) tuples.
+        """
+
     @abc.abstractmethod
     def destroy_service(self, service_id):
         """Destroy a service and all associated interfaces.
@@ -491,13 +814,62 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_service(self, service_id, values):
+    def update_service(self, service_id, values, expected=None):
         """Update properties of a service.
 
         :param service_id: The id or uuid of a service.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A service.
         :raises: BayAssociated
         :raises: BayNotFound
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_services(self, values_list):
+        """Create many new services in one transaction.
+
+        :param values_list: A list of dicts of the values of each service,
+                            as given to create_service().
+        :returns: The uuids of the new services.
+        """
+
+    @abc.abstractmethod
+    def update_services(self, values_list):
+        """Update properties of many services in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the service to update.
+        :returns: The number of services updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_services(self, service_uuids):
+        """Destroy many services in one transaction.
+
+        :param service_uuids: The uuids of the services.
+        :returns: The number of services destroyed.
+        """
+
+    @abc.abstractmethod
+    def destroy_services_by_bay(self, bay_uuid):
+        """Destroy all the services of a bay in one transaction.
+
+        :param bay_uuid: The uuid of a bay.
+        :returns: The number of services destroyed.
+        """
+
+    @abc.abstractmethod
+    def get_services_versions(self, service_uuids):
+        """Return the versions of many services.
+
+        Only the uuid and version columns are read.
+
+        :param service_uuids: The uuids of the services.
+        :returns: A dict of the versions by uuid, missing
+                  services are left out.
         """
 
     @abc.abstractmethod
@@ -513,7 +885,8 @@ class Connection(object):
         :param filters: Filters to apply. Defaults to None.
 
         :param limit: Maximum number of pods to return.
-        :param marker: the last item of the previous page; we return the next
+        :param marker: the last item of the previous page, or a dict of its
+                       sort key and id values; we return the next
                        result set.
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
@@ -579,9 +952,59 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def update_rc(self, rc_id, values):
+    def update_rc(self, rc_id, values, expected=None):
         """Update properties of a ReplicationController.
 
         :param rc_id: The id or uuid of a ReplicationController.
+        :param expected: Optional dict of the values the row must still
+                         have for the update to be applied, e.g. the
+                         version read by the caller.
         :returns: A ReplicationController.
+        :raises: ConcurrentUpdate
+        """
+
+    @abc.abstractmethod
+    def create_rcs(self, values_list):
+        """Create many new ReplicationControllers in one transaction.
+
+        :param values_list: A list of dicts of the values of each
+                            ReplicationController, as given to create_rc().
+        :returns: The uuids of the new ReplicationControllers.
+        """
+
+    @abc.abstractmethod
+    def update_rcs(self, values_list):
+        """Update many ReplicationControllers in one transaction.
+
+        :param values_list: A list of dicts of the values to update, each
+                            with the 'uuid' of the ReplicationController to
+                            update.
+        :returns: The number of ReplicationControllers updated.
+        """
+
+    @abc.abstractmethod
+    def destroy_rcs(self, rc_uuids):
+        """Destroy many ReplicationControllers in one transaction.
+
+        :param rc_uuids: The uuids of the ReplicationControllers.
+        :returns: The number of ReplicationControllers destroyed.
+        """
+
+    @abc.abstractmethod
+    def destroy_rcs_by_bay(self, bay_uuid):
+        """Destroy all the ReplicationControllers of a bay in one transaction.
+
+        :param bay_uuid: The uuid of a bay.
+        :returns: The number of ReplicationControllers destroyed.
+        """
+
+    @abc.abstractmethod
+    def get_rcs_versions(self, rc_uuids):
+        """Return the versions of many replication controllers.
+
+        Only the uuid and version columns are read.
+
+        :param rc_uuids: The uuids of the replication controllers.
+        :returns: A dict of the versions by uuid, missing
+                  replication controllers are left out.
         """
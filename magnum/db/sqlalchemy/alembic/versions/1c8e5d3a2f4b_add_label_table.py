@@ -0,0 +1,77 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add label table for pod and service labels and selectors
+
+Revision ID: 1c8e5d3a2f4b
+Revises: 456126c6c9e9
+Create Date: 2015-02-06 10:21:43.118264
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '1c8e5d3a2f4b'
+down_revision = '456126c6c9e9'
+
+import json
+
+from alembic import op
+import six
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        'label',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resource_uuid', sa.String(length=36), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resource_uuid', 'kind', 'key',
+                            name='uniq_label0resource_uuid0kind0key'),
+        mysql_ENGINE='InnoDB',
+        mysql_DEFAULT_CHARSET='UTF8'
+    )
+    op.create_index('label_kind_key_value_idx', 'label',
+                    ['kind', 'key', 'value'])
+
+    # Fill the table from the JSON columns of the existing rows.
+    conn = op.get_bind()
+    label = sa.sql.table('label', sa.sql.column('resource_uuid'),
+                         sa.sql.column('kind'), sa.sql.column('key'),
+                         sa.sql.column('value'))
+    pod = sa.sql.table('pod', sa.sql.column('uuid'),
+                       sa.sql.column('labels'))
+    service = sa.sql.table('service', sa.sql.column('uuid'),
+                           sa.sql.column('labels'),
+                           sa.sql.column('selector'))
+    sources = [(pod, 'labels', 'label'),
+               (service, 'labels', 'label'),
+               (service, 'selector', 'selector')]
+    for table, column, kind in sources:
+        rows = []
+        for uuid, value in conn.execute(sa.select([table.c.uuid,
+                                                   table.c[column]])):
+            for key, val in (json.loads(value) if value else {}).items():
+                rows.append({'resource_uuid': uuid, 'kind': kind,
+                             'key': key, 'value': six.text_type(val)})
+        if rows:
+            op.bulk_insert(label, rows)
+
+
+def downgrade():
+    op.drop_table('label')
@@ -0,0 +1,47 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add project_id and user_id to the resources
+
+Revision ID: 2d1354bbf76e
+Revises: 1c8e5d3a2f4b
+Create Date: 2015-02-16 10:21:37.215402
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '2d1354bbf76e'
+down_revision = '1c8e5d3a2f4b'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+TABLES = ['bay', 'baymodel', 'container', 'node', 'pod', 'service',
+          'replicationcontroller']
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('project_id', sa.String(255),
+                                       nullable=True))
+        op.add_column(table, sa.Column('user_id', sa.String(255),
+                                       nullable=True))
+        op.create_index('%s_project_id_idx' % table, table, ['project_id'])
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index('%s_project_id_idx' % table, table_name=table)
+        op.drop_column(table, 'user_id')
+        op.drop_column(table, 'project_id')
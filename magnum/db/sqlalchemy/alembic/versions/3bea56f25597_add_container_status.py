@@ -0,0 +1,36 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add status to container
+
+Revision ID: 3bea56f25597
+Revises: 2581ebaf0cb2
+Create Date: 2015-02-02 10:31:24.156824
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3bea56f25597'
+down_revision = '2581ebaf0cb2'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('container',
+                  sa.Column('status', sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    op.drop_column('container', 'status')
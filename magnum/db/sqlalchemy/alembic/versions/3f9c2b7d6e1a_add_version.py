@@ -0,0 +1,42 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add version to the resource tables
+
+Revision ID: 3f9c2b7d6e1a
+Revises: 5a3e7f0c1b2d
+Create Date: 2015-02-24 10:17:31.402915
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2b7d6e1a'
+down_revision = '5a3e7f0c1b2d'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+TABLES = ['bay', 'baymodel', 'container', 'node', 'pod', 'service',
+          'replicationcontroller', 'shadow_container', 'shadow_pod']
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(),
+                                       nullable=False, server_default='0'))
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_column(table, 'version')
@@ -0,0 +1,48 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add indexes for bay_uuid and baymodel_id lookups
+
+Revision ID: 456126c6c9e9
+Revises: 3bea56f25597
+Create Date: 2015-02-04 14:52:09.623816
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '456126c6c9e9'
+down_revision = '3bea56f25597'
+
+from alembic import op
+
+
+# NOTE: a filter on bay_uuid alone is served by the leading column of the
+# (bay_uuid, name) indexes, so no separate single column index is created.
+INDEXES = [
+    ('bay_baymodel_id_idx', 'bay', ['baymodel_id']),
+    ('pod_bay_uuid_name_idx', 'pod', ['bay_uuid', 'name']),
+    ('pod_bay_uuid_status_idx', 'pod', ['bay_uuid', 'status']),
+    ('service_bay_uuid_name_idx', 'service', ['bay_uuid', 'name']),
+    ('replicationcontroller_bay_uuid_name_idx', 'replicationcontroller',
+     ['bay_uuid', 'name']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in INDEXES:
+        op.drop_index(name, table_name=table)
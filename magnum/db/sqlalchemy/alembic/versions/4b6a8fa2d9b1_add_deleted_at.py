@@ -0,0 +1,43 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add deleted_at to pod and container
+
+Revision ID: 4b6a8fa2d9b1
+Revises: 2d1354bbf76e
+Create Date: 2015-02-18 16:05:12.804417
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '4b6a8fa2d9b1'
+down_revision = '2d1354bbf76e'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+TABLES = ['pod', 'container']
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('deleted_at', sa.DateTime(),
+                                       nullable=True))
+        op.create_index('%s_deleted_at_idx' % table, table, ['deleted_at'])
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index('%s_deleted_at_idx' % table, table_name=table)
+        op.drop_column(table, 'deleted_at')
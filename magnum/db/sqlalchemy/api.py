@@ -16,11 +16,18 @@
 
 """SQLAlchemy storage backend."""
 
+import datetime
+import threading
+import time
+
 from oslo.config import cfg
 from oslo.db import exception as db_exc
 from oslo.db.sqlalchemy import session as db_session
 from oslo.db.sqlalchemy import utils as db_utils
 from oslo.utils import timeutils
+import six
+import sqlalchemy as sa
+from sqlalchemy import orm
 from sqlalchemy.orm.exc import NoResultFound
 
 from magnum.common import exception
@@ -37,6 +44,14 @@ LOG = log.getLogger(__name__)
 
 _FACADE = None
 
+# Session shared by the queries of the request being processed, see
+# Connection.begin_request().
+_REQUEST = threading.local()
+
+# Kinds of the rows of the label table.
+LABEL = 'label'
+SELECTOR = 'selector'
+
 
 def _create_facade_lazily():
     global _FACADE
@@ -50,11 +65,38 @@ def get_engine():
     return facade.get_engine()
 
 
-def get_session(**kwargs):
+def get_session(use_slave=False, **kwargs):
+    """Return the session to run queries with.
+
+    :param use_slave: the caller only reads. Only then may the session of
+                      a read-only request, which can be connected to the
+                      slave database, be returned.
+    :raises: ReadOnlyRequestWrite if the caller writes within a read-only
+             request.
+    """
+    session = getattr(_REQUEST, 'session', None)
+    if session is not None and not use_slave:
+        if session.info.get('read_only'):
+            raise exception.ReadOnlyRequestWrite()
+        _REQUEST.last_write = time.time()
+    if session is not None and (use_slave or
+                                not session.info.get('use_slave')):
+        return session
     facade = _create_facade_lazily()
     return facade.get_session(**kwargs)
 
 
+def _slave_readable(last_write):
+    """Whether a read-only request may be sent to the slave database.
+
+    :param last_write: the time of the last write of the client, if any.
+    """
+    if not CONF.database.slave_connection:
+        return False
+    return (last_write is None or
+            time.time() - last_write >= CONF.database.slave_max_lag)
+
+
 def get_backend():
     """The backend is this module itself."""
     return Connection()
@@ -64,13 +106,32 @@ def model_query(model, *args, **kwargs):
     """Query helper for simpler session usage.
 
     :param session: if present, the session to use
+    :param base_model: the model queried, when columns are given instead
+    :param read_deleted: if True, the soft deleted rows are also returned
     """
 
-    session = kwargs.get('session') or get_session()
+    session = kwargs.get('session') or get_session(use_slave=True)
     query = session.query(model, *args)
+    base_model = kwargs.get('base_model', model)
+    if _soft_deletes(base_model) and not kwargs.get('read_deleted'):
+        query = query.filter(base_model.deleted_at == None)  # noqa
     return query
 
 
+def _soft_deletes(model):
+    """Whether the rows of a model are only marked as deleted."""
+    return (isinstance(model, type) and
+            issubclass(model, models.SoftDeleteMixin))
+
+
+def _delete(query, model):
+    """Delete the rows matching a query, or mark them as deleted."""
+    if _soft_deletes(model):
+        return query.update({'deleted_at': timeutils.utcnow()},
+                            synchronize_session=False)
+    return query.delete(synchronize_session=False)
+
+
 def add_identity_filter(query, value):
     """Adds an identity filter to a query.
 
@@ -89,6 +150,324 @@ def add_identity_filter(query, value):
         raise exception.InvalidIdentity(identity=value)
 
 
+def _escape_like(value):
+    return (value.replace('\\', '\\\\').replace('%', '\\%')
+            .replace('_', '\\_'))
+
+
+def add_name_prefix_filter(query, model, prefix):
+    """Adds a filter on the leading characters of the name of a resource.
+
+    The LIKE pattern is anchored at the start, so the name indexes can be
+    used for it.
+    """
+    return query.filter(model.name.like(_escape_like(prefix) + '%',
+                                        escape='\\'))
+
+
+def add_labels_filter(query, model, labels):
+    """Adds a label selector filter to a query.
+
+    Only resources which have every key=value pair of ``labels`` match.
+    Each pair is joined on the (kind, key, value) index of the label
+    table, rather than matched with an IN subquery, which older MySQL
+    versions run again for every row of the resource table. A resource has
+    at most one label of a key, so the joins do not repeat its row. The
+    joins are added last, as filter_by() applies to the last joined model.
+
+    :param query: Initial query to add filter to.
+    :param model: Pod or Service model.
+    :param labels: dict of the labels to match.
+    :return: Modified query.
+    """
+    for key, value in sorted(labels.items()):
+        label = orm.aliased(models.Label)
+        query = query.join(label, sa.and_(
+            label.resource_uuid == model.uuid, label.kind == LABEL,
+            label.key == key, label.value == six.text_type(value)))
+    return query
+
+
+def _set_labels(session, resource_uuid, kind, labels):
+    """Replace the label table rows of a resource by the given dict."""
+    _set_labels_bulk(session, kind, {resource_uuid: labels})
+
+
+def _set_labels_bulk(session, kind, labels_by_uuid):
+    """Replace the label table rows of several resources at once.
+
+    :param labels_by_uuid: dict of the new labels dict of each resource.
+    """
+    label = models.Label
+    for uuids in _chunks(list(labels_by_uuid)):
+        query = model_query(label, session=session)
+        query.filter(label.kind == kind, label.resource_uuid.in_(uuids)
+                     ).delete(synchronize_session=False)
+    rows = [{'resource_uuid': resource_uuid, 'kind': kind, 'key': key,
+             'value': six.text_type(value)}
+            for resource_uuid, labels in labels_by_uuid.items()
+            for key, value in (labels or {}).items()]
+    if rows:
+        session.execute(label.__table__.insert(), rows)
+
+
+def _delete_labels(session, model, resource_id):
+    """Delete the label table rows of the identified pod or service."""
+    uuids = add_identity_filter(model_query(model.uuid, session=session),
+                                resource_id).subquery()
+    query = model_query(models.Label, session=session)
+    query.filter(models.Label.resource_uuid.in_(uuids)).delete(
+        synchronize_session=False)
+
+
+def _update_row(model, resource_id, values, not_found, expected=None,
+                conditions=None, check=None, session=None):
+    """Update a row with a single UPDATE ... WHERE statement.
+
+    The row is not locked: the values it must still have are part of the
+    WHERE clause, so the update is a compare-and-swap which never waits
+    for concurrent writers.
+
+    :param expected: A dict of the values the row must still have, e.g.
+                     the version read by the caller.
+    :param conditions: A list of other SQL conditions of the update.
+    :param check: Called with the row when the update did not match, to
+                  raise a more specific error than ConcurrentUpdate.
+    :raises: not_found if there is no row with the given id or uuid.
+    :raises: ConcurrentUpdate if the row no longer has the expected
+             values.
+    :returns: The updated row.
+    """
+    table = model.__table__
+    columns = dict((table.c[k], v) for k, v in values.items()
+                   if k in table.c)
+    session = session or get_session()
+    with session.begin(subtransactions=True):
+        query = model_query(model, session=session)
+        query = add_identity_filter(query, resource_id)
+        update_query = query.filter(*(conditions or []))
+        for key, value in (expected or {}).items():
+            if isinstance(value, datetime.datetime):
+                value = timeutils.normalize_time(value)
+            update_query = update_query.filter(table.c[key] == value)
+
+        count = 0
+        if columns:
+            if 'version' in table.c and table.c.version not in columns:
+                columns[table.c.version] = table.c.version + 1
+            count = update_query.update(columns, synchronize_session=False)
+
+        # The session of the request may hold the row as read before.
+        ref = query.populate_existing().first()
+        if ref is None:
+            raise not_found
+        if columns and not count:
+            if check is not None:
+                check(ref)
+            raise exception.ConcurrentUpdate(resource=table.name,
+                                             id=resource_id)
+    return ref
+
+
+def _bay_empty_conditions():
+    """Return the conditions of a bay query matching bays with no children.
+
+    Each is a NOT EXISTS subquery correlated to the bay, which is folded
+    into the statement and costs one lookup of the bay_uuid index of the
+    child table rather than counting its rows.
+    """
+    conditions = []
+    for model in (models.Pod, models.Service, models.ReplicationController):
+        children = sa.exists().where(model.bay_uuid == models.Bay.uuid)
+        if _soft_deletes(model):
+            children = children.where(model.deleted_at == None)  # noqa
+        conditions.append(~children)
+    return conditions
+
+
+# Columns of the models which are mirrored in the label table.
+_LABEL_COLUMNS = {
+    models.Pod: [('labels', LABEL)],
+    models.Service: [('labels', LABEL), ('selector', SELECTOR)],
+}
+
+# Maximum number of values in the IN clause of a bulk statement.
+_BULK_CHUNK_SIZE = 500
+
+
+def _chunks(values):
+    for i in range(0, len(values), _BULK_CHUNK_SIZE):
+        yield values[i:i + _BULK_CHUNK_SIZE]
+
+
+def _bulk_rows(model, values_list):
+    """Group the column values of many rows by the set of columns given.
+
+    An executemany() statement binds the same columns for every row, so
+    each group is written with its own statement.
+    """
+    table = model.__table__
+    groups = {}
+    for values in values_list:
+        row = dict((k, v) for k, v in values.items() if k in table.c)
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups
+
+
+def _bulk_create(model, values_list, already_exists):
+    """Insert many rows with multi-row INSERTs in one transaction.
+
+    :returns: the uuids of the rows, in the order of values_list.
+    """
+    values_list = [dict(values) for values in values_list]
+    for values in values_list:
+        if not values.get('uuid'):
+            values['uuid'] = utils.generate_uuid()
+        for column in model.__table__.c:
+            if isinstance(column.type, models.JSONText):
+                # Let the JSON columns store their empty value, as
+                # create_*() does.
+                values.setdefault(column.name, None)
+            elif (column.default is not None and
+                  values.get(column.name, 0) is None):
+                # created_at and the like.
+                del values[column.name]
+
+    session = get_session()
+    uuids = [values['uuid'] for values in values_list]
+    try:
+        with session.begin(subtransactions=True):
+            for rows in _bulk_rows(model, values_list).values():
+                session.execute(model.__table__.insert(), rows)
+            for column, kind in _LABEL_COLUMNS.get(model, []):
+                _set_labels_bulk(session, kind, dict(
+                    (values['uuid'], values[column])
+                    for values in values_list))
+    except db_exc.DBDuplicateEntry:
+        raise already_exists(uuid=', '.join(uuids))
+    return uuids
+
+
+def _bulk_update(model, values_list):
+    """Update many rows, identified by their uuid, in one transaction.
+
+    Rows setting the same columns are updated by one executemany()
+    statement.
+
+    :returns: the number of rows updated.
+    """
+    table = model.__table__
+    for values in values_list:
+        if not values.get('uuid'):
+            msg = _("The uuid of each %s to update is required.")
+            raise exception.InvalidParameterValue(err=msg % table.name)
+
+    count = 0
+    session = get_session()
+    with session.begin(subtransactions=True):
+        for columns, rows in _bulk_rows(model, values_list).items():
+            columns = [c for c in columns if c not in ('id', 'uuid')]
+            if not columns:
+                continue
+            stmt = table.update().where(
+                table.c.uuid == sa.bindparam('_uuid'))
+            if _soft_deletes(model):
+                stmt = stmt.where(table.c.deleted_at == None)  # noqa
+            assignments = dict(
+                (c, sa.bindparam('_' + c, type_=table.c[c].type))
+                for c in columns)
+            if 'version' in table.c and 'version' not in assignments:
+                assignments['version'] = table.c.version + 1
+            stmt = stmt.values(assignments)
+            params = [dict([('_uuid', row['uuid'])] +
+                           [('_' + c, row[c]) for c in columns])
+                      for row in rows]
+            count += session.execute(stmt, params).rowcount
+        for column, kind in _LABEL_COLUMNS.get(model, []):
+            labels_by_uuid = dict((values['uuid'], values[column])
+                                  for values in values_list
+                                  if column in values)
+            if labels_by_uuid:
+                _set_labels_bulk(session, kind, labels_by_uuid)
+    return count
+
+
+def _bulk_destroy(model, uuids, conditions=None, session=None):
+    """Delete many rows, by uuid or matching conditions, in one transaction.
+
+    :param uuids: The uuids of the rows, or None for all the rows matching
+                  the conditions.
+    :param conditions: A list of other SQL conditions the deleted rows
+                       must match, which are part of the DELETE.
+    :param session: The session of the transaction of the caller, if any.
+    :returns: the number of rows deleted.
+    """
+    conditions = conditions or []
+    count = 0
+    session = session or get_session()
+    with session.begin(subtransactions=True):
+        if uuids is None:
+            # The rows are matched directly rather than by a subquery on
+            # their own table, which MySQL rejects in a DELETE or UPDATE.
+            chunks = [sa.and_(*conditions)]
+        else:
+            chunks = [sa.and_(model.uuid.in_(chunk), *conditions)
+                      for chunk in _chunks(uuids)]
+        for condition in chunks:
+            if model in _LABEL_COLUMNS:
+                resource_uuids = sa.select([model.uuid]).where(condition)
+                label_query = model_query(models.Label, session=session)
+                label_query.filter(models.Label.resource_uuid.in_(
+                    resource_uuids)).delete(synchronize_session=False)
+            count += _delete(model_query(model, session=session).filter(
+                condition), model)
+    return count
+
+
+def _first_of_uuids(model, uuids, session):
+    """Return the first of many rows, by uuid, which exists if any."""
+    for chunk in _chunks(list(uuids)):
+        query = model_query(model.uuid, session=session, base_model=model)
+        ref = query.filter(model.uuid.in_(chunk)).first()
+        if ref is not None:
+            return ref
+    return None
+
+
+def _bulk_destroy_by_bay(model, bay_uuid):
+    """Delete all the rows of a model which belong to a bay."""
+    return _bulk_destroy(model, None, conditions=[model.bay_uuid == bay_uuid])
+
+
+def _get_versions(model, uuids):
+    """Return the versions of many rows, by uuid.
+
+    Only these two columns are read, so that callers can tell which rows
+    changed before loading them whole. Missing rows are left out.
+    """
+    versions = {}
+    for chunk in _chunks(list(uuids)):
+        query = model_query(model.uuid, model.version, base_model=model)
+        for uuid, version in query.filter(model.uuid.in_(chunk)):
+            versions[uuid] = version
+    return versions
+
+
+def _table_size(session, name):
+    """Return the size in bytes of a table and its indexes, if known."""
+    dialect = session.bind.dialect.name
+    if dialect == 'mysql':
+        query = sa.text("SELECT data_length + index_length "
+                        "FROM information_schema.tables "
+                        "WHERE table_schema = DATABASE() "
+                        "AND table_name = :name")
+    elif dialect == 'postgresql':
+        query = sa.text("SELECT pg_total_relation_size(:name)")
+    else:
+        return None
+    return session.execute(query, {'name': name}).scalar()
+
+
 def _paginate_query(model, limit=None, marker=None, sort_key=None,
                     sort_dir=None, query=None):
     if not query:
@@ -96,6 +475,13 @@ def _paginate_query(model, limit=None, marker=None, sort_key=None,
     sort_keys = ['id']
     if sort_key and sort_key not in sort_keys:
         sort_keys.insert(0, sort_key)
+    if isinstance(marker, dict):
+        # NOTE: a keyset marker only carries the sort key values of the last
+        # row of the previous page, which is all paginate_query() reads.
+        marker_ref = model()
+        for key, value in marker.items():
+            setattr(marker_ref, key, value)
+        marker = marker_ref
     query = db_utils.paginate_query(query, model, limit, sort_keys,
                                     marker=marker, sort_dir=sort_dir)
     return query.all()
@@ -107,14 +493,117 @@ class Connection(api.Connection):
     def __init__(self):
         pass
 
+    def begin_request(self, read_only=False, transaction=True,
+                      last_write=None):
+        if getattr(_REQUEST, 'session', None) is not None:
+            _REQUEST.depth += 1
+            return
+
+        use_slave = read_only and _slave_readable(last_write)
+        session = _create_facade_lazily().get_session(use_slave=use_slave)
+        session.info['read_only'] = read_only
+        session.info['use_slave'] = use_slave
+        if transaction:
+            session.begin()
+        _REQUEST.session = session
+        _REQUEST.depth = 1
+        _REQUEST.last_write = last_write
+
+    def end_request(self, commit=True):
+        session = getattr(_REQUEST, 'session', None)
+        if session is None:
+            return None
+        _REQUEST.depth -= 1
+        if _REQUEST.depth > 0 and commit:
+            return _REQUEST.last_write
+
+        _REQUEST.session = None
+        try:
+            if session.transaction is not None:
+                if commit and not session.info['read_only']:
+                    session.commit()
+                else:
+                    session.rollback()
+        finally:
+            session.close()
+        return _REQUEST.last_write
+
+    def purge_deleted(self, before, batch_size=1000):
+        counts = {}
+        for model in (models.Pod, models.Container):
+            counts[model.__tablename__] = 0
+            while True:
+                # Each batch is deleted in its own short transaction.
+                session = get_session()
+                with session.begin(subtransactions=True):
+                    query = model_query(model.id, session=session)
+                    query = query.filter(model.deleted_at < before)
+                    ids = [row.id for row in
+                           query.order_by(model.id).limit(batch_size)]
+                    if ids:
+                        query = model_query(model, session=session,
+                                            read_deleted=True)
+                        query.filter(model.id.in_(ids)).delete(
+                            synchronize_session=False)
+                counts[model.__tablename__] += len(ids)
+                if len(ids) < batch_size:
+                    break
+        return counts
+
+    def archive_deleted(self, before=None, batch_size=1000):
+        counts = {}
+        for model, shadow in models.SHADOW_TABLES.items():
+            table = model.__table__
+            columns = [c.name for c in shadow.c]
+            counts[table.name] = 0
+            while True:
+                # Each batch is moved in its own short transaction.
+                session = get_session()
+                with session.begin(subtransactions=True):
+                    query = model_query(model.id, session=session)
+                    query = query.filter(model.deleted_at != None)  # noqa
+                    if before is not None:
+                        query = query.filter(model.deleted_at < before)
+                    ids = [row.id for row in
+                           query.order_by(model.id).limit(batch_size)]
+                    if ids:
+                        rows = sa.select([table.c[c] for c in columns])
+                        rows = rows.where(table.c.id.in_(ids))
+                        session.execute(shadow.insert().from_select(
+                            columns, rows))
+                        session.execute(table.delete().where(
+                            table.c.id.in_(ids)))
+                counts[table.name] += len(ids)
+                if len(ids) < batch_size:
+                    break
+        return counts
+
+    def get_table_stats(self):
+        session = get_session()
+        stats = []
+        for table in models.Base.metadata.sorted_tables:
+            rows = session.query(sa.func.count()).select_from(table).scalar()
+            stats.append({'table': table.name, 'rows': rows,
+                          'size': _table_size(session, table.name)})
+        return stats
+
     def _add_bays_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.Bay.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'baymodel_id' in filters:
             query = query.filter_by(baymodel_id=filters['baymodel_id'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.Bay,
+                                           filters['name_prefix'])
         if 'node_count' in filters:
             query = query.filter_by(node_count=filters['node_count'])
         if 'stack_id' in filters:
@@ -133,7 +622,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.Bay.id]
         else:
-            columns = [getattr(models.Bay, c) for c in columns]
+            columns = [models.Bay.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.Bay)
         query = self._add_bays_filters(query, filters)
@@ -180,77 +669,79 @@ class Connection(api.Connection):
             raise exception.BayNotFound(bay=bay_uuid)
 
     def destroy_bay(self, bay_id):
-        def bay_not_empty(session, bay_uuid):
-            """Checks whether the bay does not have pods or services."""
-            query = model_query(models.Pod, session=session)
-            query = self._add_pods_filters(query, {'bay_uuid': bay_uuid})
-            if query.count() != 0:
-                return True
-            else:
-                query = model_query(models.Service, session=session)
-                query = self._add_services_filters(query, {
-                            'bay_uuid': bay_uuid})
-                return query.count() != 0
-
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
             query = model_query(models.Bay, session=session)
             query = add_identity_filter(query, bay_id)
 
-            try:
-                bay_ref = query.one()
-            except NoResultFound:
-                raise exception.BayNotFound(bay=bay_id)
-
             # TODO(hongbin): delete pods and services that attached to the bay.
             #     We don't do it now because it could cause a long deletion
             #     time which would block the conductor. It needs either threads
             #     or coroutines.
-            if bay_not_empty(session, bay_ref['uuid']):
+            count = query.filter(*_bay_empty_conditions()).delete(
+                synchronize_session=False)
+            if count == 0:
+                if not session.query(query.exists()).scalar():
+                    raise exception.BayNotFound(bay=bay_id)
                 raise exception.BayNotEmpty(bay=bay_id)
 
-            query.delete()
-
-    def update_bay(self, bay_id, values):
+    def update_bay(self, bay_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Bay.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_bay(bay_id, values)
+            return self._do_update_bay(bay_id, values, expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 bay=bay_id)
 
-    def _do_update_bay(self, bay_id, values):
-        session = get_session()
-        with session.begin():
-            query = model_query(models.Bay, session=session)
-            query = add_identity_filter(query, bay_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.BayNotFound(bay=bay_id)
+    def _do_update_bay(self, bay_id, values, expected=None):
+        return _update_row(models.Bay, bay_id, values,
+                           exception.BayNotFound(bay=bay_id),
+                           expected=expected)
 
-            # Prevent instance_uuid overwriting
-            if values.get("instance_uuid") and ref.instance_uuid:
-                raise exception.BayAssociated(bay=bay_id,
-                                instance=ref.instance_uuid)
+    def create_bays(self, values_list):
+        return _bulk_create(models.Bay, values_list,
+                            exception.BayAlreadyExists)
 
-            if 'provision_state' in values:
-                values['provision_updated_at'] = timeutils.utcnow()
+    def update_bays(self, values_list):
+        return _bulk_update(models.Bay, values_list)
 
-            ref.update(values)
-        return ref
+    def destroy_bays(self, bay_uuids):
+        session = get_session()
+        with session.begin(subtransactions=True):
+            # As in destroy_bay(), the check that the bays are empty is
+            # part of the DELETE. Any bay left has children, and the
+            # transaction is then rolled back.
+            count = _bulk_destroy(models.Bay, bay_uuids,
+                                  conditions=_bay_empty_conditions(),
+                                  session=session)
+            ref = _first_of_uuids(models.Bay, bay_uuids, session)
+            if ref is not None:
+                raise exception.BayNotEmpty(bay=ref.uuid)
+        return count
+
+    def get_bays_versions(self, bay_uuids):
+        return _get_versions(models.Bay, bay_uuids)
 
     def _add_baymodels_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.BayModel.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.BayModel,
+                                           filters['name_prefix'])
         if 'image_id' in filters:
             query = query.filter_by(image_id=filters['image_id'])
         if 'flavor_id' in filters:
@@ -272,7 +763,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.BayModel.id]
         else:
-            columns = [getattr(models.BayModel, c) for c in columns]
+            columns = [models.BayModel.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.BayModel)
         query = self._add_baymodels_filters(query, filters)
@@ -318,62 +809,83 @@ class Connection(api.Connection):
             raise exception.BayModelNotFound(baymodel=baymodel_uuid)
 
     def destroy_baymodel(self, baymodel_id):
-        def is_baymodel_referenced(session, baymodel_uuid):
-            """Checks whether the baymodel is referenced by bay(s)."""
-            query = model_query(models.Bay, session=session)
-            query = self._add_bays_filters(query,
-                                           {'baymodel_id': baymodel_uuid})
-            return query.count() != 0
-
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
             query = model_query(models.BayModel, session=session)
             query = add_identity_filter(query, baymodel_id)
 
-            try:
-                baymodel_ref = query.one()
-            except NoResultFound:
-                raise exception.BayModelNotFound(baymodel=baymodel_id)
-
-            if is_baymodel_referenced(session, baymodel_ref['uuid']):
+            # The baymodel is only deleted if no bay refers to it.
+            count = query.filter(~sa.exists().where(
+                models.Bay.baymodel_id == models.BayModel.uuid)).delete(
+                    synchronize_session=False)
+            if count == 0:
+                if not session.query(query.exists()).scalar():
+                    raise exception.BayModelNotFound(baymodel=baymodel_id)
                 raise exception.BayModelReferenced(baymodel=baymodel_id)
 
-            query.delete()
-
-    def update_baymodel(self, baymodel_id, values):
+    def update_baymodel(self, baymodel_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing BayModel.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_baymodel(baymodel_id, values)
+            return self._do_update_baymodel(baymodel_id, values,
+                                            expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 baymodel=baymodel_id)
 
-    def _do_update_baymodel(self, baymodel_id, values):
-        session = get_session()
-        with session.begin():
-            query = model_query(models.BayModel, session=session)
-            query = add_identity_filter(query, baymodel_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.BayModelNotFound(baymodel=baymodel_id)
+    def _do_update_baymodel(self, baymodel_id, values, expected=None):
+        return _update_row(models.BayModel, baymodel_id, values,
+                           exception.BayModelNotFound(baymodel=baymodel_id),
+                           expected=expected)
 
-            ref.update(values)
-        return ref
+    def create_baymodels(self, values_list):
+        return _bulk_create(models.BayModel, values_list,
+                            exception.BayModelAlreadyExists)
+
+    def update_baymodels(self, values_list):
+        return _bulk_update(models.BayModel, values_list)
+
+    def destroy_baymodels(self, baymodel_uuids):
+        session = get_session()
+        with session.begin(subtransactions=True):
+            # As in destroy_baymodel(), only the baymodels which no bay
+            # refers to are deleted, any baymodel left rolls back all.
+            count = _bulk_destroy(models.BayModel, baymodel_uuids,
+                                  conditions=[~sa.exists().where(
+                                      models.Bay.baymodel_id ==
+                                      models.BayModel.uuid)],
+                                  session=session)
+            ref = _first_of_uuids(models.BayModel, baymodel_uuids, session)
+            if ref is not None:
+                raise exception.BayModelReferenced(baymodel=ref.uuid)
+        return count
+
+    def get_baymodels_versions(self, baymodel_uuids):
+        return _get_versions(models.BayModel, baymodel_uuids)
 
     def _add_containers_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.Container.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.Container,
+                                           filters['name_prefix'])
         if 'image_id' in filters:
             query = query.filter_by(image_id=filters['image_id'])
+        if 'status' in filters:
+            query = query.filter_by(status=filters['status'])
 
         return query
 
@@ -384,7 +896,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.Container.id]
         else:
-            columns = [getattr(models.Container, c) for c in columns]
+            columns = [models.Container.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.Container)
         query = self._add_containers_filters(query, filters)
@@ -431,51 +943,55 @@ class Connection(api.Connection):
 
     def destroy_container(self, container_id):
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
             query = model_query(models.Container, session=session)
             query = add_identity_filter(query, container_id)
-            count = query.delete()
+            count = _delete(query, models.Container)
             if count != 1:
                 raise exception.ContainerNotFound(container_id)
 
-    def update_container(self, container_id, values):
+    def update_container(self, container_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Container.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_container(container_id, values)
+            return self._do_update_container(container_id, values,
+                                             expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 container=container_id)
 
-    def _do_update_container(self, container_id, values):
-        session = get_session()
-        with session.begin():
-            query = model_query(models.Container, session=session)
-            query = add_identity_filter(query, container_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.ContainerNotFound(container=container_id)
+    def _do_update_container(self, container_id, values, expected=None):
+        return _update_row(models.Container, container_id, values,
+                           exception.ContainerNotFound(container=container_id),
+                           expected=expected)
 
-            # Prevent instance_uuid overwriting
-            if values.get("instance_uuid") and ref.instance_uuid:
-                raise exception.ContainerAssociated(container=container_id,
-                                instance=ref.instance_uuid)
+    def create_containers(self, values_list):
+        return _bulk_create(models.Container, values_list,
+                            exception.ContainerAlreadyExists)
 
-            if 'provision_state' in values:
-                values['provision_updated_at'] = timeutils.utcnow()
+    def update_containers(self, values_list):
+        return _bulk_update(models.Container, values_list)
 
-            ref.update(values)
-        return ref
+    def destroy_containers(self, container_uuids):
+        return _bulk_destroy(models.Container, container_uuids)
+
+    def get_containers_versions(self, container_uuids):
+        return _get_versions(models.Container, container_uuids)
 
     def _add_nodes_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.Node.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'associated' in filters:
             if filters['associated']:
                 query = query.filter(models.Node.ironic_node_id != None)
@@ -495,7 +1011,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.Node.id]
         else:
-            columns = [getattr(models.Node, c) for c in columns]
+            columns = [models.Node.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.Node)
         query = self._add_nodes_filters(query, filters)
@@ -542,54 +1058,77 @@ class Connection(api.Connection):
 
     def destroy_node(self, node_id):
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
             query = model_query(models.Node, session=session)
             query = add_identity_filter(query, node_id)
             count = query.delete()
             if count != 1:
                 raise exception.NodeNotFound(node_id)
 
-    def update_node(self, node_id, values):
+    def update_node(self, node_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Node.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_node(node_id, values)
+            return self._do_update_node(node_id, values, expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['ironic_node_id'],
                 node=node_id)
 
-    def _do_update_node(self, node_id, values):
-        session = get_session()
-        with session.begin():
-            query = model_query(models.Node, session=session)
-            query = add_identity_filter(query, node_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.NodeNotFound(node=node_id)
-
+    def _do_update_node(self, node_id, values, expected=None):
+        conditions = []
+        if values.get("ironic_node_id"):
             # Prevent ironic_node_id overwriting
+            conditions.append(models.Node.ironic_node_id == None)  # noqa
+
+        def check(ref):
             if values.get("ironic_node_id") and ref.ironic_node_id:
                 raise exception.NodeAssociated(node=node_id,
                                 instance=ref.ironic_node_id)
 
-            ref.update(values)
-        return ref
+        return _update_row(models.Node, node_id, values,
+                           exception.NodeNotFound(node=node_id),
+                           expected=expected, conditions=conditions,
+                           check=check)
+
+    def create_nodes(self, values_list):
+        return _bulk_create(models.Node, values_list,
+                            exception.NodeAlreadyExists)
+
+    def update_nodes(self, values_list):
+        return _bulk_update(models.Node, values_list)
+
+    def destroy_nodes(self, node_uuids):
+        return _bulk_destroy(models.Node, node_uuids)
+
+    def get_nodes_versions(self, node_uuids):
+        return _get_versions(models.Node, node_uuids)
 
     def _add_pods_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.Pod.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'bay_uuid' in filters:
             query = query.filter_by(bay_uuid=filters['bay_uuid'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.Pod,
+                                           filters['name_prefix'])
         if 'status' in filters:
             query = query.filter_by(status=filters['status'])
+        if 'labels' in filters:
+            query = add_labels_filter(query, models.Pod,
+                                      filters['labels'])
 
         return query
 
@@ -600,7 +1139,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.Pod.id]
         else:
-            columns = [getattr(models.Pod, c) for c in columns]
+            columns = [models.Pod.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.Pod)
         query = self._add_pods_filters(query, filters)
@@ -621,8 +1160,11 @@ class Connection(api.Connection):
 
         pod = models.Pod()
         pod.update(values)
+        session = get_session()
         try:
-            pod.save()
+            with session.begin(subtransactions=True):
+                pod.save(session=session)
+                _set_labels(session, pod.uuid, LABEL, pod.labels)
         except db_exc.DBDuplicateEntry as exc:
             if 'instance_uuid' in exc.columns:
                 raise exception.InstanceAssociated(
@@ -661,59 +1203,77 @@ class Connection(api.Connection):
 
     def destroy_pod(self, pod_id):
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
+            _delete_labels(session, models.Pod, pod_id)
             query = model_query(models.Pod, session=session)
             query = add_identity_filter(query, pod_id)
-            count = query.delete()
+            count = _delete(query, models.Pod)
             if count != 1:
                 raise exception.PodNotFound(pod_id)
 
-    def update_pod(self, pod_id, values):
+    def update_pod(self, pod_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Pod.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_pod(pod_id, values)
+            return self._do_update_pod(pod_id, values, expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 pod=pod_id)
 
-    def _do_update_pod(self, pod_id, values):
+    def _do_update_pod(self, pod_id, values, expected=None):
         session = get_session()
-        with session.begin():
-            query = model_query(models.Pod, session=session)
-            query = add_identity_filter(query, pod_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.PodNotFound(pod=pod_id)
+        with session.begin(subtransactions=True):
+            ref = _update_row(models.Pod, pod_id, values,
+                              exception.PodNotFound(pod=pod_id),
+                              expected=expected, session=session)
+            if 'labels' in values:
+                _set_labels(session, ref.uuid, LABEL, values['labels'])
+        return ref
 
-            # Prevent instance_uuid overwriting
-            if values.get("instance_uuid") and ref.instance_uuid:
-                raise exception.PodAssociated(pod=pod_id,
-                                instance=ref.instance_uuid)
+    def create_pods(self, values_list):
+        return _bulk_create(models.Pod, values_list,
+                            exception.PodAlreadyExists)
 
-            if 'provision_state' in values:
-                values['provision_updated_at'] = timeutils.utcnow()
+    def update_pods(self, values_list):
+        return _bulk_update(models.Pod, values_list)
 
-            ref.update(values)
-        return ref
+    def destroy_pods(self, pod_uuids):
+        return _bulk_destroy(models.Pod, pod_uuids)
+
+    def destroy_pods_by_bay(self, bay_uuid):
+        return _bulk_destroy_by_bay(models.Pod, bay_uuid)
+
+    def get_pods_versions(self, pod_uuids):
+        return _get_versions(models.Pod, pod_uuids)
 
     def _add_services_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(models.Service.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'bay_uuid' in filters:
             query = query.filter_by(bay_uuid=filters['bay_uuid'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.Service,
+                                           filters['name_prefix'])
         if 'ip' in filters:
             query = query.filter_by(ip=filters['ip'])
         if 'port' in filters:
             query = query.filter_by(port=filters['port'])
+        if 'labels' in filters:
+            query = add_labels_filter(query, models.Service,
+                                      filters['labels'])
 
         return query
 
@@ -724,7 +1284,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.Service.id]
         else:
-            columns = [getattr(models.Service, c) for c in columns]
+            columns = [models.Service.query_column(c) for c in columns]
 
         query = model_query(*columns, base_model=models.Service)
         query = self._add_services_filters(query, filters)
@@ -745,8 +1305,13 @@ class Connection(api.Connection):
 
         service = models.Service()
         service.update(values)
+        session = get_session()
         try:
-            service.save()
+            with session.begin(subtransactions=True):
+                service.save(session=session)
+                _set_labels(session, service.uuid, LABEL, service.labels)
+                _set_labels(session, service.uuid, SELECTOR,
+                            service.selector)
         except db_exc.DBDuplicateEntry as exc:
             if 'instance_uuid' in exc.columns:
                 raise exception.InstanceAssociated(
@@ -776,57 +1341,105 @@ class Connection(api.Connection):
         except NoResultFound:
             raise exception.ServiceNotFound(bay=bay_uuid)
 
+    def get_service_pod_uuids(self, bay_uuid):
+        # A pod belongs to a service when it carries every key=value pair
+        # of the selector of the service: count the selector rows matched
+        # by the labels of each pod and compare with the size of the
+        # selector.
+        selector = orm.aliased(models.Label)
+        label = orm.aliased(models.Label)
+        selector_size = orm.aliased(models.Label)
+        size = sa.select([sa.func.count(selector_size.id)]).where(sa.and_(
+            selector_size.resource_uuid == models.Service.uuid,
+            selector_size.kind == SELECTOR)).as_scalar()
+
+        query = model_query(models.Service.uuid, models.Pod.uuid)
+        query = query.select_from(models.Service)
+        query = query.join(selector, sa.and_(
+            selector.resource_uuid == models.Service.uuid,
+            selector.kind == SELECTOR))
+        query = query.join(label, sa.and_(
+            label.kind == LABEL,
+            label.key == selector.key,
+            label.value == selector.value))
+        query = query.join(models.Pod, sa.and_(
+            models.Pod.uuid == label.resource_uuid,
+            models.Pod.bay_uuid == models.Service.bay_uuid))
+        query = query.filter(models.Service.bay_uuid == bay_uuid)
+        query = query.group_by(models.Service.uuid, models.Pod.uuid)
+        query = query.having(sa.func.count(label.id) == size)
+        return query.all()
+
     def destroy_service(self, service_id):
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
+            _delete_labels(session, models.Service, service_id)
             query = model_query(models.Service, session=session)
             query = add_identity_filter(query, service_id)
             count = query.delete()
             if count != 1:
                 raise exception.ServiceNotFound(service_id)
 
-    def update_service(self, service_id, values):
+    def update_service(self, service_id, values, expected=None):
         # NOTE(dtantsur): this can lead to very strange errors
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Service.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_service(service_id, values)
+            return self._do_update_service(service_id, values,
+                                           expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 service=service_id)
 
-    def _do_update_service(self, service_id, values):
+    def _do_update_service(self, service_id, values, expected=None):
         session = get_session()
-        with session.begin():
-            query = model_query(models.Service, session=session)
-            query = add_identity_filter(query, service_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.ServiceNotFound(service=service_id)
+        with session.begin(subtransactions=True):
+            ref = _update_row(models.Service, service_id, values,
+                              exception.ServiceNotFound(service=service_id),
+                              expected=expected, session=session)
+            if 'labels' in values:
+                _set_labels(session, ref.uuid, LABEL, values['labels'])
+            if 'selector' in values:
+                _set_labels(session, ref.uuid, SELECTOR, values['selector'])
+        return ref
 
-            # Prevent instance_uuid overwriting
-            if values.get("instance_uuid") and ref.instance_uuid:
-                raise exception.ServiceAssociated(service=service_id,
-                                instance=ref.instance_uuid)
+    def create_services(self, values_list):
+        return _bulk_create(models.Service, values_list,
+                            exception.ServiceAlreadyExists)
 
-            if 'provision_state' in values:
-                values['provision_updated_at'] = timeutils.utcnow()
+    def update_services(self, values_list):
+        return _bulk_update(models.Service, values_list)
 
-            ref.update(values)
-        return ref
+    def destroy_services(self, service_uuids):
+        return _bulk_destroy(models.Service, service_uuids)
+
+    def destroy_services_by_bay(self, bay_uuid):
+        return _bulk_destroy_by_bay(models.Service, bay_uuid)
+
+    def get_services_versions(self, service_uuids):
+        return _get_versions(models.Service, service_uuids)
 
     def _add_rcs_filters(self, query, filters):
         if filters is None:
             filters = []
 
+        if 'uuid' in filters:
+            query = query.filter(
+                models.ReplicationController.uuid.in_(filters['uuid']))
+        if 'project_id' in filters:
+            query = query.filter_by(project_id=filters['project_id'])
+        if 'user_id' in filters:
+            query = query.filter_by(user_id=filters['user_id'])
         if 'bay_uuid' in filters:
             query = query.filter_by(bay_uuid=filters['bay_uuid'])
         if 'name' in filters:
             query = query.filter_by(name=filters['name'])
+        if 'name_prefix' in filters:
+            query = add_name_prefix_filter(query, models.ReplicationController,
+                                           filters['name_prefix'])
         if 'replicas' in filters:
             query = query.filter_by(replicas=filters['replicas'])
 
@@ -837,7 +1450,7 @@ class Connection(api.Connection):
         if columns is None:
             columns = [models.ReplicationController.id]
         else:
-            columns = [getattr(models.ReplicationController, c)
+            columns = [models.ReplicationController.query_column(c)
                        for c in columns]
 
         query = model_query(*columns, base_model=models.ReplicationController)
@@ -903,34 +1516,42 @@ class Connection(api.Connection):
 
     def destroy_rc(self, rc_id):
         session = get_session()
-        with session.begin():
+        with session.begin(subtransactions=True):
             query = model_query(models.ReplicationController, session=session)
             query = add_identity_filter(query, rc_id)
             count = query.delete()
             if count != 1:
                 raise exception.ReplicationControllerNotFound(rc_id)
 
-    def update_rc(self, rc_id, values):
+    def update_rc(self, rc_id, values, expected=None):
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing rc.")
             raise exception.InvalidParameterValue(err=msg)
 
         try:
-            return self._do_update_rc(rc_id, values)
+            return self._do_update_rc(rc_id, values, expected=expected)
         except db_exc.DBDuplicateEntry:
             raise exception.InstanceAssociated(
                 instance_uuid=values['instance_uuid'],
                 rc=rc_id)
 
-    def _do_update_rc(self, rc_id, values):
-        session = get_session()
-        with session.begin():
-            query = model_query(models.ReplicationController, session=session)
-            query = add_identity_filter(query, rc_id)
-            try:
-                ref = query.with_lockmode('update').one()
-            except NoResultFound:
-                raise exception.ReplicationControllerNotFound(rc=rc_id)
+    def _do_update_rc(self, rc_id, values, expected=None):
+        return _update_row(models.ReplicationController, rc_id, values,
+                           exception.ReplicationControllerNotFound(rc=rc_id),
+                           expected=expected)
 
-            ref.update(values)
-        return ref
+    def create_rcs(self, values_list):
+        return _bulk_create(models.ReplicationController, values_list,
+                            exception.ReplicationControllerAlreadyExists)
+
+    def update_rcs(self, values_list):
+        return _bulk_update(models.ReplicationController, values_list)
+
+    def destroy_rcs(self, rc_uuids):
+        return _bulk_destroy(models.ReplicationController, rc_uuids)
+
+    def destroy_rcs_by_bay(self, bay_uuid):
+        return _bulk_destroy_by_bay(models.ReplicationController, bay_uuid)
+
+    def get_rcs_versions(self, rc_uuids):
+        return _get_versions(models.ReplicationController, rc_uuids)
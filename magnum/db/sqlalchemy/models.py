@@ -18,17 +18,20 @@
 SQLAlchemy models for container service
 """
 
-import json
-
 from oslo.config import cfg
 from oslo.db import options as db_options
 from oslo.db.sqlalchemy import models
+from oslo.utils import importutils
+import six
 import six.moves.urllib.parse as urlparse
 from sqlalchemy import Column
+from sqlalchemy import DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Integer
+from sqlalchemy import orm
 from sqlalchemy import schema
 from sqlalchemy import String
+from sqlalchemy import sql
 from sqlalchemy.types import TypeDecorator, TEXT
 
 from magnum.common import paths
@@ -37,9 +40,25 @@ from magnum.common import paths
 sql_opts = [
     cfg.StrOpt('mysql_engine',
                default='InnoDB',
-               help='MySQL engine to use.')
+               help='MySQL engine to use.'),
+    cfg.StrOpt('json_codec',
+               default='auto',
+               help='Module used to encode and decode the JSON columns, '
+                    'e.g. ujson, simplejson or json. "auto" uses the first '
+                    'of these which is installed.'),
+    cfg.IntOpt('slave_max_lag',
+               default=5,
+               help='Replication lag, in seconds, tolerated from the '
+                    'database of slave_connection. Read-only API requests '
+                    'are sent to it, except during this many seconds after '
+                    'their client last wrote to the primary database, as '
+                    'reported by the X-Magnum-Last-Write header, so that '
+                    'clients read their own writes.'),
 ]
 
+# Candidates of the json_codec option, fastest first.
+JSON_CODECS = ['ujson', 'simplejson', 'json']
+
 _DEFAULT_SQL_CONNECTION = 'sqlite:///' + paths.state_path_def('magnum.sqlite')
 
 
@@ -55,6 +74,24 @@ def table_args():
     return None
 
 
+_JSON_CODEC = None
+
+
+def get_json_codec():
+    """Return the module encoding and decoding the JSON columns."""
+    global _JSON_CODEC
+    if _JSON_CODEC is None:
+        name = cfg.CONF.database.json_codec
+        if name == 'auto':
+            for name in JSON_CODECS:
+                _JSON_CODEC = importutils.try_import(name)
+                if _JSON_CODEC is not None:
+                    break
+        else:
+            _JSON_CODEC = importutils.import_module(name)
+    return _JSON_CODEC
+
+
 class JsonEncodedType(TypeDecorator):
     """Abstract base type serialized as json-encoded string in db."""
     type = None
@@ -70,12 +107,12 @@ class JsonEncodedType(TypeDecorator):
                             % (self.__class__.__name__,
                                self.type.__name__,
                                type(value).__name__))
-        serialized_value = json.dumps(value)
+        serialized_value = get_json_codec().dumps(value)
         return serialized_value
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = json.loads(value)
+            value = get_json_codec().loads(value)
         return value
 
 
@@ -89,11 +126,81 @@ class JSONEncodedList(JsonEncodedType):
     type = list
 
 
+class JSONText(TypeDecorator):
+    """JSON text of a column mapped with json_column().
+
+    The text is loaded as is, it is only decoded when the attribute is
+    read. Values which were not encoded by the attribute are encoded, and
+    type checked, by ``encoded_type``.
+    """
+    impl = TEXT
+
+    def __init__(self, encoded_type):
+        super(JSONText, self).__init__()
+        self.encoded_type = encoded_type
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, six.string_types):
+            return value
+        return self.encoded_type().process_bind_param(value, dialect)
+
+
+def json_column(name, encoded_type):
+    """Map a JSON column which is decoded on first access.
+
+    Returns the column, to be set as ``_<name>`` on the model, and the
+    synonym of the decoded value, to be set as ``<name>``. Assigning a
+    value equal to the current one is a no-op, so an unchanged value is
+    neither encoded again nor written back.
+    """
+    attr = '_' + name
+    cache = '_%s_decoded' % name
+    value_type = encoded_type.type
+
+    def getter(self):
+        text = getattr(self, attr)
+        cached = self.__dict__.get(cache)
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        value = text
+        if isinstance(text, six.string_types):
+            value = get_json_codec().loads(text)
+        self.__dict__[cache] = (text, value)
+        return value
+
+    def setter(self, value):
+        if value is None:
+            value = value_type()
+        elif not isinstance(value, value_type):
+            # Left to JSONText to reject when the row is written.
+            setattr(self, attr, value)
+            return
+        if value == getter(self):
+            return
+        text = get_json_codec().dumps(value)
+        setattr(self, attr, text)
+        self.__dict__[cache] = (text, value)
+
+    column = Column(name, JSONText(encoded_type))
+    return column, orm.synonym(attr, descriptor=property(getter, setter))
+
+
 class MagnumBase(models.TimestampMixin,
                  models.ModelBase):
 
     metadata = None
 
+    @classmethod
+    def query_column(cls, name):
+        """Return the expression selecting an attribute in a query.
+
+        The columns mapped with json_column() are selected decoded.
+        """
+        column = cls.__table__.c.get(name)
+        if column is None or not isinstance(column.type, JSONText):
+            return getattr(cls, name)
+        return sql.type_coerce(column, column.type.encoded_type).label(name)
+
     def as_dict(self):
         d = {}
         for c in self.__table__.columns:
@@ -111,34 +218,60 @@ class MagnumBase(models.TimestampMixin,
 Base = declarative_base(cls=MagnumBase)
 
 
-class Bay(Base):
+class SoftDeleteMixin(object):
+    """Rows which are only marked as deleted by the DB API.
+
+    The query helpers leave out the rows which have a deleted_at
+    timestamp, they are removed later by ``magnum-db-manage purge``.
+    """
+    deleted_at = Column(DateTime)
+
+
+class VersionMixin(object):
+    """Rows whose updates are compare-and-swaps on their version.
+
+    The DB API increments the version with every update of a row, and
+    save() of the objects expects the version they were loaded with.
+    """
+    version = Column(Integer, nullable=False, default=0, server_default='0')
+
+
+class Bay(VersionMixin, Base):
     """Represents a bay."""
 
     __tablename__ = 'bay'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_bay0uuid'),
+        schema.Index('bay_baymodel_id_idx', 'baymodel_id'),
+        schema.Index('bay_project_id_idx', 'project_id'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     baymodel_id = Column(String(255))
     stack_id = Column(String(255))
     master_address = Column(String(255))
-    minions_address = Column(JSONEncodedList)
+    _minions_address, minions_address = json_column('minions_address',
+                                                    JSONEncodedList)
     node_count = Column(Integer())
 
 
-class BayModel(Base):
+class BayModel(VersionMixin, Base):
     """Represents a bay model."""
 
     __tablename__ = 'baymodel'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_baymodel0uuid'),
+        schema.Index('baymodel_project_id_idx', 'project_id'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     image_id = Column(String(255))
     flavor_id = Column(String(255))
@@ -147,21 +280,26 @@ class BayModel(Base):
     dns_nameserver = Column(String(255))
 
 
-class Container(Base):
+class Container(SoftDeleteMixin, VersionMixin, Base):
     """Represents a container."""
 
     __tablename__ = 'container'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_container0uuid'),
+        schema.Index('container_project_id_idx', 'project_id'),
+        schema.Index('container_deleted_at_idx', 'deleted_at'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     image_id = Column(String(255))
+    status = Column(String(20))
 
 
-class Node(Base):
+class Node(VersionMixin, Base):
     """Represents a node."""
 
     __tablename__ = 'node'
@@ -169,64 +307,120 @@ class Node(Base):
         schema.UniqueConstraint('uuid', name='uniq_node0uuid'),
         schema.UniqueConstraint('ironic_node_id',
                                 name='uniq_node0ironic_node_id'),
+        schema.Index('node_project_id_idx', 'project_id'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     type = Column(String(20))
     image_id = Column(String(255))
     ironic_node_id = Column(String(36))
 
 
-class Pod(Base):
+class Pod(SoftDeleteMixin, VersionMixin, Base):
     """Represents a pod."""
 
     __tablename__ = 'pod'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_pod0uuid'),
+        schema.Index('pod_bay_uuid_name_idx', 'bay_uuid', 'name'),
+        schema.Index('pod_bay_uuid_status_idx', 'bay_uuid', 'status'),
+        schema.Index('pod_project_id_idx', 'project_id'),
+        schema.Index('pod_deleted_at_idx', 'deleted_at'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     desc = Column(String(255))
     bay_uuid = Column(String(36))
-    images = Column(JSONEncodedList)
-    labels = Column(JSONEncodedDict)
+    _images, images = json_column('images', JSONEncodedList)
+    _labels, labels = json_column('labels', JSONEncodedDict)
     status = Column(String(255))
 
 
-class Service(Base):
+class Service(VersionMixin, Base):
     """Represents a software service."""
 
     __tablename__ = 'service'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_service0uuid'),
+        schema.Index('service_bay_uuid_name_idx', 'bay_uuid', 'name'),
+        schema.Index('service_project_id_idx', 'project_id'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     bay_uuid = Column(String(36))
-    labels = Column(JSONEncodedDict)
-    selector = Column(JSONEncodedDict)
+    _labels, labels = json_column('labels', JSONEncodedDict)
+    _selector, selector = json_column('selector', JSONEncodedDict)
     ip = Column(String(36))
     port = Column(Integer())
 
 
-class ReplicationController(Base):
+class ReplicationController(VersionMixin, Base):
     """Represents a pod replication controller."""
 
     __tablename__ = 'replicationcontroller'
     __table_args__ = (
         schema.UniqueConstraint('uuid',
                                 name='uniq_replicationcontroller0uuid'),
+        schema.Index('replicationcontroller_bay_uuid_name_idx',
+                     'bay_uuid', 'name'),
+        schema.Index('replicationcontroller_project_id_idx', 'project_id'),
         table_args()
         )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
+    project_id = Column(String(255))
+    user_id = Column(String(255))
     name = Column(String(255))
     bay_uuid = Column(String(36))
-    images = Column(JSONEncodedList)
-    selector = Column(JSONEncodedDict)
+    _images, images = json_column('images', JSONEncodedList)
+    _selector, selector = json_column('selector', JSONEncodedDict)
     replicas = Column(Integer())
+
+
+class Label(Base):
+    """Represents one label or selector entry of a pod or a service.
+
+    The labels and selectors are also kept as JSON in the pod and service
+    rows, this table only exists so that they can be matched in SQL.
+    """
+
+    __tablename__ = 'label'
+    __table_args__ = (
+        schema.UniqueConstraint('resource_uuid', 'kind', 'key',
+                                name='uniq_label0resource_uuid0kind0key'),
+        schema.Index('label_kind_key_value_idx', 'kind', 'key', 'value'),
+        table_args()
+        )
+    id = Column(Integer, primary_key=True)
+    resource_uuid = Column(String(36), nullable=False)
+    kind = Column(String(20), nullable=False)
+    key = Column(String(255), nullable=False)
+    value = Column(String(255))
+
+
+def _shadow_table(model):
+    """Define the table the archived rows of a model are moved to.
+
+    It has the columns of the table of the model, but none of its indexes
+    and unique constraints: rows are only ever appended to it.
+    """
+    return schema.Table('shadow_' + model.__tablename__, Base.metadata,
+                        *[column.copy() for column in model.__table__.c],
+                        **(table_args() or {}))
+
+
+# Tables of the soft deleted rows moved away by ``magnum-db-manage
+# archive``, by model.
+SHADOW_TABLES = dict((model, _shadow_table(model))
+                     for model in (Pod, Container))
@@ -28,6 +28,13 @@ Node = node.Node
 Pod = pod.Pod
 ReplicationController = rc.ReplicationController
 Service = service.Service
+BayList = bay.BayList
+BayModelList = baymodel.BayModelList
+ContainerList = container.ContainerList
+NodeList = node.NodeList
+PodList = pod.PodList
+ReplicationControllerList = rc.ReplicationControllerList
+ServiceList = service.ServiceList
 
 __all__ = (Bay,
            BayModel,
@@ -35,4 +42,11 @@ __all__ = (Bay,
            Node,
            Pod,
            ReplicationController,
-           Service)
+           Service,
+           BayList,
+           BayModelList,
+           ContainerList,
+           NodeList,
+           PodList,
+           ReplicationControllerList,
+           ServiceList)
@@ -16,6 +16,7 @@
 
 import collections
 import copy
+import functools
 
 from oslo import messaging
 from oslo_context import context
@@ -41,6 +42,29 @@ def get_attrname(name):
     return '_%s' % name
 
 
+# Converters applied by MagnumObject._from_db_objects() to the values
+# loaded from the database, by field type function. The database already
+# returns values of the right type: only the naive datetimes need a
+# timezone, and the containers a copy the object owns. Fields of other
+# types go through their type function.
+_DB_CONVERTERS = {
+    int: None,
+    obj_utils.int_or_none: None,
+    obj_utils.str_or_none: None,
+    obj_utils.datetime_or_str_or_none: obj_utils.datetime_or_none,
+    obj_utils.dict_or_none: obj_utils.dict_or_none,
+    obj_utils.list_or_none: obj_utils.list_or_none,
+}
+
+# Field types whose values are immutable, and so are not copied by
+# __deepcopy__(), and those whose dicts and lists a copy shares with the
+# original until either hands them out.
+_IMMUTABLE_TYPES = (int, str, obj_utils.int_or_none, obj_utils.str_or_none,
+                    obj_utils.datetime_or_none,
+                    obj_utils.datetime_or_str_or_none)
+_COPY_ON_WRITE_TYPES = (obj_utils.dict_or_none, obj_utils.list_or_none)
+
+
 def make_class_properties(cls):
     # NOTE(danms/comstud): Inherit fields from super classes.
     # mro() returns the current class first and returns 'object' last, so
@@ -54,6 +78,9 @@ def make_class_properties(cls):
         for name, field in supercls.fields.items():
             if name not in cls.fields:
                 cls.fields[name] = field
+    # Each field has a bit of its own in the changes mask of the objects.
+    cls._field_bits = dict((name, 1 << i)
+                           for i, name in enumerate(sorted(cls.fields)))
     for name, typefn in cls.fields.iteritems():
 
         def getter(self, name=name):
@@ -62,8 +89,9 @@ def make_class_properties(cls):
                 self.obj_load_attr(name)
             return getattr(self, attrname)
 
-        def setter(self, value, name=name, typefn=typefn):
-            self._changed_fields.add(name)
+        def setter(self, value, name=name, typefn=typefn,
+                   bit=cls._field_bits[name]):
+            self._changed_bits |= bit
             try:
                 return setattr(self, get_attrname(name), typefn(value))
             except Exception:
@@ -72,7 +100,42 @@ def make_class_properties(cls):
                               {'attr': attr})
                 raise
 
-        setattr(cls, name, property(getter, setter))
+        if typefn not in _COPY_ON_WRITE_TYPES:
+            setattr(cls, name, property(getter, setter))
+            continue
+
+        def cow_getter(self, name=name, bit=cls._field_bits[name]):
+            attrname = get_attrname(name)
+            if not hasattr(self, attrname):
+                self.obj_load_attr(name)
+            elif getattr(self, '_shared_bits', 0) & bit:
+                # The value is shared with a copy of this object, it is
+                # copied before anyone gets a chance to modify it.
+                setattr(self, attrname,
+                        copy.deepcopy(getattr(self, attrname)))
+                self._shared_bits &= ~bit
+            self._exposed_bits = getattr(self, '_exposed_bits', 0) | bit
+            return getattr(self, attrname)
+
+        def cow_setter(self, value, name=name, setter=setter,
+                       bit=cls._field_bits[name]):
+            setter(self, value)
+            self._shared_bits = getattr(self, '_shared_bits', 0) & ~bit
+            self._exposed_bits = getattr(self, '_exposed_bits', 0) & ~bit
+
+        setattr(cls, name, property(cow_getter, cow_setter))
+
+    cls._immutable_bits = cls._obj_bits_of_types(_IMMUTABLE_TYPES)
+    cls._copy_on_write_bits = cls._obj_bits_of_types(_COPY_ON_WRITE_TYPES)
+
+    cls._db_converters = dict(
+        (name,
+         _DB_CONVERTERS[typefn] if typefn in _DB_CONVERTERS else typefn)
+        for name, typefn in cls.fields.items()
+        if name not in cls.obj_non_db_fields)
+    cls._db_hydrators = tuple(
+        (name, get_attrname(name), convert)
+        for name, convert in cls._db_converters.items())
 
 
 class MagnumObjectMetaclass(type):
@@ -82,14 +145,46 @@ class MagnumObjectMetaclass(type):
     # remoted. If this is not None, use it to remote things over RPC.
     indirection_api = None
 
+    def __new__(mcs, name, bases, dict_):
+        # Store the fields in slots rather than in a __dict__ per instance:
+        # every class gets a slot for each of its fields which none of its
+        # bases has.
+        fields = set(dict_.get('fields', ()))
+        slots = set()
+        for base in bases:
+            for supercls in base.mro():
+                fields.update(getattr(supercls, 'fields', ()))
+                slots.update(supercls.__dict__.get('__slots__', ()))
+        slots.update(dict_.get('__slots__', ()))
+        dict_['__slots__'] = tuple(dict_.get('__slots__', ())) + tuple(
+            sorted(get_attrname(field) for field in fields
+                   if get_attrname(field) not in slots))
+        return super(MagnumObjectMetaclass, mcs).__new__(mcs, name, bases,
+                                                         dict_)
+
     def __init__(cls, names, bases, dict_):
         if not hasattr(cls, '_obj_classes'):
             # This will be set in the 'MagnumObject' class.
             cls._obj_classes = collections.defaultdict(list)
+            cls._obj_class_cache = {}
         else:
             # Add the subclass to MagnumObject._obj_classes
             make_class_properties(cls)
-            cls._obj_classes[cls.obj_name()].append(cls)
+            objname = cls.obj_name()
+            cls._obj_classes[objname].append(cls)
+            cls._register_class_versions(objname)
+
+    def _register_class_versions(cls, objname):
+        """Rebuild the (name, version) to class table of obj_class_from_name.
+
+        The compatible matches cached for the name may change with the new
+        class, so they are dropped, and the exact versions are set again.
+        """
+        cache = cls._obj_class_cache
+        for key in [key for key in cache if key[0] == objname]:
+            del cache[key]
+        for objclass in cls._obj_classes[objname]:
+            cache.setdefault((objname, objclass.VERSION), objclass)
 
 
 # These are decorators that mark an object's method as remotable.
@@ -113,6 +208,23 @@ def remotable_classmethod(fn):
     return classmethod(wrapper)
 
 
+def obj_class_actions(context, calls):
+    """Call several remotable classmethods at once.
+
+    With an indirection API, the calls are sent in a single RPC message.
+
+    :param calls: a list of (objclass, objmethod, args, kwargs) tuples.
+    :returns: the list of the results of the calls.
+    """
+    if MagnumObject.indirection_api:
+        return MagnumObject.indirection_api.object_class_actions(
+            context, [(objclass.obj_name(), objmethod, objclass.VERSION,
+                       args, kwargs)
+                      for objclass, objmethod, args, kwargs in calls])
+    return [getattr(objclass, objmethod)(context, *args, **kwargs)
+            for objclass, objmethod, args, kwargs in calls]
+
+
 # See comment above for remotable_classmethod()
 #
 # Note that this will use either the provided context, or the one
@@ -132,18 +244,63 @@ def remotable(fn):
             raise exception.OrphanedObjectError(method=fn.__name__,
                                                 objtype=self.obj_name())
         if MagnumObject.indirection_api:
-            updates, result = MagnumObject.indirection_api.object_action(
-                ctxt, self, fn.__name__, args, kwargs)
+            # Only the changes of the object are sent, unless the remote end
+            # has another version of the object class or of its DB row.
+            try:
+                updates, result = MagnumObject.indirection_api.object_action(
+                    ctxt, self.obj_to_delta_primitive(), fn.__name__, args,
+                    kwargs)
+            except exception.ObjectDeltaMismatch:
+                updates, result = MagnumObject.indirection_api.object_action(
+                    ctxt, self, fn.__name__, args, kwargs)
             for key, value in updates.iteritems():
                 if key in self.fields:
                     self[key] = self._attr_from_primitive(key, value)
-            self._changed_fields = set(updates.get('obj_what_changed', []))
+            self._changed_bits = self._obj_changes_mask(
+                updates.get('obj_what_changed', []))
             return result
         else:
             return fn(self, ctxt, *args, **kwargs)
     return wrapper
 
 
+# The identity map of a context: the objects found by get_by_id() and
+# get_by_uuid() are cached in the context, so that loading the same object
+# again within the same request does not query the database. Only short
+# lived contexts, such as the context of an API request or of an RPC call,
+# have an object cache, as the cached objects are not reloaded until they
+# are written.
+def obj_cache_enable(context):
+    """Start caching the objects loaded with the given context."""
+    context.object_cache = {}
+
+
+def _obj_cache(context):
+    cache = getattr(context, 'object_cache', None)
+    return cache if isinstance(cache, dict) else None
+
+
+def identity_mapped(field):
+    """Decorator caching the objects found by a get_by_<field>() method.
+
+    It goes below remotable_classmethod, around the lookup itself.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(cls, context, *args, **kwargs):
+            cache = _obj_cache(context)
+            if cache is None or len(args) + len(kwargs) != 1:
+                return fn(cls, context, *args, **kwargs)
+            value = args[0] if args else list(kwargs.values())[0]
+            obj = cache.get((cls.obj_name(), field, value))
+            if obj is None:
+                obj = fn(cls, context, *args, **kwargs)
+                obj._obj_cache_add(cache)
+            return obj
+        return wrapper
+    return decorator
+
+
 # Object versioning rules
 #
 # Each service has its set of objects, each with a version attached. When
@@ -182,6 +339,13 @@ class MagnumObject(object):
     # Version of this object (see rules above check_object_version())
     VERSION = '1.0'
 
+    # The fields are stored in slots generated by the metaclass, the changed
+    # fields in a mask of the bits of their _field_bits.
+    # The dicts and lists shared with a copy of the object, and those which
+    # were handed out, are tracked the same way, see __deepcopy__().
+    __slots__ = ('_context', '_changed_bits', '_obj_version',
+                 '_obj_lazy_group', '_shared_bits', '_exposed_bits')
+
     # The fields present in this object as key:typefn pairs. For example:
     #
     # fields = { 'foo': int,
@@ -195,16 +359,26 @@ class MagnumObject(object):
     fields = {
         'created_at': obj_utils.datetime_or_str_or_none,
         'updated_at': obj_utils.datetime_or_str_or_none,
+        'version': obj_utils.int_or_none,
         }
     obj_extra_fields = []
 
+    # Fields which are not stored in the database, and so are not set by
+    # _from_db_objects().
+    obj_non_db_fields = ()
+
+    # Heavy fields which list() leaves out of its query. They are loaded by
+    # obj_load_attr() the first time one of them is accessed, for all the
+    # objects of the list at once.
+    obj_lazy_fields = ()
+
     _attr_created_at_from_primitive = obj_utils.dt_deserializer
     _attr_updated_at_from_primitive = obj_utils.dt_deserializer
     _attr_created_at_to_primitive = obj_utils.dt_serializer('created_at')
     _attr_updated_at_to_primitive = obj_utils.dt_serializer('updated_at')
 
     def __init__(self, context, **kwargs):
-        self._changed_fields = set()
+        self._changed_bits = 0
         self._context = context
         self.update(kwargs)
 
@@ -219,6 +393,11 @@ class MagnumObject(object):
     @classmethod
     def obj_class_from_name(cls, objname, objver):
         """Returns a class from the registry based on a name and version."""
+        try:
+            return cls._obj_class_cache[(objname, objver)]
+        except KeyError:
+            pass
+
         if objname not in cls._obj_classes:
             LOG.error(_LE('Unable to instantiate unregistered object type '
                           '%(objtype)s'), dict(objtype=objname))
@@ -240,6 +419,7 @@ class MagnumObject(object):
                 compatible_match = objclass
 
         if compatible_match:
+            cls._obj_class_cache[(objname, objver)] = compatible_match
             return compatible_match
 
         latest_ver = '%i.%i' % latest
@@ -247,6 +427,79 @@ class MagnumObject(object):
                                                   objver=objver,
                                                   supported=latest_ver)
 
+    @classmethod
+    def _from_db_objects(cls, context, db_objects):
+        """Converts a list of database entities to a list of formal objects.
+
+        The values loaded from the database are trusted, so they are stored
+        directly rather than through the field setters: they skip the type
+        functions and the change tracking, which is most of the cost of
+        hydrating large lists one field at a time.
+        """
+        hydrators = cls._db_hydrators
+        objs = []
+        for db_obj in db_objects:
+            obj = cls.__new__(cls)
+            obj._changed_bits = 0
+            obj._context = context
+            for name, attrname, convert in hydrators:
+                value = getattr(db_obj, name)
+                if convert is not None:
+                    value = convert(value)
+                setattr(obj, attrname, value)
+            objs.append(obj)
+        return objs
+
+    @classmethod
+    def _from_db_columns_list(cls, context, columns, db_rows, lazy=False):
+        """Converts rows of projected columns to a list of formal objects.
+
+        Only the fields matching the columns are set on the objects, the
+        others are left unset. The values are stored as _from_db_objects()
+        does.
+
+        :param lazy: whether the obj_lazy_fields are loaded together for
+                     all the objects of the list when first accessed.
+        """
+        hydrators = [(get_attrname(name), cls._db_converters[name])
+                     for name in columns]
+        objs = []
+        for row in db_rows:
+            obj = cls.__new__(cls)
+            obj._changed_bits = 0
+            obj._context = context
+            for (attrname, convert), value in zip(hydrators, row):
+                if convert is not None:
+                    value = convert(value)
+                setattr(obj, attrname, value)
+            if lazy:
+                obj._obj_lazy_group = objs
+            objs.append(obj)
+        return objs
+
+    @classmethod
+    def obj_eager_columns(cls):
+        """Returns the columns list() loads, all but the lazy fields."""
+        return [name for name in sorted(cls._db_converters)
+                if name not in cls.obj_lazy_fields]
+
+    @classmethod
+    def _obj_get_columns(cls, columns, uuids):
+        """Returns rows of the given columns of the objects of the uuids.
+
+        Classes with obj_lazy_fields query their <kind>info_list() DB API.
+        """
+        raise NotImplementedError()
+
+    @remotable_classmethod
+    def get_columns(cls, context, columns, uuids):
+        """Returns rows of the given columns of the objects of the uuids.
+
+        This is how obj_load_attr() reads the lazy fields, so that they are
+        read by the conductor when the objects have an indirection_api.
+        """
+        return [list(row) for row in cls._obj_get_columns(columns, uuids)]
+
     def _attr_from_primitive(self, attribute, value):
         """Attribute deserialization dispatcher.
 
@@ -262,14 +515,41 @@ class MagnumObject(object):
     @classmethod
     def _obj_from_primitive(cls, context, objver, primitive):
         self = cls(context)
-        self.VERSION = objver
+        if objver != cls.VERSION:
+            self._obj_version = objver
         objdata = primitive['magnum_object.data']
         changes = primitive.get('magnum_object.changes', [])
         for name in self.fields:
             if name in objdata:
                 setattr(self, name,
                         self._attr_from_primitive(name, objdata[name]))
-        self._changed_fields = set([x for x in changes if x in self.fields])
+        self._changed_bits = self._obj_changes_mask(changes)
+        return self
+
+    @classmethod
+    def _obj_from_delta(cls, context, objver, primitive):
+        """Apply the changes sent by obj_to_delta_primitive().
+
+        The changes are merged into the object cached in the context, or
+        loaded from the DB. ObjectDeltaMismatch is raised when the object
+        is not at the version the changes were made to, so that the sender
+        sends it in full instead.
+        """
+        identity = primitive['magnum_object.delta']
+        if objver != cls.VERSION:
+            raise exception.ObjectDeltaMismatch(objtype=cls.obj_name(),
+                                                uuid=identity['uuid'])
+        self = cls.get_by_uuid(context, identity['uuid'])
+        if (self.obj_what_changed() or
+                self.obj_get_expected() != {'version': identity['version']}):
+            raise exception.ObjectDeltaMismatch(objtype=cls.obj_name(),
+                                                uuid=identity['uuid'])
+        objdata = primitive['magnum_object.data']
+        for name in objdata:
+            if name in self.fields:
+                setattr(self, name,
+                        self._attr_from_primitive(name, objdata[name]))
+        self._changed_bits = self._obj_changes_mask(objdata)
         return self
 
     @classmethod
@@ -287,10 +567,17 @@ class MagnumObject(object):
         objname = primitive['magnum_object.name']
         objver = primitive['magnum_object.version']
         objclass = cls.obj_class_from_name(objname, objver)
+        if 'magnum_object.delta' in primitive:
+            return objclass._obj_from_delta(context, objver, primitive)
         return objclass._obj_from_primitive(context, objver, primitive)
 
     def __deepcopy__(self, memo):
-        """Efficiently make a deep copy of this object."""
+        """Efficiently make a deep copy of this object.
+
+        Immutable values are not copied. The dicts and lists are shared
+        with the copy, each object copying them only when it hands them
+        out, unless this object already handed them out.
+        """
 
         # NOTE(danms): A naive deepcopy would copy more than we need,
         # and since we have knowledge of the volatile bits of the
@@ -299,11 +586,28 @@ class MagnumObject(object):
         # of issues by copying only our field data.
 
         nobj = self.__class__(self._context)
+        exposed = getattr(self, '_exposed_bits', 0)
+        shared = 0
         for name in self.fields:
-            if self.obj_attr_is_set(name):
-                nval = copy.deepcopy(getattr(self, name), memo)
-                setattr(nobj, name, nval)
-        nobj._changed_fields = set(self._changed_fields)
+            attrname = get_attrname(name)
+            if not hasattr(self, attrname):
+                continue
+            value = getattr(self, attrname)
+            bit = self._field_bits[name]
+            if bit & self._copy_on_write_bits and not bit & exposed:
+                shared |= bit
+            elif not bit & self._immutable_bits:
+                value = copy.deepcopy(value, memo)
+            setattr(nobj, attrname, value)
+        if shared:
+            self._shared_bits = getattr(self, '_shared_bits', 0) | shared
+            nobj._shared_bits = shared
+        nobj._changed_bits = self._changed_bits
+        # A copy of an older version of the object is sent as such, and a
+        # copy of an object of a list still loads its lazy fields.
+        for attrname in ('_obj_version', '_obj_lazy_group'):
+            if hasattr(self, attrname):
+                setattr(nobj, attrname, getattr(self, attrname))
         return nobj
 
     def obj_clone(self):
@@ -328,27 +632,88 @@ class MagnumObject(object):
 
         This calls self._attr_to_primitive() for each item in fields.
         """
+        self.obj_load_lazy_fields()
         primitive = dict()
         for name in self.fields:
             if hasattr(self, get_attrname(name)):
                 primitive[name] = self._attr_to_primitive(name)
         obj = {'magnum_object.name': self.obj_name(),
                'magnum_object.namespace': 'magnum',
-               'magnum_object.version': self.VERSION,
+               'magnum_object.version': self.obj_version,
                'magnum_object.data': primitive}
         if self.obj_what_changed():
             obj['magnum_object.changes'] = list(self.obj_what_changed())
         return obj
 
+    def obj_to_delta_primitive(self):
+        """Dehydrate the identity and the changed fields of this object.
+
+        The version is sent along with the uuid, so that the receiving end
+        only applies the changes to the same version of the object, see
+        _obj_from_delta(). Objects which were not loaded from the DB, or
+        whose version was changed, are sent in full.
+        """
+        expected = self.obj_get_expected()
+        if expected is None or not self.obj_attr_is_set('uuid'):
+            return self.obj_to_primitive()
+        primitive = dict((name, self._attr_to_primitive(name))
+                         for name in self.obj_what_changed())
+        return {'magnum_object.name': self.obj_name(),
+                'magnum_object.namespace': 'magnum',
+                'magnum_object.version': self.obj_version,
+                'magnum_object.delta': {'uuid': self.uuid,
+                                        'version': expected['version']},
+                'magnum_object.data': primitive}
+
     def obj_load_attr(self, attrname):
         """Load an additional attribute from the real object.
 
-        This should use self._conductor, and cache any data that might
-        be useful for future load operations.
+        Only the obj_lazy_fields can be loaded. The ones missing are read
+        in one query, for this object and the others of the list it was
+        loaded with.
         """
-        raise NotImplementedError(
-            _("Cannot load '%(attrname)s' in the base class") %
-            {'attrname': attrname})
+        if (attrname not in self.obj_lazy_fields or
+                not self.obj_attr_is_set('uuid')):
+            raise NotImplementedError(
+                _("Cannot load '%(attrname)s' in the base class") %
+                {'attrname': attrname})
+
+        fields = [name for name in self.obj_lazy_fields
+                  if not self.obj_attr_is_set(name)]
+        objs = [obj for obj in getattr(self, '_obj_lazy_group', None) or ()
+                if obj is not self and
+                not all(obj.obj_attr_is_set(name) for name in fields)]
+        objs.append(self)
+        rows = self.get_columns(self._context, ['uuid'] + fields,
+                                [obj.uuid for obj in objs])
+        values_by_uuid = dict((row[0], row[1:]) for row in rows)
+        for obj in objs:
+            values = values_by_uuid.get(obj.uuid)
+            if values is None:
+                continue
+            for name, value in zip(fields, values):
+                if obj.obj_attr_is_set(name):
+                    continue
+                convert = self._db_converters[name]
+                if convert is not None:
+                    value = convert(value)
+                setattr(obj, get_attrname(name), value)
+
+        if not self.obj_attr_is_set(attrname):
+            raise exception.ObjectNotFound(name=self.obj_name(),
+                                           id=self.uuid)
+
+    def obj_load_lazy_fields(self):
+        """Load the lazy fields which list() left out of this object.
+
+        This is done before the object is converted to a dict or a
+        primitive, which would otherwise leave them out.
+        """
+        if getattr(self, '_obj_lazy_group', None) is None:
+            return
+        for name in self.obj_lazy_fields:
+            if not self.obj_attr_is_set(name):
+                self.obj_load_attr(name)
 
     def save(self, context):
         """Save the changed fields back to the store.
@@ -365,9 +730,151 @@ class MagnumObject(object):
             changes[key] = self[key]
         return changes
 
+    def _obj_cache_keys(self):
+        return [(self.obj_name(), field, self[field])
+                for field in ('id', 'uuid')
+                if field in self.fields and self.obj_attr_is_set(field)]
+
+    def _obj_cache_add(self, cache):
+        for key in self._obj_cache_keys():
+            cache[key] = self
+
+    def obj_cache_evict(self):
+        """Drop this object from the identity map of its context.
+
+        This is done by the writes to the object, since the cached object
+        may be another copy of it.
+        """
+        cache = _obj_cache(self._context)
+        if cache is None:
+            return
+        for key in self._obj_cache_keys():
+            cache.pop(key, None)
+
+    def obj_set_owner(self):
+        """Default the project and user of a new object to its context's.
+
+        This is done where the object is built from the API request, as the
+        context passed along with RPC calls has no project nor user.
+        """
+        if self._context is None:
+            return
+        for field, attr in (('project_id', 'tenant'), ('user_id', 'user')):
+            if field in self.fields and (not self.obj_attr_is_set(field) or
+                                         self[field] is None):
+                self[field] = getattr(self._context, attr)
+
+    @classmethod
+    def obj_scope_filters(cls, context, filters):
+        """Restrict the filters of a list to the project of the context.
+
+        The project is filtered on by the database, admin contexts list the
+        objects of every project.
+        """
+        if context is None or context.is_admin or (
+                'project_id' not in cls.fields):
+            return filters
+        filters = dict(filters or {})
+        filters['project_id'] = context.tenant
+        return filters
+
+    @property
+    def obj_version(self):
+        """The version of this object, older if it was received as such."""
+        return getattr(self, '_obj_version', self.VERSION)
+
+    @classmethod
+    def _obj_bits_of_types(cls, types):
+        """Returns the mask of the fields of the given types."""
+        return cls._obj_changes_mask(
+            name for name, typefn in cls.fields.items() if typefn in types)
+
+    @classmethod
+    def _obj_changes_mask(cls, fields):
+        """Returns the changes mask of the given fields."""
+        mask = 0
+        for name in fields:
+            mask |= cls._field_bits.get(name, 0)
+        return mask
+
     def obj_what_changed(self):
         """Returns a set of fields that have been modified."""
-        return self._changed_fields
+        bits = self._changed_bits
+        if not bits:
+            return set()
+        return set(name for name, bit in self._field_bits.items()
+                   if bits & bit)
+
+    def obj_diff(self, other):
+        """Returns the set fields whose value differs from other's.
+
+        The values are compared in place, so that the dicts and lists this
+        object shares with a copy are not copied.
+        """
+        diff = set()
+        for name in self.fields:
+            attrname = get_attrname(name)
+            if not hasattr(self, attrname):
+                continue
+            if (not hasattr(other, attrname) or
+                    getattr(self, attrname) != getattr(other, attrname)):
+                diff.add(name)
+        return diff
+
+    def obj_get_expected(self):
+        """Returns the values the DB row must still have for save().
+
+        The version loaded along with the object is compared, and
+        incremented, by the UPDATE of the row, so that save() fails with
+        ConcurrentUpdate rather than overwriting the changes of another
+        writer.
+        """
+        if (not self.obj_attr_is_set('version') or self.version is None or
+                'version' in self.obj_what_changed()):
+            return None
+        return {'version': self.version}
+
+    def obj_is_stale(self, versions):
+        """Whether this object differs from its DB row.
+
+        It does when the row was updated since the object was loaded, and
+        when the object has unsaved changes, which a refresh discards.
+
+        :param versions: the versions of the rows by uuid, as returned by
+                         the get_<kind>s_versions() DB APIs.
+        """
+        expected = self.obj_get_expected()
+        if expected is None or self.obj_what_changed():
+            return True
+        return versions.get(self.uuid) != expected['version']
+
+    def _obj_refresh_from(self, current):
+        """Apply the fields of a newer copy of this object which differ.
+
+        The object then matches its row, so its unsaved changes are reset.
+        """
+        for field in self.fields:
+            if (self.obj_attr_is_set(field) and
+                    current.obj_attr_is_set(field) and
+                    self[field] != current[field]):
+                self[field] = current[field]
+        self.obj_reset_changes()
+
+    @classmethod
+    def _obj_refresh_many(cls, objs, db_objects):
+        """Refresh objects from their rows, see the refresh_many() methods.
+
+        The objects whose row was not loaded are left as they are.
+        """
+        if not objs:
+            return
+        currents = dict((current.uuid, current) for current in
+                        cls._from_db_objects(objs[0]._context, db_objects))
+        for obj in objs:
+            obj.obj_cache_evict()
+            current = currents.get(obj.uuid)
+            if current is not None:
+                obj._obj_refresh_from(current)
 
     def obj_reset_changes(self, fields=None):
         """Reset the list of fields that have been changed.
@@ -375,9 +882,9 @@ class MagnumObject(object):
         Note that this is NOT "revert to previous values"
         """
         if fields:
-            self._changed_fields -= set(fields)
+            self._changed_bits &= ~self._obj_changes_mask(fields)
         else:
-            self._changed_fields.clear()
+            self._changed_bits = 0
 
     def obj_attr_is_set(self, attrname):
         """Test object to see if attrname is present.
@@ -402,6 +909,7 @@ class MagnumObject(object):
 
         NOTE(danms): May be removed in the future.
         """
+        self.obj_load_lazy_fields()
         for name in self.fields.keys() + self.obj_extra_fields:
             if (hasattr(self, get_attrname(name)) or
                     name in self.obj_extra_fields):
@@ -453,9 +961,10 @@ class MagnumObject(object):
             self[key] = value
 
     def as_dict(self):
+        self.obj_load_lazy_fields()
         return dict((k, getattr(self, k))
                 for k in self.fields
-                if hasattr(self, k))
+                if self.obj_attr_is_set(k))
 
 
 class ObjectListBase(object):
@@ -475,6 +984,10 @@ class ObjectListBase(object):
     # requested of the list object.
     child_versions = {}
 
+    # The storage of the objects field is added by the metaclass of the
+    # MagnumObject this is mixed in with.
+    __slots__ = ()
+
     def __iter__(self):
         """List iterator interface."""
         return iter(self.objects)
@@ -505,22 +1018,105 @@ class ObjectListBase(object):
         """List index of value."""
         return self.objects.index(value)
 
+    @classmethod
+    def _from_objects(cls, context, objects):
+        """Returns a list object holding the given objects."""
+        obj_list = cls(context)
+        obj_list.objects = objects
+        obj_list.obj_reset_changes()
+        return obj_list
+
     def _attr_objects_to_primitive(self):
-        """Serialization of object list."""
-        return [x.obj_to_primitive() for x in self.objects]
+        """Serialization of object list.
+
+        The objects of a list usually share their name and version, which
+        are then sent once along with an array of values per field, rather
+        than an envelope per object. Lists of mixed objects are sent as a
+        list of envelopes.
+        """
+        objects = self.objects
+        if len(set((obj.obj_name(), obj.obj_version)
+                   for obj in objects)) != 1:
+            return [x.obj_to_primitive() for x in objects]
+
+        for obj in objects:
+            obj.obj_load_lazy_fields()
+        objclass = objects[0].__class__
+        columns = {}
+        unset = {}
+        for name in objclass.fields:
+            attrname = get_attrname(name)
+            handler = getattr(objclass, '_attr_%s_to_primitive' % name, None)
+            values = []
+            missing = []
+            for index, obj in enumerate(objects):
+                if not hasattr(obj, attrname):
+                    values.append(None)
+                    missing.append(index)
+                elif handler is not None:
+                    values.append(handler(obj))
+                else:
+                    values.append(getattr(obj, attrname))
+            if len(missing) == len(objects):
+                continue
+            columns[name] = values
+            if missing:
+                unset[name] = missing
+
+        primitive = {'magnum_object.name': objects[0].obj_name(),
+                     'magnum_object.namespace': 'magnum',
+                     'magnum_object.version': objects[0].obj_version,
+                     'magnum_object.count': len(objects),
+                     'magnum_object.columns': columns}
+        if unset:
+            primitive['magnum_object.unset'] = unset
+        changes = [[index, list(obj.obj_what_changed())]
+                   for index, obj in enumerate(objects)
+                   if obj.obj_what_changed()]
+        if changes:
+            primitive['magnum_object.changes'] = changes
+        return primitive
 
     def _attr_objects_from_primitive(self, value):
         """Deserialization of object list."""
-        objects = []
-        for entity in value:
-            obj = MagnumObject.obj_from_primitive(entity,
-                                                  context=self._context)
-            objects.append(obj)
+        if isinstance(value, list):
+            return [MagnumObject.obj_from_primitive(entity,
+                                                    context=self._context)
+                    for entity in value]
+
+        objname = value['magnum_object.name']
+        objver = value['magnum_object.version']
+        objclass = MagnumObject.obj_class_from_name(objname, objver)
+        objects = [objclass(self._context)
+                   for i in range(value['magnum_object.count'])]
+        unset = value.get('magnum_object.unset', {})
+        for name, values in value['magnum_object.columns'].items():
+            if name not in objclass.fields:
+                continue
+            handler = getattr(objclass, '_attr_%s_from_primitive' % name,
+                              None)
+            missing = set(unset.get(name, ()))
+            for index, (obj, val) in enumerate(zip(objects, values)):
+                if index in missing:
+                    continue
+                if handler is not None:
+                    val = handler(obj, val)
+                setattr(obj, name, val)
+        for obj in objects:
+            if objver != objclass.VERSION:
+                obj._obj_version = objver
+            obj.obj_reset_changes()
+        for index, changes in value.get('magnum_object.changes', []):
+            objects[index]._changed_bits = objclass._obj_changes_mask(changes)
         return objects
 
     def obj_make_compatible(self, primitive, target_version):
         primitives = primitive['objects']
         child_target_version = self.child_versions.get(target_version, '1.0')
+        if isinstance(primitives, dict):
+            # The objects are sent as columns sharing a single version.
+            primitives['magnum_object.version'] = child_target_version
+            return
         for index, item in enumerate(self.objects):
             self.objects[index].obj_make_compatible(
                 primitives[index]['magnum_object.data'],
@@ -528,7 +1124,7 @@ class ObjectListBase(object):
             primitives[index]['magnum_object.version'] = child_target_version
 
     def obj_what_changed(self):
-        changes = set(self._changed_fields)
+        changes = super(ObjectListBase, self).obj_what_changed()
         for child in self.objects:
             if child.obj_what_changed():
                 changes.add('objects')
@@ -561,10 +1157,18 @@ class MagnumObjectSerializer(messaging.NoOpSerializer):
             iterable = tuple
         return iterable([action_fn(context, value) for value in values])
 
+    def _process_dict(self, context, action_fn, values):
+        """Process the values of a dict, such as the kwargs of a call."""
+        return dict((key, action_fn(context, value))
+                    for key, value in values.items())
+
     def serialize_entity(self, context, entity):
         if isinstance(entity, (tuple, list, set)):
             entity = self._process_iterable(context, self.serialize_entity,
                                             entity)
+        elif isinstance(entity, dict):
+            entity = self._process_dict(context, self.serialize_entity,
+                                        entity)
         elif (hasattr(entity, 'obj_to_primitive') and
                 callable(entity.obj_to_primitive)):
             entity = entity.obj_to_primitive()
@@ -576,6 +1180,9 @@ class MagnumObjectSerializer(messaging.NoOpSerializer):
         elif isinstance(entity, (tuple, list, set)):
             entity = self._process_iterable(context, self.deserialize_entity,
                                             entity)
+        elif isinstance(entity, dict):
+            entity = self._process_dict(context, self.deserialize_entity,
+                                        entity)
         return entity
 
 
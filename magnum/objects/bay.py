@@ -22,13 +22,17 @@ from magnum.objects import utils as obj_utils
 
 class Bay(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'baymodel_id': obj_utils.str_or_none,
         'stack_id': obj_utils.str_or_none,
@@ -37,6 +41,9 @@ class Bay(base.MagnumObject):
         'node_count': obj_utils.int_or_none
     }
 
+    # The addresses of the minions are only loaded when accessed.
+    obj_lazy_fields = ('minions_address',)
+
     @staticmethod
     def _from_db_object(bay, db_bay):
         """Converts a database entity to a formal object."""
@@ -49,7 +56,13 @@ class Bay(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [Bay._from_db_object(cls(context), obj) for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return BayList._from_objects(context, objs)
+
+    @classmethod
+    def _obj_get_columns(cls, columns, uuids):
+        return cls.dbapi.get_bayinfo_list(columns=columns,
+                                         filters={'uuid': uuids})
 
     @base.remotable_classmethod
     def get(cls, context, bay_id):
@@ -66,6 +79,7 @@ class Bay(base.MagnumObject):
             raise exception.InvalidIdentity(identity=bay_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, bay_id):
         """Find a bay based on its integer id and return a Bay object.
 
@@ -77,6 +91,7 @@ class Bay(base.MagnumObject):
         return bay
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a bay based on uuid and return a :class:`Bay` object.
 
@@ -90,7 +105,8 @@ class Bay(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of Bay objects.
 
         :param context: Security context.
@@ -98,14 +114,27 @@ class Bay(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+                        Otherwise the obj_lazy_fields are loaded for the
+                        whole list the first time one is accessed.
+        :param filters: filters to apply, see the get_bay_list() DB API.
         :returns: a list of :class:`Bay` object.
 
         """
-        db_bays = cls.dbapi.get_bay_list(limit=limit,
-                                         marker=marker,
-                                         sort_key=sort_key,
-                                         sort_dir=sort_dir)
-        return Bay._from_db_object_list(db_bays, cls, context)
+        filters = cls.obj_scope_filters(context, filters)
+        lazy = columns is None
+        if lazy:
+            columns = cls.obj_eager_columns()
+        db_rows = cls.dbapi.get_bayinfo_list(columns=columns,
+                                             filters=filters,
+                                             limit=limit,
+                                             marker=marker,
+                                             sort_key=sort_key,
+                                             sort_dir=sort_dir)
+        return BayList._from_objects(
+            context, cls._from_db_columns_list(context, columns, db_rows,
+                                               lazy=lazy))
 
     @base.remotable
     def create(self, context=None):
@@ -119,6 +148,7 @@ class Bay(base.MagnumObject):
                         object, e.g.: Bay(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_bay = self.dbapi.create_bay(values)
         self._from_db_object(self, db_bay)
@@ -134,6 +164,7 @@ class Bay(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Bay(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_bay(self.uuid)
         self.obj_reset_changes()
 
@@ -151,8 +182,12 @@ class Bay(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Bay(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_bay(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_bay = self.dbapi.update_bay(self.uuid, updates, expected=expected)
+        self.updated_at = db_bay.updated_at
+        self.version = db_bay.version
 
         self.obj_reset_changes()
 
@@ -163,6 +198,8 @@ class Bay(base.MagnumObject):
         Loads a bay with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded bay column by column, if there are any updates.
+        Only the version is read when the bay has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -171,8 +208,36 @@ class Bay(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Bay(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_bays_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, bays):
+        """Loads updates for many Bays.
+
+        The versions of all the bays are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param bays: the :class:`Bay` objects to refresh.
+        """
+        versions = cls.dbapi.get_bays_versions(
+            [obj.uuid for obj in bays])
+        stale = [obj for obj in bays if obj.obj_is_stale(versions)]
+        if stale:
+            db_bays = cls.dbapi.get_bay_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_bays)
+
+
+class BayList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
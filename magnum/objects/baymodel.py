@@ -22,13 +22,17 @@ from magnum.objects import utils as obj_utils
 
 class BayModel(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'image_id': obj_utils.str_or_none,
         'flavor_id': obj_utils.str_or_none,
@@ -49,8 +53,8 @@ class BayModel(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [BayModel._from_db_object(cls(context), obj) for obj in
-                db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return BayModelList._from_objects(context, objs)
 
     @base.remotable_classmethod
     def get(cls, context, baymodel_id):
@@ -67,6 +71,7 @@ class BayModel(base.MagnumObject):
             raise exception.InvalidIdentity(identity=baymodel_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, baymodel_id):
         """Find a baymodel based on its integer id and return a BayModel object.
 
@@ -78,6 +83,7 @@ class BayModel(base.MagnumObject):
         return baymodel
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a baymodel based on uuid and return a :class:`BayModel` object.
 
@@ -91,7 +97,8 @@ class BayModel(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of BayModel objects.
 
         :param context: Security context.
@@ -99,10 +106,25 @@ class BayModel(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+        :param filters: filters to apply, see the get_baymodel_list() DB API.
         :returns: a list of :class:`BayModel` object.
 
         """
-        db_baymodels = cls.dbapi.get_baymodel_list(limit=limit,
+        filters = cls.obj_scope_filters(context, filters)
+        if columns is not None:
+            db_rows = cls.dbapi.get_baymodelinfo_list(columns=columns,
+                                                      filters=filters,
+                                                      limit=limit,
+                                                      marker=marker,
+                                                      sort_key=sort_key,
+                                                      sort_dir=sort_dir)
+            return BayModelList._from_objects(
+                context, cls._from_db_columns_list(context, columns, db_rows))
+
+        db_baymodels = cls.dbapi.get_baymodel_list(filters=filters,
+                                                   limit=limit,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir)
@@ -120,6 +142,7 @@ class BayModel(base.MagnumObject):
                         object, e.g.: BayModel(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_baymodel = self.dbapi.create_baymodel(values)
         self._from_db_object(self, db_baymodel)
@@ -135,6 +158,7 @@ class BayModel(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: BayModel(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_baymodel(self.uuid)
         self.obj_reset_changes()
 
@@ -152,8 +176,13 @@ class BayModel(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: BayModel(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_baymodel(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_baymodel = self.dbapi.update_baymodel(self.uuid, updates,
+                                                 expected=expected)
+        self.updated_at = db_baymodel.updated_at
+        self.version = db_baymodel.version
 
         self.obj_reset_changes()
 
@@ -164,6 +193,8 @@ class BayModel(base.MagnumObject):
         Loads a baymodel with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded baymodel column by column, if there are any updates.
+        Only the version is read when the baymodel has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -172,8 +203,36 @@ class BayModel(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: BayModel(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_baymodels_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, baymodels):
+        """Loads updates for many BayModels.
+
+        The versions of all the baymodels are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param baymodels: the :class:`BayModel` objects to refresh.
+        """
+        versions = cls.dbapi.get_baymodels_versions(
+            [obj.uuid for obj in baymodels])
+        stale = [obj for obj in baymodels if obj.obj_is_stale(versions)]
+        if stale:
+            db_baymodels = cls.dbapi.get_baymodel_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_baymodels)
+
+
+class BayModelList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
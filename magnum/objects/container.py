@@ -22,15 +22,21 @@ from magnum.objects import utils as obj_utils
 
 class Container(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add status
+    # Version 1.2: Add project_id and user_id
+    # Version 1.3: Add version
+    VERSION = '1.3'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'image_id': obj_utils.str_or_none,
+        'status': obj_utils.str_or_none,
     }
 
     @staticmethod
@@ -45,8 +51,8 @@ class Container(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [Container._from_db_object(cls(context), obj)
-                for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return ContainerList._from_objects(context, objs)
 
     @base.remotable_classmethod
     def get(cls, context, container_id):
@@ -63,6 +69,7 @@ class Container(base.MagnumObject):
             raise exception.InvalidIdentity(identity=container_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, container_id):
         """Find a container based on its integer id and return a Container object.
 
@@ -74,6 +81,7 @@ class Container(base.MagnumObject):
         return container
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a container based on uuid and return a :class:`Container` object.
 
@@ -87,7 +95,8 @@ class Container(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of Container objects.
 
         :param context: Security context.
@@ -95,10 +104,25 @@ class Container(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+        :param filters: filters to apply, see the get_container_list() DB API.
         :returns: a list of :class:`Container` object.
 
         """
-        db_containers = cls.dbapi.get_container_list(limit=limit,
+        filters = cls.obj_scope_filters(context, filters)
+        if columns is not None:
+            db_rows = cls.dbapi.get_containerinfo_list(columns=columns,
+                                                       filters=filters,
+                                                       limit=limit,
+                                                       marker=marker,
+                                                       sort_key=sort_key,
+                                                       sort_dir=sort_dir)
+            return ContainerList._from_objects(
+                context, cls._from_db_columns_list(context, columns, db_rows))
+
+        db_containers = cls.dbapi.get_container_list(filters=filters,
+                                                     limit=limit,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir)
@@ -116,6 +140,7 @@ class Container(base.MagnumObject):
                         object, e.g.: Container(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_container = self.dbapi.create_container(values)
         self._from_db_object(self, db_container)
@@ -131,6 +156,7 @@ class Container(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Container(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_container(self.uuid)
         self.obj_reset_changes()
 
@@ -148,8 +174,13 @@ class Container(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Container(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_container(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_container = self.dbapi.update_container(self.uuid, updates,
+                                                   expected=expected)
+        self.updated_at = db_container.updated_at
+        self.version = db_container.version
 
         self.obj_reset_changes()
 
@@ -160,6 +191,8 @@ class Container(base.MagnumObject):
         Loads a container with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded container column by column, if there are any updates.
+        Only the version is read when the container has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -168,8 +201,36 @@ class Container(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Container(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_containers_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, containers):
+        """Loads updates for many Containers.
+
+        The versions of all the containers are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param containers: the :class:`Container` objects to refresh.
+        """
+        versions = cls.dbapi.get_containers_versions(
+            [obj.uuid for obj in containers])
+        stale = [obj for obj in containers if obj.obj_is_stale(versions)]
+        if stale:
+            db_containers = cls.dbapi.get_container_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_containers)
+
+
+class ContainerList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.3',
+    }
@@ -22,13 +22,17 @@ from magnum.objects import utils as obj_utils
 
 class Node(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'type': obj_utils.str_or_none,
         'image_id': obj_utils.str_or_none,
         'ironic_node_id': obj_utils.str_or_none
@@ -46,7 +50,8 @@ class Node(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [Node._from_db_object(cls(context), obj) for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return NodeList._from_objects(context, objs)
 
     @base.remotable_classmethod
     def get(cls, context, node_id):
@@ -63,6 +68,7 @@ class Node(base.MagnumObject):
             raise exception.InvalidIdentity(identity=node_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, node_id):
         """Find a node based on its integer id and return a Node object.
 
@@ -74,6 +80,7 @@ class Node(base.MagnumObject):
         return node
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a node based on uuid and return a :class:`Node` object.
 
@@ -87,7 +94,8 @@ class Node(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of Node objects.
 
         :param context: Security context.
@@ -95,10 +103,25 @@ class Node(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+        :param filters: filters to apply, see the get_node_list() DB API.
         :returns: a list of :class:`Node` object.
 
         """
-        db_nodes = cls.dbapi.get_node_list(limit=limit,
+        filters = cls.obj_scope_filters(context, filters)
+        if columns is not None:
+            db_rows = cls.dbapi.get_nodeinfo_list(columns=columns,
+                                                  filters=filters,
+                                                  limit=limit,
+                                                  marker=marker,
+                                                  sort_key=sort_key,
+                                                  sort_dir=sort_dir)
+            return NodeList._from_objects(
+                context, cls._from_db_columns_list(context, columns, db_rows))
+
+        db_nodes = cls.dbapi.get_node_list(filters=filters,
+                                           limit=limit,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir)
@@ -116,6 +139,7 @@ class Node(base.MagnumObject):
                         object, e.g.: Node(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_node = self.dbapi.create_node(values)
         self._from_db_object(self, db_node)
@@ -131,6 +155,7 @@ class Node(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Node(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_node(self.uuid)
         self.obj_reset_changes()
 
@@ -148,8 +173,12 @@ class Node(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Node(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_node(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_node = self.dbapi.update_node(self.uuid, updates, expected=expected)
+        self.updated_at = db_node.updated_at
+        self.version = db_node.version
 
         self.obj_reset_changes()
 
@@ -160,6 +189,8 @@ class Node(base.MagnumObject):
         Loads a node with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded node column by column, if there are any updates.
+        Only the version is read when the node has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -168,8 +199,36 @@ class Node(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Node(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_nodes_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, nodes):
+        """Loads updates for many Nodes.
+
+        The versions of all the nodes are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param nodes: the :class:`Node` objects to refresh.
+        """
+        versions = cls.dbapi.get_nodes_versions(
+            [obj.uuid for obj in nodes])
+        stale = [obj for obj in nodes if obj.obj_is_stale(versions)]
+        if stale:
+            db_nodes = cls.dbapi.get_node_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_nodes)
+
+
+class NodeList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
@@ -22,13 +22,17 @@ from magnum.objects import utils as obj_utils
 
 class Pod(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'desc': obj_utils.str_or_none,
         'bay_uuid': obj_utils.str_or_none,
@@ -38,6 +42,12 @@ class Pod(base.MagnumObject):
         'pod_definition_url': obj_utils.str_or_none,
     }
 
+    # pod_definition_url is only used to create the pod
+    obj_non_db_fields = ('pod_definition_url',)
+
+    # The JSON columns of the pods are only loaded when accessed.
+    obj_lazy_fields = ('images', 'labels')
+
     @staticmethod
     def _from_db_object(pod, db_pod):
         """Converts a database entity to a formal object."""
@@ -53,7 +63,13 @@ class Pod(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [Pod._from_db_object(cls(context), obj) for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return PodList._from_objects(context, objs)
+
+    @classmethod
+    def _obj_get_columns(cls, columns, uuids):
+        return cls.dbapi.get_podinfo_list(columns=columns,
+                                         filters={'uuid': uuids})
 
     @base.remotable_classmethod
     def get(cls, context, pod_id):
@@ -70,6 +86,7 @@ class Pod(base.MagnumObject):
             raise exception.InvalidIdentity(identity=pod_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, pod_id):
         """Find a pod based on its integer id and return a Pod object.
 
@@ -81,6 +98,7 @@ class Pod(base.MagnumObject):
         return pod
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a pod based on uuid and return a :class:`Pod` object.
 
@@ -117,7 +135,8 @@ class Pod(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of Pod objects.
 
         :param context: Security context.
@@ -125,14 +144,27 @@ class Pod(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+                        Otherwise the obj_lazy_fields are loaded for the
+                        whole list the first time one is accessed.
+        :param filters: filters to apply, see the get_pod_list() DB API.
         :returns: a list of :class:`Pod` object.
 
         """
-        db_pods = cls.dbapi.get_pod_list(limit=limit,
-                                         marker=marker,
-                                         sort_key=sort_key,
-                                         sort_dir=sort_dir)
-        return Pod._from_db_object_list(db_pods, cls, context)
+        filters = cls.obj_scope_filters(context, filters)
+        lazy = columns is None
+        if lazy:
+            columns = cls.obj_eager_columns()
+        db_rows = cls.dbapi.get_podinfo_list(columns=columns,
+                                             filters=filters,
+                                             limit=limit,
+                                             marker=marker,
+                                             sort_key=sort_key,
+                                             sort_dir=sort_dir)
+        return PodList._from_objects(
+            context, cls._from_db_columns_list(context, columns, db_rows,
+                                               lazy=lazy))
 
     @base.remotable
     def create(self, context=None):
@@ -146,6 +178,7 @@ class Pod(base.MagnumObject):
                         object, e.g.: Pod(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_pod = self.dbapi.create_pod(values)
         self._from_db_object(self, db_pod)
@@ -161,6 +194,7 @@ class Pod(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Pod(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_pod(self.uuid)
         self.obj_reset_changes()
 
@@ -178,8 +212,12 @@ class Pod(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Pod(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_pod(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_pod = self.dbapi.update_pod(self.uuid, updates, expected=expected)
+        self.updated_at = db_pod.updated_at
+        self.version = db_pod.version
 
         self.obj_reset_changes()
 
@@ -190,6 +228,8 @@ class Pod(base.MagnumObject):
         Loads a pod with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded pod column by column, if there are any updates.
+        Only the version is read when the pod has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -198,8 +238,36 @@ class Pod(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Pod(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_pods_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, pods):
+        """Loads updates for many Pods.
+
+        The versions of all the pods are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param pods: the :class:`Pod` objects to refresh.
+        """
+        versions = cls.dbapi.get_pods_versions(
+            [obj.uuid for obj in pods])
+        stale = [obj for obj in pods if obj.obj_is_stale(versions)]
+        if stale:
+            db_pods = cls.dbapi.get_pod_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_pods)
+
+
+class PodList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
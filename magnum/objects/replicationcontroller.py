@@ -21,13 +21,17 @@ from magnum.objects import utils as obj_utils
 
 class ReplicationController(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'images': obj_utils.list_or_none,
         'bay_uuid': obj_utils.str_or_none,
@@ -36,6 +40,9 @@ class ReplicationController(base.MagnumObject):
         'rc_definition_url': obj_utils.str_or_none,
     }
 
+    # rc_definition_url is only used to create the rc
+    obj_non_db_fields = ('rc_definition_url',)
+
     @staticmethod
     def _from_db_object(rc, db_rc):
         """Converts a database entity to a formal object."""
@@ -51,8 +58,8 @@ class ReplicationController(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [ReplicationController._from_db_object(cls(context),
-                                                    obj) for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return ReplicationControllerList._from_objects(context, objs)
 
     @base.remotable_classmethod
     def get(cls, context, rc_id):
@@ -70,6 +77,7 @@ class ReplicationController(base.MagnumObject):
             raise exception.InvalidIdentity(identity=rc_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, rc_id):
         """Find a ReplicationController based on its integer id and return a
         ReplicationController object.
@@ -82,6 +90,7 @@ class ReplicationController(base.MagnumObject):
         return rc
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a ReplicationController based on uuid and return
         a :class:`ReplicationController` object.
@@ -109,7 +118,8 @@ class ReplicationController(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of ReplicationController objects.
 
         :param context: Security context.
@@ -117,10 +127,25 @@ class ReplicationController(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+        :param filters: filters to apply, see the get_rc_list() DB API.
         :returns: a list of :class:`ReplicationController` object.
 
         """
-        db_rcs = cls.dbapi.get_rc_list(limit=limit,
+        filters = cls.obj_scope_filters(context, filters)
+        if columns is not None:
+            db_rows = cls.dbapi.get_rcinfo_list(columns=columns,
+                                                filters=filters,
+                                                limit=limit,
+                                                marker=marker,
+                                                sort_key=sort_key,
+                                                sort_dir=sort_dir)
+            return ReplicationControllerList._from_objects(
+                context, cls._from_db_columns_list(context, columns, db_rows))
+
+        db_rcs = cls.dbapi.get_rc_list(filters=filters,
+                                       limit=limit,
                                        marker=marker,
                                        sort_key=sort_key,
                                        sort_dir=sort_dir)
@@ -138,6 +163,7 @@ class ReplicationController(base.MagnumObject):
                         object, e.g.: ReplicationController(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_rc = self.dbapi.create_rc(values)
         self._from_db_object(self, db_rc)
@@ -153,6 +179,7 @@ class ReplicationController(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: ReplicationController(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_rc(self.uuid)
         self.obj_reset_changes()
 
@@ -170,8 +197,12 @@ class ReplicationController(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: ReplicationController(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_rc(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_rc = self.dbapi.update_rc(self.uuid, updates, expected=expected)
+        self.updated_at = db_rc.updated_at
+        self.version = db_rc.version
 
         self.obj_reset_changes()
 
@@ -182,6 +213,8 @@ class ReplicationController(base.MagnumObject):
         Loads a rc with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded rc column by column, if there are any updates.
+        Only the version is read when the rc has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -190,8 +223,36 @@ class ReplicationController(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: ReplicationController(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_rcs_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, rcs):
+        """Loads updates for many ReplicationControllers.
+
+        The versions of all the rcs are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param rcs: the :class:`ReplicationController` objects to refresh.
+        """
+        versions = cls.dbapi.get_rcs_versions(
+            [obj.uuid for obj in rcs])
+        stale = [obj for obj in rcs if obj.obj_is_stale(versions)]
+        if stale:
+            db_rcs = cls.dbapi.get_rc_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_rcs)
+
+
+class ReplicationControllerList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
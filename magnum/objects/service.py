@@ -22,13 +22,17 @@ from magnum.objects import utils as obj_utils
 
 class Service(base.MagnumObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add project_id and user_id
+    # Version 1.2: Add version
+    VERSION = '1.2'
 
     dbapi = dbapi.get_instance()
 
     fields = {
         'id': int,
         'uuid': obj_utils.str_or_none,
+        'project_id': obj_utils.str_or_none,
+        'user_id': obj_utils.str_or_none,
         'name': obj_utils.str_or_none,
         'bay_uuid': obj_utils.str_or_none,
         'labels': obj_utils.dict_or_none,
@@ -38,6 +42,9 @@ class Service(base.MagnumObject):
         'service_definition_url': obj_utils.str_or_none,
     }
 
+    # service_definition_url is only used to create the service
+    obj_non_db_fields = ('service_definition_url',)
+
     @staticmethod
     def _from_db_object(service, db_service):
         """Converts a database entity to a formal object."""
@@ -53,8 +60,8 @@ class Service(base.MagnumObject):
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
         """Converts a list of database entities to a list of formal objects."""
-        return [Service._from_db_object(cls(context), obj)
-                for obj in db_objects]
+        objs = cls._from_db_objects(context, db_objects)
+        return ServiceList._from_objects(context, objs)
 
     @base.remotable_classmethod
     def get(cls, context, service_id):
@@ -71,6 +78,7 @@ class Service(base.MagnumObject):
             raise exception.InvalidIdentity(identity=service_id)
 
     @base.remotable_classmethod
+    @base.identity_mapped('id')
     def get_by_id(cls, context, service_id):
         """Find a service based on its integer id and return a Service object.
 
@@ -82,6 +90,7 @@ class Service(base.MagnumObject):
         return service
 
     @base.remotable_classmethod
+    @base.identity_mapped('uuid')
     def get_by_uuid(cls, context, uuid):
         """Find a service based on uuid and return a :class:`Service` object.
 
@@ -106,7 +115,8 @@ class Service(base.MagnumObject):
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None):
+             sort_key=None, sort_dir=None, columns=None,
+             filters=None):
         """Return a list of Service objects.
 
         :param context: Security context.
@@ -114,10 +124,25 @@ class Service(base.MagnumObject):
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: if given, only these columns are loaded and only
+                        the matching fields of the objects are set.
+        :param filters: filters to apply, see the get_service_list() DB API.
         :returns: a list of :class:`Service` object.
 
         """
-        db_services = cls.dbapi.get_service_list(limit=limit,
+        filters = cls.obj_scope_filters(context, filters)
+        if columns is not None:
+            db_rows = cls.dbapi.get_serviceinfo_list(columns=columns,
+                                                     filters=filters,
+                                                     limit=limit,
+                                                     marker=marker,
+                                                     sort_key=sort_key,
+                                                     sort_dir=sort_dir)
+            return ServiceList._from_objects(
+                context, cls._from_db_columns_list(context, columns, db_rows))
+
+        db_services = cls.dbapi.get_service_list(filters=filters,
+                                                 limit=limit,
                                                  marker=marker,
                                                  sort_key=sort_key,
                                                  sort_dir=sort_dir)
@@ -135,6 +160,7 @@ class Service(base.MagnumObject):
                         object, e.g.: Service(context)
 
         """
+        self.obj_set_owner()
         values = self.obj_get_changes()
         db_service = self.dbapi.create_service(values)
         self._from_db_object(self, db_service)
@@ -150,6 +176,7 @@ class Service(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Service(context)
         """
+        self.obj_cache_evict()
         self.dbapi.destroy_service(self.uuid)
         self.obj_reset_changes()
 
@@ -167,8 +194,13 @@ class Service(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Service(context)
         """
+        self.obj_cache_evict()
         updates = self.obj_get_changes()
-        self.dbapi.update_service(self.uuid, updates)
+        expected = self.obj_get_expected()
+        db_service = self.dbapi.update_service(self.uuid, updates,
+                                               expected=expected)
+        self.updated_at = db_service.updated_at
+        self.version = db_service.version
 
         self.obj_reset_changes()
 
@@ -179,6 +211,8 @@ class Service(base.MagnumObject):
         Loads a service with the same uuid from the database and
         checks for updated attributes. Updates are applied from
         the loaded service column by column, if there are any updates.
+        Only the version is read when the service has no unsaved
+        changes and was not updated since it was loaded.
 
         :param context: Security context. NOTE: This should only
                         be used internally by the indirection_api.
@@ -187,8 +221,36 @@ class Service(base.MagnumObject):
                         A context should be set when instantiating the
                         object, e.g.: Service(context)
         """
+        self.obj_cache_evict()
+        versions = self.dbapi.get_services_versions([self.uuid])
+        if not self.obj_is_stale(versions):
+            return
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
-        for field in self.fields:
-            if (hasattr(self, base.get_attrname(field)) and
-                    self[field] != current[field]):
-                self[field] = current[field]
+        self._obj_refresh_from(current)
+
+    @classmethod
+    def refresh_many(cls, services):
+        """Loads updates for many Services.
+
+        The versions of all the services are read in one query, and the
+        rows of those which were updated, or have unsaved changes, in
+        another.
+
+        :param services: the :class:`Service` objects to refresh.
+        """
+        versions = cls.dbapi.get_services_versions(
+            [obj.uuid for obj in services])
+        stale = [obj for obj in services if obj.obj_is_stale(versions)]
+        if stale:
+            db_services = cls.dbapi.get_service_list(
+                filters={'uuid': [obj.uuid for obj in stale]})
+            cls._obj_refresh_many(stale, db_services)
+
+
+class ServiceList(base.ObjectListBase, base.MagnumObject):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    child_versions = {
+        '1.0': '1.2',
+    }
@@ -111,7 +111,9 @@ def dt_serializer(name):
     """Return a datetime serializer for a named attribute."""
     def serializer(self, name=name):
         if getattr(self, name) is not None:
-            return timeutils.isotime(getattr(self, name))
+            # The microseconds are kept, so that an object received over
+            # RPC has the same timestamps as the one which was sent.
+            return timeutils.isotime(getattr(self, name), subsecond=True)
         else:
             return None
     return serializer
@@ -9,8 +9,10 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+from magnum.common import utils
 from magnum.conductor import api
 from magnum.tests.db import base as db_base
+from magnum.tests.db import utils as db_utils
 
 from mock import patch
 
@@ -71,3 +73,66 @@ class TestPodController(db_base.DbTestCase):
             self.assertEqual(response.status_int, 200)
             c = response.json['pods']
             self.assertEqual(0, len(c))
+
+    def test_get_all_with_fields(self):
+        pod = db_utils.create_test_pod()
+        response = self.app.get('/v1/pods?fields=name,status')
+        self.assertEqual(response.status_int, 200)
+        c = response.json['pods'][0]
+        self.assertEqual(pod.uuid, c.get('uuid'))
+        self.assertEqual(pod.name, c.get('name'))
+        self.assertEqual(pod.status, c.get('status'))
+        self.assertNotIn('labels', c)
+        self.assertNotIn('images', c)
+
+    def test_get_all_with_invalid_fields(self):
+        response = self.app.get('/v1/pods?fields=name,bogus',
+                                expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+    def test_get_all_with_filters(self):
+        pod = db_utils.create_test_pod(name='web-1', status='Running',
+                                       labels={'app': 'web'})
+        db_utils.create_test_pod(id=2, uuid=utils.generate_uuid(),
+                                 name='db-1', status='Running',
+                                 labels={'app': 'db'})
+        response = self.app.get('/v1/pods?name_prefix=web&status=Running')
+        self.assertEqual([pod.uuid],
+                         [p['uuid'] for p in response.json['pods']])
+        response = self.app.get('/v1/pods/detail?labels=app=web')
+        self.assertEqual([pod.uuid],
+                         [p['uuid'] for p in response.json['pods']])
+
+    def test_get_all_scoped_to_project(self):
+        pod = db_utils.create_test_pod()
+        db_utils.create_test_pod(id=2, uuid=utils.generate_uuid(),
+                                 project_id='other-project')
+        response = self.app.get('/v1/pods')
+        self.assertEqual([pod.uuid],
+                         [p['uuid'] for p in response.json['pods']])
+
+    def test_get_all_filters_in_next_link(self):
+        for id_ in range(1, 4):
+            db_utils.create_test_pod(id=id_, uuid=utils.generate_uuid(),
+                                     status='Running')
+        response = self.app.get('/v1/pods/?limit=2&status=Running')
+        self.assertEqual(2, len(response.json['pods']))
+        self.assertIn('status=Running', response.json['next'])
+
+    def test_get_all_label_selector_in_next_link(self):
+        for id_ in range(1, 4):
+            db_utils.create_test_pod(id=id_, uuid=utils.generate_uuid(),
+                                     labels={'app': 'web', 'tier': 'db'})
+        response = self.app.get('/v1/pods/?limit=2&labels=app%3Dweb'
+                                '%2Ctier%3Ddb')
+        self.assertEqual(2, len(response.json['pods']))
+        next_link = response.json['next']
+        self.assertIn('labels=app%3Dweb%2Ctier%3Ddb', next_link)
+
+        response = self.app.get('/v1' + next_link.split('/v1', 1)[1])
+        self.assertEqual(1, len(response.json['pods']))
+
+    def test_get_all_with_invalid_label_selector(self):
+        response = self.app.get('/v1/pods?labels=app',
+                                expect_errors=True)
+        self.assertEqual(response.status_int, 400)
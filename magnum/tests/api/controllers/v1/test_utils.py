@@ -13,9 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
+import six
 import wsme
 
 from magnum.api.controllers.v1 import utils
+from magnum import objects
 from magnum.tests.api import base
 
 from oslo.config import cfg
@@ -47,3 +51,47 @@ class TestApiUtils(base.FunctionalTest):
         self.assertRaises(wsme.exc.ClientSideError,
                           utils.validate_sort_dir,
                           'fake-sort')
+
+    def test_validate_fields(self):
+        self.assertIsNone(utils.validate_fields(None, ['uuid', 'name']))
+        self.assertEqual(['uuid', 'name'],
+                         utils.validate_fields('name', ['uuid', 'name']))
+        self.assertEqual(['uuid', 'created_at'],
+                         utils.validate_fields('uuid,created_at', ['uuid']))
+        self.assertRaises(wsme.exc.ClientSideError,
+                          utils.validate_fields, 'name,foo', ['name'])
+
+    def test_get_list_columns(self):
+        self.assertEqual(['id', 'uuid', 'name', 'created_at'],
+                         utils.get_list_columns(objects.Pod,
+                                                ['uuid', 'name', 'type'],
+                                                'created_at'))
+
+    def test_encode_decode_marker(self):
+        obj = {'id': 42, 'name': 'pod1'}
+        marker = utils.encode_marker(obj, 'name')
+        self.assertEqual({'name': 'pod1', 'id': 42},
+                         utils.decode_marker(marker, 'name'))
+
+    def test_encode_decode_marker_unicode(self):
+        obj = {'id': 42, 'name': u'pod-\u00e9'}
+        marker = utils.encode_marker(obj, 'name')
+        self.assertIsInstance(marker, six.text_type)
+        self.assertEqual({'name': u'pod-\u00e9', 'id': 42},
+                         utils.decode_marker(marker, 'name'))
+
+    def test_encode_decode_marker_datetime(self):
+        created_at = datetime.datetime(2015, 2, 3, 10, 11, 12, 1234)
+        marker = utils.encode_marker({'id': 42, 'created_at': created_at},
+                                     'created_at')
+        self.assertEqual({'created_at': created_at, 'id': 42},
+                         utils.decode_marker(marker, 'created_at'))
+
+    def test_decode_marker_other_sort_key(self):
+        marker = utils.encode_marker({'id': 42, 'name': 'pod1'}, 'name')
+        self.assertRaises(wsme.exc.ClientSideError,
+                          utils.decode_marker, marker, 'id')
+
+    def test_decode_marker_invalid(self):
+        self.assertRaises(wsme.exc.ClientSideError,
+                          utils.decode_marker, 'not-a-marker', 'id')
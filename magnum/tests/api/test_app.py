@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+from oslo.config import cfg
+
 from magnum.api import app as api_app
 from magnum.api import config as api_config
 from magnum.api import hooks
@@ -31,3 +34,22 @@ class TestAppConfig(base.BaseTestCase):
         self.assertEqual(config_d['modules'], api_config.app['modules'])
         self.assertEqual(config_d['root'], api_config.app['root'])
         self.assertIsInstance(config_d['hooks'][0], hooks.ContextHook)
+
+    @mock.patch('magnum.api.auth.install')
+    @mock.patch('pecan.make_app')
+    def test_setup_app_db_request_hook(self, mock_make_app, mock_install):
+        api_app.setup_app()
+        hooks_ = mock_make_app.call_args[1]['hooks']
+        self.assertTrue(any(isinstance(hook, hooks.DBRequestHook)
+                            for hook in hooks_))
+
+    @mock.patch('magnum.api.auth.install')
+    @mock.patch('pecan.make_app')
+    def test_setup_app_use_conductor(self, mock_make_app, mock_install):
+        cfg.CONF.set_override('use_conductor', True, group='api')
+        api_app.setup_app()
+        hooks_ = mock_make_app.call_args[1]['hooks']
+        self.assertFalse(any(isinstance(hook, hooks.DBRequestHook)
+                             for hook in hooks_))
+        self.assertTrue(any(isinstance(hook, hooks.LastWriteHook)
+                            for hook in hooks_))
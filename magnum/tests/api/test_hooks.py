@@ -46,6 +46,14 @@ class TestHooks(base.BaseTestCase):
         self.assertEqual(ctx.domain_id,
                          fakes.fakeAuthTokenHeaders['X-User-Domain-Id'])
         self.assertIsNone(ctx.auth_token_info)
+        self.assertTrue(ctx.is_admin)
+
+    def test_context_hook_before_method_not_admin(self):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.headers = dict(fakes.fakeAuthTokenHeaders)
+        state.request.headers['X-Roles'] = u'_member_, adminish'
+        hooks.ContextHook().before(state)
+        self.assertFalse(state.request.context.is_admin)
 
     def test_context_hook_before_method_auth_info(self):
         state = mock.Mock(request=fakes.FakePecanRequest())
@@ -57,3 +65,70 @@ class TestHooks(base.BaseTestCase):
         self.assertEqual(fakes.fakeAuthTokenHeaders['X-Auth-Token'],
                          ctx.auth_token)
         self.assertEqual('assert_this', ctx.auth_token_info)
+
+    @mock.patch('magnum.db.api.get_instance')
+    def test_db_request_hook_read_only(self, mock_get_instance):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.method = 'GET'
+        state.response.status_int = 200
+        state.response.headers = {}
+        dbapi = mock_get_instance.return_value
+        dbapi.end_request.return_value = None
+        hook = hooks.DBRequestHook()
+        hook.before(state)
+        hook.after(state)
+        dbapi.begin_request.assert_called_once_with(read_only=True,
+                                                    transaction=True,
+                                                    last_write=None)
+        dbapi.end_request.assert_called_once_with(commit=True)
+        self.assertNotIn('X-Magnum-Last-Write', state.response.headers)
+
+    @mock.patch('magnum.db.api.get_instance')
+    def test_db_request_hook_error(self, mock_get_instance):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.method = 'POST'
+        state.response.status_int = 400
+        dbapi = mock_get_instance.return_value
+        dbapi.end_request.return_value = None
+        hook = hooks.DBRequestHook()
+        hook.before(state)
+        hook.after(state)
+        dbapi.begin_request.assert_called_once_with(read_only=False,
+                                                    transaction=False,
+                                                    last_write=None)
+        dbapi.end_request.assert_called_once_with(commit=False)
+
+    @mock.patch('magnum.db.api.get_instance')
+    def test_db_request_hook_last_write(self, mock_get_instance):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.headers = dict(fakes.fakeAuthTokenHeaders)
+        state.request.headers['X-Magnum-Last-Write'] = '1420070400.5'
+        state.request.method = 'GET'
+        state.response.status_int = 200
+        state.response.headers = {}
+        dbapi = mock_get_instance.return_value
+        dbapi.end_request.return_value = 1420070400.5
+        hooks.ContextHook().before(state)
+        hook = hooks.DBRequestHook()
+        hook.before(state)
+        hook.after(state)
+        dbapi.begin_request.assert_called_once_with(read_only=True,
+                                                    transaction=True,
+                                                    last_write=1420070400.5)
+        self.assertEqual('1420070400.500000',
+                         state.response.headers['X-Magnum-Last-Write'])
+
+    def test_last_write_hook(self):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.context = mock.Mock(last_write=1420070400.5)
+        state.response.headers = {}
+        hooks.LastWriteHook().after(state)
+        self.assertEqual('1420070400.500000',
+                         state.response.headers['X-Magnum-Last-Write'])
+
+    def test_last_write_hook_no_write(self):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        state.request.context = mock.Mock(last_write=None)
+        state.response.headers = {}
+        hooks.LastWriteHook().after(state)
+        self.assertNotIn('X-Magnum-Last-Write', state.response.headers)
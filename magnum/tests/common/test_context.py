@@ -51,5 +51,10 @@ class ContextTestCase(base.TestCase):
         self.assertIsNotNone(ctx.tenant)
         ctx2 = context.RequestContext.from_dict(ctx.to_dict())
         self.assertTrue(ctx2.is_admin)
-        self.assertIsNone(ctx2.user)
-        self.assertIsNone(ctx2.tenant)
\ No newline at end of file
+        self.assertEqual('foo', ctx2.user)
+        self.assertEqual('foo', ctx2.tenant)
+
+    def test_to_dict_from_dict_last_write(self):
+        ctx = context.RequestContext(last_write=1420070400.5)
+        ctx2 = context.RequestContext.from_dict(ctx.to_dict())
+        self.assertEqual(1420070400.5, ctx2.last_write)
@@ -0,0 +1,98 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+
+import mock
+from mock import patch
+
+from magnum.common import exception
+from magnum.conductor.handlers.common import docker_events
+from magnum.tests import base
+
+CONTAINER_UUID = 'ea8e2a25-2901-438d-8157-de7ffd68d051'
+
+
+class TestDockerEventsConsumer(base.BaseTestCase):
+    def setUp(self):
+        super(TestDockerEventsConsumer, self).setUp()
+        self.docker_ids = {}
+        self.consumer = docker_events.DockerEventsConsumer(
+            'unix:///var/run/docker.sock', docker_ids=self.docker_ids)
+        self.consumer._docker = mock.MagicMock()
+        self.consumer._docker.inspect_container.return_value = {
+            'Id': 'docker-id',
+            'Config': {'Hostname': CONTAINER_UUID},
+            'State': {'Running': True, 'Paused': False}}
+
+    @patch('magnum.objects.Container.get_by_uuid')
+    def test_process_event_unknown_container(self, mock_get_by_uuid):
+        container = mock.MagicMock(status='Stopped')
+        mock_get_by_uuid.return_value = container
+
+        self.consumer.process_event(json.dumps({'status': 'start',
+                                                'id': 'docker-id'}))
+
+        self.consumer._docker.inspect_container.assert_called_once_with(
+            'docker-id')
+        self.assertEqual({CONTAINER_UUID: 'docker-id'}, self.docker_ids)
+        self.assertEqual('Running', container.status)
+        container.save.assert_called_once_with()
+
+    @patch('magnum.objects.Container.get_by_uuid')
+    def test_process_event_known_container(self, mock_get_by_uuid):
+        container = mock.MagicMock(status='Running')
+        mock_get_by_uuid.return_value = container
+        self.consumer._record(self.consumer.docker.inspect_container())
+        self.consumer._docker.reset_mock()
+
+        self.consumer.process_event({'status': 'pause', 'id': 'docker-id'})
+
+        self.assertFalse(self.consumer._docker.inspect_container.called)
+        self.assertEqual('Paused', container.status)
+        container.save.assert_called_once_with()
+
+    @patch('magnum.objects.Container.get_by_uuid')
+    def test_process_event_concurrent_update(self, mock_get_by_uuid):
+        container = mock.MagicMock(status='Running')
+        container.save.side_effect = [
+            exception.ConcurrentUpdate(resource='container',
+                                       id=CONTAINER_UUID), None]
+        mock_get_by_uuid.return_value = container
+        self.consumer._record(self.consumer.docker.inspect_container())
+
+        self.consumer.process_event({'status': 'die', 'id': 'docker-id'})
+
+        container.refresh.assert_called_once_with()
+        self.assertEqual(2, container.save.call_count)
+        self.assertEqual('Stopped', container.status)
+
+    @patch('magnum.objects.Container.get_by_uuid')
+    def test_process_event_destroy(self, mock_get_by_uuid):
+        self.consumer._record(self.consumer.docker.inspect_container())
+
+        self.consumer.process_event({'status': 'destroy', 'id': 'docker-id'})
+
+        self.assertEqual({}, self.docker_ids)
+
+    @patch('magnum.objects.Container.get_by_uuid')
+    def test_process_event_not_managed(self, mock_get_by_uuid):
+        mock_get_by_uuid.side_effect = exception.ContainerNotFound(
+            container=CONTAINER_UUID)
+
+        self.consumer.process_event({'status': 'start', 'id': 'docker-id'})
+
+        self.assertEqual({CONTAINER_UUID: 'docker-id'}, self.docker_ids)
+
+    def test_process_event_ignored(self):
+        self.consumer.process_event({'status': 'export', 'id': 'docker-id'})
+        self.assertFalse(self.consumer._docker.inspect_container.called)
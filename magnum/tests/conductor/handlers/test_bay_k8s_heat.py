@@ -12,8 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from magnum.common import exception
 from magnum.conductor.handlers import bay_k8s_heat
 from magnum import objects
+from magnum.openstack.common import loopingcall
 from magnum.tests import base
 
 import mock
@@ -125,4 +127,32 @@ class TestBayK8sHeat(base.BaseTestCase):
             'template': expected_template_contents,
             'files': dict(exptected_files)
         }
-        mock_heat_client.stacks.create.assert_called_once_with(**expected_args)
\ No newline at end of file
+        mock_heat_client.stacks.create.assert_called_once_with(**expected_args)
+
+    @patch('magnum.openstack.common.loopingcall.FixedIntervalLoopingCall')
+    @patch('magnum.conductor.handlers.bay_k8s_heat._create_stack')
+    @patch('magnum.common.clients.OpenStackClients')
+    def test_bay_create_concurrent_update(self, mock_openstack_client,
+                                          mock_create_stack,
+                                          mock_looping_call):
+        mock_create_stack.return_value = {'stack': {'id': 'stack-id'}}
+        mock_heat = mock_openstack_client.return_value.heat.return_value
+        mock_heat.stacks.get.return_value = mock.MagicMock(
+            stack_status='CREATE_COMPLETE',
+            outputs=[{'output_value': ['10.0.0.4']}, {},
+                     {'output_value': '10.0.0.3'}])
+        mock_bay = mock.MagicMock()
+        mock_bay.save.side_effect = [
+            exception.ConcurrentUpdate(resource='bay', id='bay-id'), None]
+
+        bay_k8s_heat.Handler().bay_create({}, mock_bay)
+        poll_and_check = mock_looping_call.call_args[1]['f']
+
+        # The bay was updated since it was created, it is reloaded and
+        # saved again by the next poll.
+        poll_and_check()
+        mock_bay.refresh.assert_called_once_with()
+        self.assertRaises(loopingcall.LoopingCallDone, poll_and_check)
+        self.assertEqual(2, mock_bay.save.call_count)
+        self.assertEqual('10.0.0.3', mock_bay.master_address)
+        self.assertEqual(['10.0.0.4'], mock_bay.minions_address)
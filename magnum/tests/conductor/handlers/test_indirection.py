@@ -0,0 +1,187 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import sys
+
+import mock
+from oslo import messaging
+from oslo.messaging._drivers import common as rpc_common
+from oslo.serialization import jsonutils
+
+from magnum.common import context
+from magnum.common import exception
+from magnum.common import rpc_service
+from magnum.common import utils as magnum_utils
+from magnum.conductor import api as conductor_api
+from magnum.conductor.handlers import indirection
+from magnum import objects
+from magnum.objects import base as objects_base
+from magnum.tests.db import base
+from magnum.tests.db import utils
+
+
+class TestIndirectionHandler(base.DbTestCase):
+    def setUp(self):
+        super(TestIndirectionHandler, self).setUp()
+        self.context = context.RequestContext(is_admin=True)
+        self.handler = indirection.Handler()
+        self.db_pod = utils.create_test_pod()
+
+    def test_object_class_action(self):
+        pod = self.handler.object_class_action(
+            self.context, 'Pod', 'get_by_uuid', objects.Pod.VERSION,
+            (self.db_pod.uuid,), {})
+        self.assertIsInstance(pod, objects.Pod)
+        self.assertEqual(self.db_pod.name, pod.name)
+
+    def test_object_class_action_list_as_tenant(self):
+        db_pod2 = utils.create_test_pod(id=2,
+                                        uuid=magnum_utils.generate_uuid(),
+                                        project_id='tenant1')
+        serializer = rpc_service.RequestContextSerializer(
+            objects_base.MagnumObjectSerializer())
+        ctxt = serializer.deserialize_context(serializer.serialize_context(
+            context.RequestContext(user='user1', tenant='tenant1')))
+        pods = self.handler.object_class_action(
+            ctxt, 'Pod', 'list', objects.Pod.VERSION, (), {})
+        self.assertEqual([db_pod2.uuid], [pod.uuid for pod in pods])
+
+    def test_object_class_actions(self):
+        db_pod2 = utils.create_test_pod(id=2,
+                                        uuid=magnum_utils.generate_uuid())
+        pod1, pod2 = self.handler.object_class_actions(
+            self.context,
+            [('Pod', 'get_by_uuid', '1.0', (self.db_pod.uuid,), {}),
+             ('Pod', 'get_by_id', '1.0', (), {'pod_id': db_pod2.id})])
+        self.assertEqual(self.db_pod.uuid, pod1.uuid)
+        self.assertEqual(db_pod2.uuid, pod2.uuid)
+
+    def test_object_action(self):
+        pod = objects.Pod.get_by_uuid(self.context, self.db_pod.uuid)
+        pod.status = 'Failed'
+        updates, result = self.handler.object_action(self.context, pod,
+                                                     'save', (), {})
+        self.assertIsNone(result)
+        self.assertEqual([], updates['obj_what_changed'])
+        self.assertIn('updated_at', updates)
+        self.assertEqual(1, updates['version'])
+        self.assertNotIn('status', updates)
+        self.assertEqual('Failed',
+                         self.dbapi.get_pod_by_uuid(pod.uuid).status)
+
+    def test_object_action_delta(self):
+        pod = objects.Pod.get_by_uuid(self.context, self.db_pod.uuid)
+        pod.status = 'Failed'
+        serializer = objects_base.MagnumObjectSerializer()
+        objinst = serializer.deserialize_entity(
+            self.context, serializer.serialize_entity(
+                self.context, pod.obj_to_delta_primitive()))
+        self.handler.object_action(self.context, objinst, 'save', (), {})
+        self.assertEqual('Failed',
+                         self.dbapi.get_pod_by_uuid(pod.uuid).status)
+
+
+class LoopbackClient(object):
+    """An RPC client calling the handler in-process.
+
+    The calls go through the serializer and the endpoints of the conductor
+    as they would over the wire, and the exceptions of the handler are
+    passed back the way the drivers of oslo.messaging pass them.
+    """
+
+    def __init__(self, serializer, endpoint, allowed_remote_exmods):
+        self.serializer = serializer
+        self.endpoint = endpoint
+        self.allowed_remote_exmods = allowed_remote_exmods
+        self.calls = []
+
+    def call(self, ctxt, method, **kwargs):
+        self.calls.append(method)
+        msg = jsonutils.loads(jsonutils.dumps({
+            'context': self.serializer.serialize_context(ctxt),
+            'args': dict((k, self.serializer.serialize_entity(ctxt, v))
+                         for k, v in kwargs.items())}))
+        try:
+            server_ctxt = self.serializer.deserialize_context(msg['context'])
+            args = dict((k, self.serializer.deserialize_entity(server_ctxt,
+                                                               v))
+                        for k, v in msg['args'].items())
+            result = getattr(self.endpoint, method)(server_ctxt, **args)
+            reply = jsonutils.loads(jsonutils.dumps(
+                self.serializer.serialize_entity(server_ctxt, result)))
+        except Exception:
+            failure = rpc_common.serialize_remote_exception(sys.exc_info(),
+                                                            log_failure=False)
+            raise rpc_common.deserialize_remote_exception(
+                failure, self.allowed_remote_exmods)
+        return self.serializer.deserialize_entity(ctxt, reply)
+
+
+class TestIndirectionAPI(base.DbTestCase):
+    def setUp(self):
+        super(TestIndirectionAPI, self).setUp()
+        self.context = context.RequestContext(is_admin=True)
+        self.db_pod = utils.create_test_pod()
+        with mock.patch.object(messaging, 'get_transport') as mock_transport:
+            self.indirection_api = conductor_api.IndirectionAPI(
+                topic='fake-topic')
+        exmods = mock_transport.call_args[1]['allowed_remote_exmods']
+        self.client = LoopbackClient(
+            rpc_service.RequestContextSerializer(
+                objects_base.MagnumObjectSerializer()),
+            rpc_service.RequestScopedEndpoint(indirection.Handler()),
+            exmods)
+        self.indirection_api._client = self.client
+        patcher = mock.patch.object(objects_base.MagnumObject,
+                                    'indirection_api', self.indirection_api)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_sends_delta(self):
+        pod = objects.Pod.get_by_uuid(self.context, self.db_pod.uuid)
+        pod.status = 'Failed'
+        pod.save()
+        self.assertEqual(['object_action'], self.client.calls)
+        self.assertEqual(1, pod.version)
+        self.assertEqual('Failed',
+                         self.dbapi.get_pod_by_uuid(pod.uuid).status)
+
+    def test_save_delta_mismatch_sends_object(self):
+        pod = objects.Pod.get_by_uuid(self.context, self.db_pod.uuid)
+        pod._obj_version = '1.1'
+        pod.status = 'Failed'
+        pod.save()
+        self.assertEqual(['object_action', 'object_action'],
+                         self.client.calls)
+        self.assertEqual('Failed',
+                         self.dbapi.get_pod_by_uuid(pod.uuid).status)
+
+    def test_load_lazy_field(self):
+        with mock.patch.object(objects_base.MagnumObject, 'indirection_api',
+                               None):
+            pod = objects.Pod.list(self.context)[0]
+        self.assertFalse(pod.obj_attr_is_set('labels'))
+        self.assertEqual(self.db_pod.labels, pod.labels)
+        self.assertEqual(['object_class_action'], self.client.calls)
+
+    def test_remote_magnum_exception(self):
+        pod = objects.Pod.get_by_uuid(self.context, self.db_pod.uuid)
+        self.dbapi.destroy_pod(pod.uuid)
+        self.assertRaises(exception.PodNotFound, pod.refresh)
+
+    @mock.patch.object(messaging, 'get_rpc_server')
+    @mock.patch.object(messaging, 'get_transport')
+    def test_service_allows_magnum_exceptions(self, mock_transport,
+                                              mock_server):
+        rpc_service.Service('fake-topic', 'fake-host', [])
+        self.assertEqual([exception.__name__],
+                         mock_transport.call_args[1]['allowed_remote_exmods'])
@@ -17,6 +17,8 @@ import copy
 
 import mock
 
+from magnum.common import context
+from magnum.common import exception
 from magnum.conductor import api as conductor_rpcapi
 from magnum.tests.db import base
 from magnum.tests.db import utils as dbutils
@@ -121,3 +123,63 @@ class RPCAPITestCase(base.DbTestCase):
                           'call',
                           version='1.0',
                           rc=self.fake_rc)
+
+
+class RPCAPILastWriteTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(RPCAPILastWriteTestCase, self).setUp()
+        self.context = context.RequestContext()
+        self.rpcapi = conductor_rpcapi.API(context=self.context,
+                                           topic='fake-topic')
+
+    def test_write_recorded(self):
+        with mock.patch.object(self.rpcapi._client, 'call'):
+            self.rpcapi.bay_delete('uuid1')
+        self.assertIsNotNone(self.context.last_write)
+
+    def test_read_not_recorded(self):
+        with mock.patch.object(self.rpcapi._client, 'call'):
+            self.rpcapi.container_show('uuid1')
+        self.assertIsNone(self.context.last_write)
+
+    def test_failed_write_not_recorded(self):
+        with mock.patch.object(self.rpcapi._client, 'call',
+                               side_effect=exception.MagnumException()):
+            self.assertRaises(exception.MagnumException,
+                              self.rpcapi.bay_delete, 'uuid1')
+        self.assertIsNone(self.context.last_write)
+
+
+class IndirectionAPITestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(IndirectionAPITestCase, self).setUp()
+        self.rpcapi = conductor_rpcapi.IndirectionAPI(topic='fake-topic')
+        self.context = mock.sentinel.context
+
+    def test_object_class_action(self):
+        with mock.patch.object(self.rpcapi._client, 'call') as mock_call:
+            self.rpcapi.object_class_action(self.context, 'Pod',
+                                            'get_by_uuid', '1.1',
+                                            ('uuid1',), {})
+            mock_call.assert_called_once_with(
+                self.context, 'object_class_action', objname='Pod',
+                objmethod='get_by_uuid', objver='1.1', args=('uuid1',),
+                kwargs={})
+
+    def test_object_class_actions(self):
+        calls = [('Pod', 'get_by_uuid', '1.1', ('uuid1',), {}),
+                 ('Bay', 'get_by_uuid', '1.0', ('uuid2',), {})]
+        with mock.patch.object(self.rpcapi._client, 'call') as mock_call:
+            self.rpcapi.object_class_actions(self.context, calls)
+            mock_call.assert_called_once_with(
+                self.context, 'object_class_actions', calls=calls)
+
+    def test_object_action(self):
+        pod = dbutils.get_test_pod()
+        with mock.patch.object(self.rpcapi._client, 'call') as mock_call:
+            self.rpcapi.object_action(self.context, pod, 'save', (), {})
+            mock_call.assert_called_once_with(
+                self.context, 'object_action', objinst=pod,
+                objmethod='save', args=(), kwargs={})
@@ -12,6 +12,9 @@
 
 """Tests for custom SQLAlchemy types via Magnum DB."""
 
+import json
+
+import mock
 from oslo.db import exception as db_exc
 
 from magnum.common import utils as magnum_utils
@@ -65,3 +68,36 @@ class SqlAlchemyCustomTypesTestCase(base.DbTestCase):
                           self.dbapi.create_pod,
                           {'images':
                                {'this is not a list': 'test'}})
+
+    def test_json_codec(self):
+        self.config(json_codec='json', group='database')
+        with mock.patch.object(models, '_JSON_CODEC', None):
+            self.assertIs(json, models.get_json_codec())
+
+    def test_json_column_decoded_on_access(self):
+        pod_id = magnum_utils.generate_uuid()
+        self.dbapi.create_pod({'uuid': pod_id, 'labels': {'bar': 'foo'}})
+        with mock.patch.object(models, 'get_json_codec') as mock_codec:
+            mock_codec.return_value.loads.return_value = {'bar': 'foo'}
+            pod = sa_api.model_query(models.Pod).filter_by(uuid=pod_id).one()
+            self.assertFalse(mock_codec.return_value.loads.called)
+            self.assertEqual({'bar': 'foo'}, pod.labels)
+            self.assertEqual({'bar': 'foo'}, pod.labels)
+            mock_codec.return_value.loads.assert_called_once_with(
+                pod._labels)
+
+    def test_json_column_unchanged_value(self):
+        pod = models.Pod()
+        pod.update({'labels': {'bar': 'foo'}})
+        encoded = pod._labels
+        pod.labels = {'bar': 'foo'}
+        self.assertIs(encoded, pod._labels)
+        pod.labels = {'bar': 'baz'}
+        self.assertEqual({'bar': 'baz'}, json.loads(pod._labels))
+
+    def test_json_column_query(self):
+        pod_id = magnum_utils.generate_uuid()
+        self.dbapi.create_pod({'uuid': pod_id, 'labels': {'bar': 'foo'}})
+        res = self.dbapi.get_podinfo_list(columns=['uuid', 'labels'])
+        self.assertEqual([(pod_id, {'bar': 'foo'})],
+                         [tuple(r) for r in res])
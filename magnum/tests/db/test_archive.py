@@ -0,0 +1,66 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for archiving the deleted rows via the DB API"""
+
+import datetime
+
+from oslo.utils import timeutils
+
+from magnum.common import utils as magnum_utils
+from magnum.db.sqlalchemy import api as sqla_api
+from magnum.db.sqlalchemy import models
+from magnum.tests.db import base
+from magnum.tests.db import utils
+
+
+class DbArchiveTestCase(base.DbTestCase):
+
+    def _shadow_uuids(self, model):
+        shadow = models.SHADOW_TABLES[model]
+        return [row.uuid for row in
+                sqla_api.get_session().query(shadow).all()]
+
+    def test_archive_deleted(self):
+        pods = [utils.create_test_pod(id=i, uuid=magnum_utils.generate_uuid())
+                for i in range(1, 4)]
+        container = utils.create_test_container()
+        self.dbapi.destroy_pods([pods[0].uuid, pods[1].uuid])
+        self.dbapi.destroy_container(container.id)
+
+        self.assertEqual({'pod': 2, 'container': 1},
+                         self.dbapi.archive_deleted(batch_size=1))
+        self.assertEqual(sorted([pods[0].uuid, pods[1].uuid]),
+                         sorted(self._shadow_uuids(models.Pod)))
+        self.assertEqual([container.uuid],
+                         self._shadow_uuids(models.Container))
+        # The live pod is left in place, and nothing remains to purge.
+        self.assertEqual([pods[2].uuid],
+                         [p.uuid for p in self.dbapi.get_pod_list()])
+        after = timeutils.utcnow() + datetime.timedelta(days=1)
+        self.assertEqual({'pod': 0, 'container': 0},
+                         self.dbapi.purge_deleted(after))
+
+    def test_archive_deleted_before(self):
+        pod = utils.create_test_pod()
+        self.dbapi.destroy_pod(pod.id)
+        before = timeutils.utcnow() - datetime.timedelta(days=1)
+        self.assertEqual({'pod': 0, 'container': 0},
+                         self.dbapi.archive_deleted(before))
+        self.assertEqual([], self._shadow_uuids(models.Pod))
+
+    def test_get_table_stats(self):
+        utils.create_test_pod()
+        stats = dict((s['table'], s) for s in self.dbapi.get_table_stats())
+        self.assertEqual(1, stats['pod']['rows'])
+        self.assertEqual(0, stats['shadow_pod']['rows'])
+        self.assertIn('bay', stats)
@@ -204,6 +204,25 @@ class DbBayTestCase(base.DbTestCase):
         self.assertRaises(exception.BayNotEmpty,
                           self.dbapi.destroy_bay, bay.uuid)
 
+    def test_destroy_bay_with_deleted_pods(self):
+        bay = utils.create_test_bay()
+        pod = utils.create_test_pod(bay_uuid=bay.uuid)
+        self.dbapi.destroy_pod(pod.id)
+        self.dbapi.destroy_bay(bay.id)
+        self.assertRaises(exception.BayNotFound,
+                          self.dbapi.get_bay_by_id, bay.id)
+
+    def test_destroy_bay_that_has_rcs(self):
+        bay = utils.create_test_bay()
+        rc = utils.create_test_rc(bay_uuid=bay.uuid)
+        self.assertEqual(bay.uuid, rc.bay_uuid)
+        self.assertRaises(exception.BayNotEmpty,
+                          self.dbapi.destroy_bay, bay.id)
+        self.dbapi.destroy_rc(rc.id)
+        self.dbapi.destroy_bay(bay.id)
+        self.assertRaises(exception.BayNotFound,
+                          self.dbapi.get_bay_by_id, bay.id)
+
     def test_update_bay(self):
         bay = utils.create_test_bay()
         old_nc = bay.node_count
@@ -221,4 +240,20 @@ class DbBayTestCase(base.DbTestCase):
         bay = utils.create_test_bay()
         self.assertRaises(exception.InvalidParameterValue,
                           self.dbapi.update_bay, bay.id,
-                          {'uuid': ''})
\ No newline at end of file
+                          {'uuid': ''})
+
+    def test_destroy_bays(self):
+        bays = [utils.create_test_bay(id=i, uuid=magnum_utils.generate_uuid())
+                for i in range(1, 4)]
+        self.assertEqual(2, self.dbapi.destroy_bays([b.uuid
+                                                     for b in bays[:2]]))
+        self.assertEqual([bays[2].uuid],
+                         [b.uuid for b in self.dbapi.get_bay_list()])
+
+    def test_destroy_bays_that_have_pods(self):
+        bays = [utils.create_test_bay(id=i, uuid=magnum_utils.generate_uuid())
+                for i in range(1, 3)]
+        utils.create_test_pod(bay_uuid=bays[1].uuid)
+        self.assertRaises(exception.BayNotEmpty, self.dbapi.destroy_bays,
+                          [b.uuid for b in bays])
+        self.assertEqual(2, len(self.dbapi.get_bay_list()))
@@ -15,6 +15,9 @@
 
 """Tests for manipulating Pods via the DB API"""
 
+import datetime
+
+from oslo.utils import timeutils
 import six
 
 from magnum.common import exception
@@ -130,6 +133,21 @@ class DbPodTestCase(base.DbTestCase):
         res_uuids = [r.uuid for r in res]
         self.assertEqual(sorted(uuids), sorted(res_uuids))
 
+    def test_get_pod_list_with_keyset_marker(self):
+        ids = [self.pod.id]
+        for i in range(1, 6):
+            pod = utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                                        name='pod' + str(i),
+                                        bay_uuid=self.bay.uuid)
+            ids.append(pod.id)
+        res = self.dbapi.get_pod_list(limit=3, sort_key='id',
+                                      marker={'id': ids[1]})
+        self.assertEqual(ids[2:5], [r.id for r in res])
+
+        res = self.dbapi.get_pod_list(sort_key='name',
+                                      marker={'name': 'pod3', 'id': ids[3]})
+        self.assertEqual(ids[4:], [r.id for r in res])
+
     def test_get_pod_list_with_filters(self):
         bay1 = utils.get_test_bay(id=11, uuid=magnum_utils.generate_uuid())
         bay2 = utils.get_test_bay(id=12, uuid=magnum_utils.generate_uuid())
@@ -163,6 +181,43 @@ class DbPodTestCase(base.DbTestCase):
         res = self.dbapi.get_pod_list(filters={'status': 'status2'})
         self.assertEqual([pod2.id], [r.id for r in res])
 
+    def test_get_pod_list_with_name_prefix_and_labels(self):
+        pod1 = utils.create_test_pod(name='web_1',
+            uuid=magnum_utils.generate_uuid(),
+            bay_uuid=self.bay.uuid,
+            labels={'app': 'web', 'tier': 'frontend'})
+        pod2 = utils.create_test_pod(name='web%2',
+            uuid=magnum_utils.generate_uuid(),
+            bay_uuid=self.bay.uuid,
+            labels={'app': 'web', 'tier': 'backend'})
+
+        res = self.dbapi.get_pod_list(filters={'name_prefix': 'web'})
+        self.assertEqual([pod1.id, pod2.id], [r.id for r in res])
+
+        res = self.dbapi.get_pod_list(filters={'name_prefix': 'web%'})
+        self.assertEqual([pod2.id], [r.id for r in res])
+
+        res = self.dbapi.get_pod_list(filters={'labels': {'app': 'web'}})
+        self.assertEqual([pod1.id, pod2.id], [r.id for r in res])
+
+        res = self.dbapi.get_pod_list(filters={
+            'labels': {'app': 'web', 'tier': 'backend'}})
+        self.assertEqual([pod2.id], [r.id for r in res])
+
+        res = self.dbapi.get_pod_list(filters={
+            'bay_uuid': self.bay.uuid, 'labels': {'tier': 'web'}})
+        self.assertEqual([], [r.id for r in res])
+
+    def test_get_pod_list_by_project(self):
+        pod = utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                                    bay_uuid=self.bay.uuid,
+                                    project_id='project1', user_id='user1')
+        res = self.dbapi.get_pod_list(filters={'project_id': 'project1'})
+        self.assertEqual([pod.id], [r.id for r in res])
+        res = self.dbapi.get_podinfo_list(columns=['uuid'], filters={
+            'project_id': 'project1', 'user_id': 'user2'})
+        self.assertEqual([], res)
+
     def test_get_pod_list_bay_not_exist(self):
         res = self.dbapi.get_pod_list({'bay_uuid': self.bay.uuid})
         self.assertEqual(1, len(res))
@@ -201,6 +256,55 @@ class DbPodTestCase(base.DbTestCase):
         res = self.dbapi.update_pod(self.pod.id, {'name': new_name})
         self.assertEqual(new_name, res.name)
 
+    def test_update_pod_labels(self):
+        self.dbapi.update_pod(self.pod.id, {'labels': {'app': 'db'}})
+        res = self.dbapi.get_pod_list(filters={'labels': {'name': 'foo'}})
+        self.assertEqual([], res)
+        res = self.dbapi.get_pod_list(filters={'labels': {'app': 'db'}})
+        self.assertEqual([self.pod.id], [r.id for r in res])
+
+    def test_destroy_pod_labels(self):
+        self.dbapi.destroy_pod(self.pod.uuid)
+        # The label rows of the destroyed pod are gone, so only the pods
+        # created with the same labels afterwards match them.
+        pod = utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                                    bay_uuid=self.bay.uuid)
+        res = self.dbapi.get_pod_list(filters={'labels': {'name': 'foo'}})
+        self.assertEqual([pod.id], [r.id for r in res])
+
+    def test_purge_deleted(self):
+        self.dbapi.destroy_pod(self.pod.id)
+        self.assertEqual([], self.dbapi.get_pod_list())
+        before = timeutils.utcnow() - datetime.timedelta(days=1)
+        self.assertEqual({'pod': 0, 'container': 0},
+                         self.dbapi.purge_deleted(before))
+        after = timeutils.utcnow() + datetime.timedelta(days=1)
+        self.assertEqual({'pod': 1, 'container': 0},
+                         self.dbapi.purge_deleted(after))
+        # The uuid of a purged pod can be used again.
+        utils.create_test_pod(uuid=self.pod.uuid, bay_uuid=self.bay.uuid)
+
+    def test_purge_deleted_batches(self):
+        uuids = self.dbapi.create_pods(self._get_test_pods(5))
+        self.dbapi.destroy_pods(uuids)
+        after = timeutils.utcnow() + datetime.timedelta(days=1)
+        self.assertEqual({'pod': 5, 'container': 0},
+                         self.dbapi.purge_deleted(after, batch_size=2))
+
+    def test_update_pod_expected(self):
+        res = self.dbapi.update_pod(self.pod.id, {'status': 'Failed'},
+                                    expected={'version': 0})
+        self.assertEqual(1, res.version)
+        # The pod no longer has the version which was read first.
+        self.assertRaises(exception.ConcurrentUpdate,
+                          self.dbapi.update_pod, self.pod.id,
+                          {'status': 'Running'},
+                          expected={'version': 0})
+        res = self.dbapi.update_pod(self.pod.id, {'status': 'Running'},
+                                    expected={'version': res.version})
+        self.assertEqual('Running', res.status)
+        self.assertEqual(2, res.version)
+
     def test_update_pod_not_found(self):
         pod_uuid = magnum_utils.generate_uuid()
         self.assertRaises(exception.PodNotFound, self.dbapi.update_pod,
@@ -209,4 +313,76 @@ class DbPodTestCase(base.DbTestCase):
     def test_update_pod_uuid(self):
         self.assertRaises(exception.InvalidParameterValue,
                           self.dbapi.update_pod, self.pod.id,
-                          {'uuid': ''})
\ No newline at end of file
+                          {'uuid': ''})
+
+    def _get_test_pods(self, count):
+        pods = []
+        for i in range(count):
+            pod = utils.get_test_pod(uuid=magnum_utils.generate_uuid(),
+                                     name='pod%d' % i,
+                                     bay_uuid=self.bay.uuid,
+                                     labels={'app': 'db%d' % i})
+            del pod['id']
+            pods.append(pod)
+        return pods
+
+    def test_create_pods(self):
+        pods = self._get_test_pods(3)
+        uuids = self.dbapi.create_pods(pods)
+        self.assertEqual([p['uuid'] for p in pods], uuids)
+        res = self.dbapi.get_pod_list(filters={'labels': {'app': 'db1'}})
+        self.assertEqual([uuids[1]], [r.uuid for r in res])
+        self.assertEqual(['MyImage'], res[0].images)
+        self.assertIsNotNone(res[0].created_at)
+
+    def test_create_pods_duplicated_uuid(self):
+        pods = self._get_test_pods(2)
+        pods[1]['uuid'] = self.pod.uuid
+        self.assertRaises(exception.PodAlreadyExists,
+                          self.dbapi.create_pods, pods)
+        # Nothing is created when one of the pods fails.
+        self.assertEqual(1, len(self.dbapi.get_pod_list()))
+
+    def test_update_pods(self):
+        uuids = self.dbapi.create_pods(self._get_test_pods(2))
+        count = self.dbapi.update_pods([
+            {'uuid': uuids[0], 'status': 'Failed'},
+            {'uuid': uuids[1], 'status': 'Failed',
+             'labels': {'app': 'web'}}])
+        self.assertEqual(2, count)
+        res = self.dbapi.get_pod_list(filters={'status': 'Failed'})
+        self.assertEqual(sorted(uuids), sorted(r.uuid for r in res))
+        self.assertEqual([1, 1], [r.version for r in res])
+        res = self.dbapi.get_pod_list(filters={'labels': {'app': 'web'}})
+        self.assertEqual([uuids[1]], [r.uuid for r in res])
+
+    def test_update_pods_without_uuid(self):
+        self.assertRaises(exception.InvalidParameterValue,
+                          self.dbapi.update_pods, [{'status': 'Failed'}])
+
+    def test_destroy_pods(self):
+        uuids = self.dbapi.create_pods(self._get_test_pods(3))
+        self.assertEqual(2, self.dbapi.destroy_pods(uuids[:2]))
+        res = self.dbapi.get_pod_list(filters={'labels': {'app': 'db0'}})
+        self.assertEqual([], res)
+        self.assertEqual(2, len(self.dbapi.get_pod_list()))
+
+    def test_destroy_pods_by_bay(self):
+        self.dbapi.create_pods(self._get_test_pods(2))
+        other = utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                                      bay_uuid=magnum_utils.generate_uuid())
+        self.assertEqual(3, self.dbapi.destroy_pods_by_bay(self.bay.uuid))
+        res = self.dbapi.get_pod_list(filters={'labels': {'name': 'foo'}})
+        self.assertEqual([other.uuid], [r.uuid for r in res])
+
+    def test_get_pod_list_by_uuids(self):
+        uuids = self.dbapi.create_pods(self._get_test_pods(3))
+        res = self.dbapi.get_pod_list(filters={'uuid': uuids[1:]})
+        self.assertEqual(sorted(uuids[1:]), sorted(r.uuid for r in res))
+
+    def test_get_pods_versions(self):
+        uuids = self.dbapi.create_pods(self._get_test_pods(2))
+        self.dbapi.update_pod(uuids[0], {'status': 'Failed'})
+        missing = magnum_utils.generate_uuid()
+        self.assertEqual({uuids[0]: 1, uuids[1]: 0},
+                         self.dbapi.get_pods_versions(uuids + [missing]))
@@ -0,0 +1,134 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the request scoped sessions of the DB API"""
+
+import mock
+
+from magnum.common import context
+from magnum.common import exception
+from magnum.common import utils as magnum_utils
+from magnum.db import api as dbapi
+from magnum.db.sqlalchemy import api as sqla_api
+from magnum.tests.db import base
+from magnum.tests.db import utils
+
+
+class DbRequestScopeTestCase(base.DbTestCase):
+
+    def test_session_shared(self):
+        self.assertIsNot(sqla_api.get_session(), sqla_api.get_session())
+        with dbapi.request_scope():
+            session = sqla_api.get_session()
+            self.assertIs(session, sqla_api.get_session())
+            with dbapi.request_scope():
+                self.assertIs(session, sqla_api.get_session())
+            self.assertIs(session, sqla_api.get_session())
+        self.assertIsNot(session, sqla_api.get_session())
+
+    def test_commit(self):
+        with dbapi.request_scope():
+            pod = utils.create_test_pod()
+        self.assertEqual(pod.uuid, self.dbapi.get_pod_by_id(pod.id).uuid)
+
+    def test_rollback_on_error(self):
+        def create():
+            with dbapi.request_scope():
+                utils.create_test_pod()
+                raise exception.MagnumException()
+
+        self.assertRaises(exception.MagnumException, create)
+        self.assertEqual([], self.dbapi.get_pod_list())
+
+    def test_read_only_write(self):
+        def create():
+            with dbapi.request_scope(read_only=True):
+                utils.create_test_pod()
+
+        self.assertRaises(exception.ReadOnlyRequestWrite, create)
+        self.assertEqual([], self.dbapi.get_pod_list())
+
+    def test_read_only_nested_write(self):
+        def create():
+            with dbapi.request_scope(read_only=True):
+                with dbapi.request_scope():
+                    utils.create_test_pod()
+
+        self.assertRaises(exception.ReadOnlyRequestWrite, create)
+
+    def test_write_recorded(self):
+        ctxt = context.RequestContext()
+        with dbapi.request_scope(transaction=False, context=ctxt):
+            utils.create_test_pod()
+        self.assertIsNotNone(ctxt.last_write)
+
+    def test_no_transaction(self):
+        def create():
+            with dbapi.request_scope(transaction=False):
+                utils.create_test_pod(uuid=magnum_utils.generate_uuid())
+                raise exception.MagnumException()
+
+        self.assertRaises(exception.MagnumException, create)
+        self.assertEqual(1, len(self.dbapi.get_pod_list()))
+
+
+@mock.patch.object(sqla_api, '_create_facade_lazily')
+class DbSlaveRoutingTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(DbSlaveRoutingTestCase, self).setUp()
+        self.config(slave_connection='sqlite://', slave_max_lag=5,
+                    group='database')
+
+    def _scope_uses_slave(self, mock_facade, read_only=True, context=None):
+        get_session = mock_facade.return_value.get_session
+        get_session.reset_mock()
+        get_session.return_value.info = {}
+        with dbapi.request_scope(read_only=read_only, context=context):
+            pass
+        return get_session.call_args[1]['use_slave']
+
+    def test_read_only_request(self, mock_facade):
+        self.assertTrue(self._scope_uses_slave(mock_facade))
+        self.assertFalse(self._scope_uses_slave(mock_facade,
+                                                read_only=False))
+
+    def test_read_your_writes(self, mock_facade):
+        mock_facade.return_value.get_session.return_value.info = {}
+        ctxt = context.RequestContext()
+        with dbapi.request_scope(transaction=False, context=ctxt):
+            sqla_api.get_session()
+        self.assertIsNotNone(ctxt.last_write)
+        self.assertFalse(self._scope_uses_slave(mock_facade, context=ctxt))
+
+        ctxt.last_write -= 5
+        self.assertTrue(self._scope_uses_slave(mock_facade, context=ctxt))
+
+    def test_read_without_writes(self, mock_facade):
+        ctxt = context.RequestContext()
+        with dbapi.request_scope(transaction=False, context=ctxt):
+            sqla_api.get_session(use_slave=True)
+        self.assertIsNone(ctxt.last_write)
+        self.assertTrue(self._scope_uses_slave(mock_facade, context=ctxt))
+
+    def test_read_only_writes_fail(self, mock_facade):
+        get_session = mock_facade.return_value.get_session
+        slave = mock.Mock(info={})
+        get_session.return_value = slave
+        with dbapi.request_scope(read_only=True):
+            self.assertIs(slave, sqla_api.get_session(use_slave=True))
+            self.assertRaises(exception.ReadOnlyRequestWrite,
+                              sqla_api.get_session)
+
+    def test_no_slave_connection(self, mock_facade):
+        self.config(slave_connection=None, group='database')
+        self.assertFalse(self._scope_uses_slave(mock_facade))
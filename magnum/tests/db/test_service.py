@@ -172,6 +172,33 @@ class DbServiceTestCase(base.DbTestCase):
         res = self.dbapi.get_services_by_bay_uuid(magnum_utils.generate_uuid())
         self.assertEqual([], res)
 
+    def test_get_service_pod_uuids(self):
+        web = utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                                    bay_uuid=self.bay.uuid,
+                                    labels={'app': 'web', 'tier': 'front'})
+        utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                              bay_uuid=self.bay.uuid,
+                              labels={'app': 'web', 'tier': 'back'})
+        utils.create_test_pod(uuid=magnum_utils.generate_uuid(),
+                              bay_uuid=magnum_utils.generate_uuid(),
+                              labels={'app': 'web', 'tier': 'front'})
+        service = utils.create_test_service(
+            id=43, uuid=magnum_utils.generate_uuid(), bay_uuid=self.bay.uuid,
+            selector={'app': 'web', 'tier': 'front'})
+
+        res = self.dbapi.get_service_pod_uuids(self.bay.uuid)
+        self.assertEqual([(service.uuid, web.uuid)], res)
+
+    def test_get_service_pod_uuids_after_update(self):
+        pod = utils.create_test_pod(bay_uuid=self.bay.uuid,
+                                    labels={'app': 'db'})
+        self.assertEqual([], self.dbapi.get_service_pod_uuids(self.bay.uuid))
+
+        self.dbapi.update_service(self.service.id,
+                                  {'selector': {'app': 'db'}})
+        res = self.dbapi.get_service_pod_uuids(self.bay.uuid)
+        self.assertEqual([(self.service.uuid, pod.uuid)], res)
+
     def test_destroy_service(self):
         self.dbapi.destroy_service(self.service.id)
         self.assertRaises(exception.ServiceNotFound,
@@ -22,6 +22,8 @@ def get_test_baymodel(**kw):
     return {
         'id': kw.get('id', 32),
         'uuid': kw.get('uuid', 'e74c40e0-d825-11e2-a28f-0800200c9a66'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'baymodel1'),
         'image_id': kw.get('image_id', 'ubuntu'),
         'flavor_id': kw.get('flavor_id', 'm1.small'),
@@ -31,6 +33,7 @@ def get_test_baymodel(**kw):
         'dns_nameserver': kw.get('dns_nameserver', '8.8.1.1'),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -38,6 +41,8 @@ def get_test_bay(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', '5d12f6fd-a196-4bf0-ae4c-1f639a523a52'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'bay1'),
         'baymodel_id': kw.get('baymodel_id',
                               'e74c40e0-d825-11e2-a28f-0800200c9a66'),
@@ -47,6 +52,7 @@ def get_test_bay(**kw):
         'node_count': kw.get('node_count', 3),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -68,6 +74,8 @@ def get_test_pod(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', '10a47dd1-4874-4298-91cf-eff046dbdb8d'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'pod1'),
         'desc': kw.get('desc', 'test pod'),
         'bay_uuid': kw.get('bay_uuid', '5d12f6fd-a196-4bf0-ae4c-1f639a523a52'),
@@ -76,6 +84,7 @@ def get_test_pod(**kw):
         'status': kw.get('status', 'Running'),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -97,6 +106,8 @@ def get_test_service(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', '10a47dd1-4874-4298-91cf-eff046dbdb8d'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'service1'),
         'bay_uuid': kw.get('bay_uuid', '5d12f6fd-a196-4bf0-ae4c-1f639a523a52'),
         'labels': kw.get('labels', {'name': 'foo'}),
@@ -105,6 +116,7 @@ def get_test_service(**kw):
         'port': kw.get('port', 80),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -126,11 +138,14 @@ def get_test_node(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', 'ea8e2a25-2901-438d-8157-de7ffd68d051'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'type': kw.get('type', 'virt'),
         'image_id': kw.get('image_id', 'ubuntu'),
         'ironic_node_id': kw.get('ironic_node_id'),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -152,10 +167,14 @@ def get_test_container(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', 'ea8e2a25-2901-438d-8157-de7ffd68d051'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'container1'),
         'image_id': kw.get('image_id', 'ubuntu'),
+        'status': kw.get('status', 'Stopped'),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
@@ -177,6 +196,8 @@ def get_test_rc(**kw):
     return {
         'id': kw.get('id', 42),
         'uuid': kw.get('uuid', '10a47dd1-4874-4298-91cf-eff046dbdb8d'),
+        'project_id': kw.get('project_id'),
+        'user_id': kw.get('user_id'),
         'name': kw.get('name', 'service1'),
         'images': kw.get('images', ['steak/for-dinner']),
         'bay_uuid': kw.get('bay_uuid', '10a47dd1-4874-4298-91cf-eff046dbdb8e'),
@@ -185,6 +206,7 @@ def get_test_rc(**kw):
         'rc_definition_url': kw.get('file:///tmp/rc.yaml'),
         'created_at': kw.get('created_at'),
         'updated_at': kw.get('updated_at'),
+        'version': kw.get('version', 0),
     }
 
 
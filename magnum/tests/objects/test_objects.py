@@ -0,0 +1,423 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the common behaviour of the magnum objects"""
+
+import collections
+import datetime
+
+import mock
+
+from magnum.common import context
+from magnum.common import exception
+from magnum.common import utils as magnum_utils
+from magnum import objects
+from magnum.objects import base as objects_base
+from magnum.tests.db import base
+from magnum.tests.db import utils
+
+
+class TestMagnumObject(base.DbTestCase):
+
+    def setUp(self):
+        super(TestMagnumObject, self).setUp()
+        self.context = context.RequestContext(is_admin=True)
+
+    def test_from_db_objects(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod._from_db_objects(self.context, [db_pod])[0]
+        expected = objects.Pod._from_db_object(objects.Pod(self.context),
+                                               db_pod)
+        self.assertEqual(expected.as_dict(), pod.as_dict())
+        self.assertIsNotNone(pod.created_at.utcoffset())
+        self.assertFalse(pod.obj_attr_is_set('pod_definition_url'))
+        self.assertEqual(set(), pod.obj_what_changed())
+        self.assertIs(self.context, pod._context)
+
+    def test_from_db_objects_copies_containers(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod._from_db_objects(self.context, [db_pod])[0]
+        pod.images.append('busybox')
+        self.assertNotIn('busybox', db_pod.images)
+
+    def test_from_db_objects_tracks_changes(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod._from_db_objects(self.context, [db_pod])[0]
+        pod.status = 'Running'
+        self.assertEqual(set(['status']), pod.obj_what_changed())
+
+    def test_fields_in_slots(self):
+        pod = objects.Pod(self.context, name='pod1')
+        self.assertFalse(hasattr(pod, '__dict__'))
+        self.assertIn('_name', objects.Pod.__slots__)
+        self.assertRaises(AttributeError, setattr, pod, 'foo', 'bar')
+
+    def test_dict_api(self):
+        pod = objects.Pod(self.context, name='pod1', status='Running')
+        self.assertEqual('pod1', pod['name'])
+        self.assertIn('name', pod)
+        self.assertNotIn('desc', pod)
+        self.assertEqual({'name': 'pod1', 'status': 'Running'},
+                         dict(pod.iteritems()))
+        self.assertEqual({'name': 'pod1', 'status': 'Running'},
+                         pod.as_dict())
+
+    def test_changes_mask(self):
+        pod = objects.Pod(self.context, name='pod1', status='Running')
+        self.assertEqual(set(['name', 'status']), pod.obj_what_changed())
+        pod.obj_reset_changes(['name'])
+        self.assertEqual(set(['status']), pod.obj_what_changed())
+        pod.obj_reset_changes()
+        self.assertEqual(set(), pod.obj_what_changed())
+
+    def test_clone_shares_containers(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        pod.status = 'Failed'
+        clone = pod.obj_clone()
+        self.assertIs(pod._labels, clone._labels)
+        self.assertEqual(set(['status']), clone.obj_what_changed())
+
+        clone.labels['name'] = 'bar'
+        clone.images.append('busybox')
+        self.assertEqual({'name': 'foo'}, pod.labels)
+        self.assertEqual(['MyImage'], pod.images)
+        self.assertEqual({'name': 'bar'}, clone.labels)
+
+    def test_clone_copies_exposed_containers(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        labels = pod.labels
+        clone = pod.obj_clone()
+        self.assertIsNot(pod._labels, clone._labels)
+        self.assertIs(pod._images, clone._images)
+        labels['name'] = 'bar'
+        self.assertEqual({'name': 'foo'}, clone.labels)
+
+    def test_clone_lazy_object(self):
+        utils.create_test_pod()
+        pod = objects.Pod.list(self.context)[0]
+        clone = pod.obj_clone()
+        self.assertFalse(clone.obj_attr_is_set('labels'))
+        self.assertEqual({'name': 'foo'}, clone.as_dict()['labels'])
+        primitive = pod.obj_clone().obj_to_primitive()
+        self.assertEqual(['MyImage'],
+                         primitive['magnum_object.data']['images'])
+
+    def test_clone_keeps_version(self):
+        pod = objects.Pod(self.context, name='pod1')
+        pod._obj_version = '1.0'
+        self.assertEqual('1.0', pod.obj_clone().obj_version)
+
+    def test_obj_diff(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        clone = pod.obj_clone()
+        self.assertEqual(set(), clone.obj_diff(pod))
+        self.assertIs(pod._labels, clone._labels)
+        clone.status = 'Failed'
+        clone.labels = {'name': 'bar'}
+        self.assertEqual(set(['status', 'labels']), clone.obj_diff(pod))
+
+    def test_primitive_keeps_version(self):
+        pod = objects.Pod(self.context, name='pod1')
+        primitive = pod.obj_to_primitive()
+        primitive['magnum_object.version'] = '1.0'
+        pod = objects.Pod.obj_from_primitive(primitive, self.context)
+        self.assertEqual('1.0', pod.obj_to_primitive()[
+            'magnum_object.version'])
+        self.assertEqual(set(['name']), pod.obj_what_changed())
+
+    def test_obj_class_from_name(self):
+        obj_class_from_name = objects_base.MagnumObject.obj_class_from_name
+        self.assertIs(objects.Pod,
+                      obj_class_from_name('Pod', objects.Pod.VERSION))
+        self.assertIs(objects.Pod, obj_class_from_name('Pod', '1.0'))
+        self.assertIs(objects.Pod, objects_base.MagnumObject.
+                      _obj_class_cache[('Pod', '1.0')])
+
+    def test_obj_class_from_name_new_class(self):
+        obj_base = objects_base.MagnumObject
+        classes = collections.defaultdict(list, [
+            (name, list(objclasses))
+            for name, objclasses in obj_base._obj_classes.items()])
+        with mock.patch.object(obj_base, '_obj_classes', classes):
+            with mock.patch.object(obj_base, '_obj_class_cache',
+                                   dict(obj_base._obj_class_cache)):
+                obj_base.obj_class_from_name('Pod', '1.0')
+
+                class Pod(objects.Pod):
+                    VERSION = '1.3'
+
+                self.assertIs(Pod, obj_base.obj_class_from_name('Pod',
+                                                                 '1.0'))
+                self.assertIs(objects.Pod,
+                              obj_base.obj_class_from_name('Pod', '1.1'))
+
+    def test_identity_map(self):
+        db_pod = utils.create_test_pod()
+        objects_base.obj_cache_enable(self.context)
+        with mock.patch.object(self.dbapi, 'get_pod_by_uuid',
+                               wraps=self.dbapi.get_pod_by_uuid) as mock_get:
+            pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+            self.assertIs(pod, objects.Pod.get_by_uuid(self.context,
+                                                       db_pod.uuid))
+            self.assertIs(pod, objects.Pod.get_by_id(self.context,
+                                                     db_pod.id))
+            self.assertEqual(1, mock_get.call_count)
+
+    def test_identity_map_disabled(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        self.assertIsNot(pod, objects.Pod.get_by_uuid(self.context,
+                                                      db_pod.uuid))
+
+    def test_identity_map_write_evicts(self):
+        db_pod = utils.create_test_pod()
+        objects_base.obj_cache_enable(self.context)
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        other = objects.Pod._from_db_object(objects.Pod(self.context),
+                                            db_pod)
+        other.status = 'Running'
+        other.save()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        self.assertIsNot(other, pod)
+        self.assertEqual('Running', pod.status)
+
+    def test_save_concurrent_update(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        other = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        other.status = 'Running'
+        other.save()
+        self.assertEqual(1, other.version)
+        # Within the same second as the first save().
+        pod.status = 'Failed'
+        self.assertRaises(exception.ConcurrentUpdate, pod.save)
+        self.assertEqual('Running',
+                         self.dbapi.get_pod_by_uuid(db_pod.uuid).status)
+
+    def test_refresh_unchanged(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        with mock.patch.object(self.dbapi, 'get_pod_by_uuid') as mock_get:
+            pod.refresh()
+            self.assertFalse(mock_get.called)
+
+    def test_refresh_updated(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        self.dbapi.update_pod(db_pod.uuid, {'status': 'Failed'})
+        pod.refresh()
+        self.assertEqual('Failed', pod.status)
+
+    def test_refresh_updated_then_save(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        self.dbapi.update_pod(db_pod.uuid, {'name': 'pod2'})
+        pod.refresh()
+        self.assertEqual(1, pod.version)
+        pod.status = 'Failed'
+        pod.save()
+        self.assertEqual(2, pod.version)
+
+    def test_refresh_unsaved_changes(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        pod.status = 'Failed'
+        pod.refresh()
+        self.assertEqual('Running', pod.status)
+        self.assertEqual(set(), pod.obj_what_changed())
+
+    def test_refresh_many(self):
+        db_pods = [utils.create_test_pod(id=i + 1,
+                                         uuid=magnum_utils.generate_uuid())
+                   for i in range(3)]
+        pods = objects.Pod.list(self.context)
+        self.dbapi.update_pod(db_pods[1].uuid, {'status': 'Failed'})
+        with mock.patch.object(self.dbapi, 'get_pod_list',
+                               wraps=self.dbapi.get_pod_list) as mock_list:
+            objects.Pod.refresh_many(pods)
+            mock_list.assert_called_once_with(
+                filters={'uuid': [db_pods[1].uuid]})
+        self.assertEqual(['Running', 'Failed', 'Running'],
+                         [pod.status for pod in pods])
+
+    def test_delta_primitive(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        pod.status = 'Failed'
+        primitive = pod.obj_to_delta_primitive()
+        self.assertEqual({'status': 'Failed'},
+                         primitive['magnum_object.data'])
+        self.assertEqual(db_pod.uuid,
+                         primitive['magnum_object.delta']['uuid'])
+
+        pod = objects_base.MagnumObject.obj_from_primitive(primitive,
+                                                           self.context)
+        self.assertEqual('Failed', pod.status)
+        self.assertEqual(db_pod.name, pod.name)
+        self.assertEqual(set(['status']), pod.obj_what_changed())
+
+    def test_delta_primitive_new_object(self):
+        pod = objects.Pod(self.context, name='pod1')
+        primitive = pod.obj_to_delta_primitive()
+        self.assertNotIn('magnum_object.delta', primitive)
+        self.assertEqual(pod.obj_to_primitive(), primitive)
+
+    def test_delta_primitive_stale(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        pod.status = 'Failed'
+        primitive = pod.obj_to_delta_primitive()
+        self.dbapi.update_pod(db_pod.uuid, {'name': 'pod2'})
+        self.assertRaises(exception.ObjectDeltaMismatch,
+                          objects_base.MagnumObject.obj_from_primitive,
+                          primitive, self.context)
+
+    def test_delta_primitive_other_version(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        primitive = pod.obj_to_delta_primitive()
+        primitive['magnum_object.version'] = '1.0'
+        self.assertRaises(exception.ObjectDeltaMismatch,
+                          objects_base.MagnumObject.obj_from_primitive,
+                          primitive, self.context)
+
+    def test_remotable_sends_delta(self):
+        db_pod = utils.create_test_pod()
+        pod = objects.Pod.get_by_uuid(self.context, db_pod.uuid)
+        pod.status = 'Failed'
+        delta = pod.obj_to_delta_primitive()
+        indirection_api = mock.Mock()
+        indirection_api.object_action.side_effect = [
+            exception.ObjectDeltaMismatch(objtype='Pod', uuid=pod.uuid),
+            ({}, None)]
+        with mock.patch.object(objects_base.MagnumObject, 'indirection_api',
+                               indirection_api):
+            pod.save()
+        calls = indirection_api.object_action.call_args_list
+        self.assertEqual(delta, calls[0][0][1])
+        self.assertIs(pod, calls[1][0][1])
+
+    def test_obj_class_actions(self):
+        db_pod = utils.create_test_pod()
+        pod, pods = objects_base.obj_class_actions(
+            self.context, [(objects.Pod, 'get_by_uuid', (db_pod.uuid,), {}),
+                           (objects.Pod, 'list', (), {'limit': 1})])
+        self.assertEqual(db_pod.uuid, pod.uuid)
+        self.assertEqual([db_pod.uuid], [p.uuid for p in pods])
+
+    def test_obj_class_actions_indirection(self):
+        indirection_api = mock.Mock()
+        with mock.patch.object(objects_base.MagnumObject, 'indirection_api',
+                               indirection_api):
+            result = objects_base.obj_class_actions(
+                self.context, [(objects.Pod, 'get_by_uuid', ('uuid1',), {}),
+                               (objects.Bay, 'list', (), {'limit': 1})])
+        indirection_api.object_class_actions.assert_called_once_with(
+            self.context,
+            [('Pod', 'get_by_uuid', objects.Pod.VERSION, ('uuid1',), {}),
+             ('Bay', 'list', objects.Bay.VERSION, (), {'limit': 1})])
+        self.assertEqual(indirection_api.object_class_actions.return_value,
+                         result)
+
+
+class TestObjectList(base.DbTestCase):
+
+    def setUp(self):
+        super(TestObjectList, self).setUp()
+        self.context = context.RequestContext(is_admin=True)
+        self.serializer = objects_base.MagnumObjectSerializer()
+        for i in range(3):
+            utils.create_test_pod(id=i + 1,
+                                  uuid=magnum_utils.generate_uuid(),
+                                  name='pod%d' % i)
+
+    def _round_trip(self, obj_list):
+        primitive = self.serializer.serialize_entity(self.context, obj_list)
+        return primitive, self.serializer.deserialize_entity(self.context,
+                                                             primitive)
+
+    def test_list_type(self):
+        pods = objects.Pod.list(self.context)
+        self.assertIsInstance(pods, objects.PodList)
+        self.assertEqual(3, len(pods))
+        self.assertEqual(['pod0', 'pod1', 'pod2'],
+                         sorted(pod.name for pod in pods))
+        self.assertEqual(set(), pods.obj_what_changed())
+
+    def test_columns_primitive(self):
+        pods = objects.Pod.list(self.context)
+        pods[1].status = 'Running'
+        primitive, result = self._round_trip(pods)
+
+        data = primitive['magnum_object.data']['objects']
+        self.assertEqual('Pod', data['magnum_object.name'])
+        self.assertEqual(3, data['magnum_object.count'])
+        self.assertEqual([pod.uuid for pod in pods],
+                         data['magnum_object.columns']['uuid'])
+        self.assertNotIn('pod_definition_url',
+                         data['magnum_object.columns'])
+
+        self.assertIsInstance(result, objects.PodList)
+        self.assertEqual([pod.as_dict() for pod in pods],
+                         [pod.as_dict() for pod in result])
+        self.assertEqual(set(['status']), result[1].obj_what_changed())
+        self.assertEqual(set(), result[0].obj_what_changed())
+
+    def test_columns_primitive_microseconds(self):
+        pods = objects.Pod.list(self.context)
+        pods[0].created_at = datetime.datetime(2015, 2, 24, 10, 17, 31,
+                                               123456)
+        primitive, result = self._round_trip(pods)
+        self.assertEqual(pods[0].created_at, result[0].created_at)
+
+    def test_columns_primitive_unset_fields(self):
+        pods = objects.Pod.list(self.context)
+        del pods[0]._status
+        primitive, result = self._round_trip(pods)
+        self.assertFalse(result[0].obj_attr_is_set('status'))
+        self.assertEqual(pods[1].status, result[1].status)
+
+    def test_dict_primitive(self):
+        pods = objects.Pod.list(self.context)
+        primitive, result = self._round_trip({'marker': pods[0],
+                                              'limit': 1})
+        self.assertEqual('Pod', primitive['marker']['magnum_object.name'])
+        self.assertEqual(1, result['limit'])
+        self.assertEqual(pods[0].uuid, result['marker'].uuid)
+
+    def test_mixed_objects_primitive(self):
+        pods = objects.Pod.list(self.context)
+        pods.objects.append(objects.Bay(self.context, name='bay1'))
+        primitive, result = self._round_trip(pods)
+        self.assertIsInstance(primitive['magnum_object.data']['objects'],
+                              list)
+        self.assertEqual('bay1', result[3].name)
+
+    def test_lazy_fields(self):
+        pods = objects.Pod.list(self.context)
+        self.assertFalse(pods[0].obj_attr_is_set('images'))
+        self.assertFalse(pods[2].obj_attr_is_set('labels'))
+        with mock.patch.object(self.dbapi, 'get_podinfo_list',
+                               wraps=self.dbapi.get_podinfo_list) as mock_get:
+            self.assertEqual(['MyImage'], pods[0].images)
+            self.assertEqual({'name': 'foo'}, pods[2].labels)
+            self.assertEqual(['MyImage'], pods[1].as_dict()['images'])
+            self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(set(), pods.obj_what_changed())
+
+    def test_lazy_fields_not_listed(self):
+        pods = objects.Pod.list(self.context, columns=['id', 'uuid'])
+        self.assertNotIn('images', pods[0].as_dict())
+        self.assertEqual(['MyImage'], pods[0].images)
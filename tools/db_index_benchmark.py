@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the bay_uuid lookups of the pod table with and without indexes.
+
+Usage: db_index_benchmark.py [--rows N] [--bays N] [--connection URL]
+
+The schema is created from the models, filled with synthetic pods spread
+over a number of bays, and the filters used by the DB API (``bay_uuid``,
+``bay_uuid`` + ``name``, ``bay_uuid`` + ``status``) are timed once with
+the indexes declared in the models and once with them dropped.
+"""
+
+import argparse
+import time
+import uuid
+
+import sqlalchemy as sa
+
+from magnum.db.sqlalchemy import models
+
+
+STATUSES = ['Pending', 'Running', 'Succeeded', 'Failed']
+
+
+def _fill(engine, rows, bays):
+    bay_uuids = [str(uuid.uuid4()) for i in range(bays)]
+    table = models.Pod.__table__
+    chunk = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            chunk.append({'uuid': str(uuid.uuid4()),
+                          'name': 'pod-%d' % i,
+                          'bay_uuid': bay_uuids[i % bays],
+                          'images': '[]',
+                          'labels': '{}',
+                          'status': STATUSES[i % len(STATUSES)]})
+            if len(chunk) == 10000:
+                conn.execute(table.insert(), chunk)
+                chunk = []
+        if chunk:
+            conn.execute(table.insert(), chunk)
+    return bay_uuids
+
+
+def _time(engine, queries, repeat):
+    results = []
+    with engine.connect() as conn:
+        for label, query in queries:
+            start = time.time()
+            for i in range(repeat):
+                conn.execute(query).fetchall()
+            results.append((label, (time.time() - start) / repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--bays', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--connection', default='sqlite://')
+    args = parser.parse_args()
+
+    engine = sa.create_engine(args.connection)
+    models.Base.metadata.create_all(engine, tables=[models.Pod.__table__])
+    bay_uuids = _fill(engine, args.rows, args.bays)
+
+    pod = models.Pod.__table__
+    bay_uuid = bay_uuids[len(bay_uuids) // 2]
+    queries = [
+        ('bay_uuid', pod.select().where(pod.c.bay_uuid == bay_uuid)),
+        ('bay_uuid, name', pod.select().where(sa.and_(
+            pod.c.bay_uuid == bay_uuid, pod.c.name == 'pod-%d' %
+            (len(bay_uuids) // 2)))),
+        ('bay_uuid, status', pod.select().where(sa.and_(
+            pod.c.bay_uuid == bay_uuid, pod.c.status == 'Running'))),
+    ]
+
+    indexed = _time(engine, queries, args.repeat)
+    for index in pod.indexes:
+        index.drop(engine)
+    scanned = _time(engine, queries, args.repeat)
+
+    print('%d pods in %d bays' % (args.rows, args.bays))
+    print('%-20s %15s %15s %10s' % ('filter', 'indexed (ms)', 'scan (ms)',
+                                    'speedup'))
+    for (label, fast), (_label, slow) in zip(indexed, scanned):
+        print('%-20s %15.3f %15.3f %9.1fx' % (label, fast * 1000,
+                                              slow * 1000, slow / fast))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the hydration of Pod objects from database entities.
+
+Usage: object_hydration_benchmark.py [--count N] [--repeat N]
+
+Synthetic pod entities are built in memory, so that only the conversion to
+objects is timed: once through the field setters of _from_db_object(), and
+once through the bulk _from_db_objects() used by the list queries.
+"""
+
+import argparse
+import datetime
+import time
+import uuid
+
+from magnum.common import context
+from magnum.db.sqlalchemy import models
+from magnum import objects
+
+
+def _db_pods(count):
+    now = datetime.datetime.utcnow()
+    bay_uuid = str(uuid.uuid4())
+    return [models.Pod(id=i, uuid=str(uuid.uuid4()), project_id='project',
+                       user_id='user', name='pod-%d' % i, desc='desc',
+                       bay_uuid=bay_uuid, images=['busybox'],
+                       labels={'name': 'pod-%d' % i}, status='Running',
+                       created_at=now, updated_at=now)
+            for i in range(count)]
+
+
+def _time(fn, repeat):
+    start = time.time()
+    for i in range(repeat):
+        fn()
+    return (time.time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    ctxt = context.RequestContext(is_admin=True)
+    db_pods = _db_pods(args.count)
+    # Decode the JSON columns once, as the DB API has when it returns.
+    for db_pod in db_pods:
+        db_pod.images, db_pod.labels
+
+    setters = _time(lambda: [objects.Pod._from_db_object(objects.Pod(ctxt),
+                                                         db_pod)
+                             for db_pod in db_pods], args.repeat)
+    bulk = _time(lambda: objects.Pod._from_db_objects(ctxt, db_pods),
+                 args.repeat)
+
+    print('%d pods' % args.count)
+    print('%-20s %15s' % ('path', 'time (ms)'))
+    print('%-20s %15.3f' % ('field setters', setters * 1000))
+    print('%-20s %15.3f' % ('bulk', bulk * 1000))
+    print('speedup: %.1fx' % (setters / bulk))
+
+
+if __name__ == '__main__':
+    main()